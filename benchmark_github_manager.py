@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+"""
+GitHub Manager Benchmarks
+=========================
+
+Runs the main github_manager.py flows against a local fake GitHub API and reports wall
+time, request count and peak memory, so client changes can be compared objectively.
+
+The fake server runs in its own process and replays fixture records (built-in samples, or
+a recorded github_profile_backup.json / repository list) cloned up to the requested org
+size, with configurable latency, page size, rate-limit headers and error injection.
+The quota is effectively unlimited by default; the features flow (topics/homepages for 200
+repositories) always runs under GitHub's real 5000 requests/hour, so client-side pacing shows.
+
+Usage:
+    python benchmark_github_manager.py                          # 10 / 1k / 10k repos, all flows
+    python benchmark_github_manager.py --sizes 1000 --flows setup health --workers 8
+    python benchmark_github_manager.py --latency-ms 40 --error-rate 0.01 --json after.json --compare before.json
+    python benchmark_github_manager.py --fixtures github_profile_backup.json
+
+Author: Victor-Dixon (DaDudeKC)
+License: MIT
+"""
+
+import argparse
+import base64
+import gc
+import json
+import multiprocessing
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.request
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import github_manager
+from github_manager import git_blob_sha
+
+OWNER = "bench"
+DEFAULT_SIZES = (10, 1000, 10000)
+BENCH_DESCRIPTION = "Benchmark repository"
+BENCH_TOPICS = ["benchmark", "python"]
+BENCH_HOMEPAGE = "https://example.com/bench"
+GITHUB_RATE_LIMIT = 5000
+FEATURES_FLOW_REPOS = 200
+
+# Shapes follow the GitHub REST API; only fields the client reads (plus typical bulk) are kept
+SAMPLE_REPOSITORIES = [
+    {"description": "Automation toolkit", "language": "Python", "topics": ["automation", "python"],
+     "stargazers_count": 12, "forks_count": 3, "open_issues_count": 4, "license": {"key": "mit", "name": "MIT License"}},
+    {"description": "", "language": "JavaScript", "topics": [], "stargazers_count": 0, "forks_count": 0,
+     "open_issues_count": 0, "license": None},
+    {"description": "Static site", "language": "HTML", "topics": ["website"], "stargazers_count": 1,
+     "forks_count": 0, "open_issues_count": 1, "license": None},
+]
+SAMPLE_USER = {"login": OWNER, "name": "Benchmark User", "public_repos": 0, "followers": 0, "following": 0}
+
+# URL fields every REST repository object carries; they make up most of its ~6 KB payload
+REPO_URL_FIELDS = (
+    "forks", "keys{/key_id}", "collaborators{/collaborator}", "teams", "hooks", "issues/events{/number}", "events",
+    "assignees{/user}", "branches{/branch}", "tags", "blobs{/sha}", "git/tags{/sha}", "git/refs{/sha}",
+    "git/trees{/sha}", "statuses/{sha}", "languages", "stargazers", "contributors", "subscribers", "subscription",
+    "commits{/sha}", "git/commits{/sha}", "comments{/number}", "issues/comments{/number}", "contents/{+path}",
+    "compare/{base}...{head}", "merges", "{archive_format}{/ref}", "downloads", "issues{/number}", "pulls{/number}",
+    "milestones{/number}", "notifications{?since,all,participating}", "labels{/name}", "releases{/id}",
+    "deployments",
+)
+USER_URL_FIELDS = ("followers", "following{/other_user}", "gists{/gist_id}", "starred{/owner}{/repo}",
+                   "subscriptions", "orgs", "repos", "events{/privacy}", "received_events")
+
+def api_fields(name: str, index: int) -> Dict:
+    """The bulk of a real repository object: URL templates, owner object, permissions and counters."""
+    api = f"https://api.github.com/repos/{OWNER}/{name}"
+    fields = {f"{path.split('{')[0].split('/')[-1] or 'archive'}_url": f"{api}/{path}" for path in REPO_URL_FIELDS}
+    fields.update({
+        "node_id": base64.b64encode(f"010:Repository{index}".encode()).decode(), "url": api,
+        "git_url": f"git://github.com/{OWNER}/{name}.git", "ssh_url": f"git@github.com:{OWNER}/{name}.git",
+        "clone_url": f"https://github.com/{OWNER}/{name}.git", "svn_url": f"https://github.com/{OWNER}/{name}",
+        "mirror_url": None, "size": 1024 + index, "watchers_count": 0, "watchers": 0, "has_issues": True,
+        "has_projects": True, "has_downloads": True, "has_wiki": True, "has_pages": False, "has_discussions": False,
+        "disabled": False, "visibility": "public", "is_template": False, "web_commit_signoff_required": False,
+        "allow_forking": True, "open_issues": 0, "forks": 0,
+        "permissions": {"admin": True, "maintain": True, "push": True, "triage": True, "pull": True},
+    })
+    owner_api = f"https://api.github.com/users/{OWNER}"
+    fields["owner"] = {"login": OWNER, "id": 1, "node_id": "MDQ6VXNlcjE=", "type": "User", "site_admin": False,
+                       "avatar_url": "https://avatars.githubusercontent.com/u/1?v=4", "gravatar_id": "",
+                       "url": owner_api, "html_url": f"https://github.com/{OWNER}",
+                       **{f"{path.split('{')[0]}_url": f"{owner_api}/{path}" for path in USER_URL_FIELDS}}
+    return fields
+
+def repo_name(index: int) -> str:
+    """Name of the index-th synthetic repository."""
+    return f"bench-{index:05d}"
+
+def load_fixtures(path: Optional[str]) -> Tuple[Dict, List[Dict]]:
+    """User and repository templates from a recorded backup/listing file, or the built-in samples."""
+    if not path:
+        return dict(SAMPLE_USER), [dict(repo) for repo in SAMPLE_REPOSITORIES]
+
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return dict(SAMPLE_USER), data
+    return {**data.get("user", {}), "login": OWNER}, data["repositories"]
+
+class FakeGitHubState:
+    """Synthetic account: repositories cloned from fixture templates plus a git store for the profile repo."""
+
+    def __init__(self, size: int, fixtures: Optional[str]):
+        user, templates = load_fixtures(fixtures)
+        self.user = dict(user, login=OWNER, public_repos=size)
+        now = time.time()
+        self.repos: Dict[str, Dict] = {}
+        for index in range(size):
+            name = repo_name(index)
+            template = templates[index % len(templates)]
+            repo = api_fields(name, index)
+            repo.update(template)
+            repo.update({
+                "id": index + 1, "name": name, "full_name": f"{OWNER}/{name}", "private": False, "fork": False,
+                "archived": False, "owner": repo["owner"], "html_url": f"https://github.com/{OWNER}/{name}",
+                "default_branch": "main", "homepage": template.get("homepage"),
+                "created_at": "2020-01-01T00:00:00Z",
+                "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now - index * 3600)),
+                "pushed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now - index * 86400)),
+            })
+            if index % 4 == 0:
+                # A quarter of the account already matches the benchmark manifest
+                repo.update(description=BENCH_DESCRIPTION, topics=list(BENCH_TOPICS), homepage=BENCH_HOMEPAGE)
+            self.repos[name] = repo
+
+        profile_readme = b"# Old profile\n"
+        self.repos[OWNER] = dict(self.repos.get(repo_name(0), {}), id=0, name=OWNER, full_name=f"{OWNER}/{OWNER}",
+                                 html_url=f"https://github.com/{OWNER}/{OWNER}", description=None, topics=[])
+        self.blobs = {git_blob_sha(profile_readme): profile_readme}
+        self.trees = {"tree0": {"README.md": git_blob_sha(profile_readme)}}
+        self.commits = {"commit0": "tree0"}
+        self.heads = {OWNER: "commit0"}
+        self.lock = threading.Lock()
+
+class FakeGitHubServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the fake account and the injection settings."""
+
+    daemon_threads = True
+
+    def __init__(self, config: Dict):
+        super().__init__(("127.0.0.1", 0), FakeGitHubHandler)
+        self.config = config
+        self.reset()
+
+    def reset(self, rate_limit: int = None) -> None:
+        """Restore the account and counters; rate_limit overrides the configured quota until the next reset."""
+        self.rate_limit = rate_limit or self.config["rate_limit"]
+        self.state = FakeGitHubState(self.config["size"], self.config.get("fixtures"))
+        self.random = random.Random(self.config["seed"])
+        self.counter_lock = threading.Lock()
+        self.requests = 0
+        self.injected = 0
+        # Authorization header -> [remaining, reset time]; every token has its own quota
+        self.quotas: Dict[str, List[int]] = {}
+
+    def quota(self, authorization: str) -> List[int]:
+        """Quota of a credential, restored once its window has passed (callers hold counter_lock)."""
+        now = int(time.time())
+        quota = self.quotas.get(authorization)
+        if quota is None or now >= quota[1]:
+            quota = self.quotas[authorization] = [self.rate_limit, now + self.config["rate_window"]]
+        return quota
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle adds ~40 ms per response
+    disable_nagle_algorithm = True
+
+    ROUTES: List[Tuple[str, str, str]] = [
+        ("GET", r"/user", "get_user"),
+        ("GET", r"/rate_limit", "get_rate_limit"),
+        ("GET", r"/user/repos", "list_repos"),
+        ("GET", r"/repos/([^/]+)/([^/]+)", "get_repo"),
+        ("PATCH", r"/repos/([^/]+)/([^/]+)", "patch_repo"),
+        ("PUT", r"/repos/([^/]+)/([^/]+)/topics", "put_topics"),
+        ("GET", r"/repos/([^/]+)/([^/]+)/languages", "get_languages"),
+        ("GET", r"/repos/([^/]+)/([^/]+)/contributors", "get_contributors"),
+        ("GET", r"/repos/([^/]+)/([^/]+)/commits", "get_commits"),
+        ("GET", r"/repos/([^/]+)/([^/]+)/readme", "get_readme"),
+        ("GET", r"/repos/([^/]+)/([^/]+)/contents/\.github/workflows", "get_workflows"),
+        ("GET", r"/repos/([^/]+)/([^/]+)/contents/(.+)", "get_contents"),
+        ("PUT", r"/repos/([^/]+)/([^/]+)/contents/(.+)", "put_contents"),
+        ("GET", r"/repos/([^/]+)/([^/]+)/git/ref/heads/(.+)", "get_ref"),
+        ("GET", r"/repos/([^/]+)/([^/]+)/git/trees/([^/]+)", "get_tree"),
+        ("POST", r"/repos/([^/]+)/([^/]+)/git/blobs", "post_blob"),
+        ("POST", r"/repos/([^/]+)/([^/]+)/git/trees", "post_tree"),
+        ("POST", r"/repos/([^/]+)/([^/]+)/git/commits", "post_commit"),
+        ("PATCH", r"/repos/([^/]+)/([^/]+)/git/refs/heads/(.+)", "patch_ref"),
+    ]
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send(self, status: int, payload, headers: Dict = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        url = urlsplit(self.path)
+        server: FakeGitHubServer = self.server
+        config = server.config
+
+        # Control endpoints used by the harness are not counted
+        if url.path == "/_bench/stats":
+            return self._send(200, {"requests": server.requests, "injected_errors": server.injected})
+        if url.path == "/_bench/reset":
+            rate_limit = parse_qs(url.query).get("rate_limit")
+            server.reset(int(rate_limit[0]) if rate_limit else None)
+            return self._send(200, {})
+
+        with server.counter_lock:
+            server.requests += 1
+            quota = server.quota(self.headers.get("Authorization", ""))
+            exhausted = quota[0] == 0
+            quota[0] = max(quota[0] - 1, 0)
+            rate_headers = {"X-RateLimit-Limit": str(server.rate_limit), "X-RateLimit-Remaining": str(quota[0]),
+                            "X-RateLimit-Reset": str(quota[1]), "X-RateLimit-Resource": "core"}
+            roll = server.random.random()
+
+        delay = config["latency_ms"] + config["jitter_ms"] * roll
+        if delay:
+            time.sleep(delay / 1000)
+
+        if exhausted:
+            return self._send(403, {"message": "API rate limit exceeded"}, rate_headers)
+        if roll < config["error_rate"]:
+            server.injected += 1
+            return self._send(502, {"message": "Server Error"}, rate_headers)
+        if roll < config["error_rate"] + config["secondary_rate"]:
+            server.injected += 1
+            return self._send(403, {"message": "You have exceeded a secondary rate limit"},
+                              {**rate_headers, "Retry-After": str(config["retry_after"])})
+
+        for method, pattern, handler in self.ROUTES:
+            match = re.fullmatch(pattern, url.path)
+            if method == self.command and match:
+                with server.state.lock:
+                    result = getattr(self, handler)(server.state, parse_qs(url.query), body, *match.groups())
+                status, payload, *extra = result
+                return self._send(status, payload, {**rate_headers, **(extra[0] if extra else {})})
+        return self._send(404, {"message": "Not Found"}, rate_headers)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    # ----- handlers: (state, query, body, *path groups) -> (status, payload[, headers]) -----
+
+    def get_user(self, state, query, body):
+        return 200, state.user
+
+    def get_rate_limit(self, state, query, body):
+        server = self.server
+        with server.counter_lock:
+            remaining, reset = server.quota(self.headers.get("Authorization", ""))
+        core = {"limit": server.rate_limit, "remaining": remaining, "reset": reset}
+        return 200, {"resources": {"core": core}, "rate": core}
+
+    def list_repos(self, state, query, body):
+        repos = sorted(state.repos.values(), key=lambda repo: repo["id"])
+        per_page = min(int(query.get("per_page", ["30"])[0]), self.server.config["page_size"])
+        page = int(query.get("page", ["1"])[0])
+        last = max((len(repos) + per_page - 1) // per_page, 1)
+
+        headers = {}
+        if page < last:
+            base = f"http://{self.headers['Host']}/user/repos?per_page={per_page}"
+            headers["Link"] = f'<{base}&page={page + 1}>; rel="next", <{base}&page={last}>; rel="last"'
+        return 200, repos[(page - 1) * per_page:page * per_page], headers
+
+    def get_repo(self, state, query, body, owner, name):
+        repo = state.repos.get(name)
+        return (200, repo) if repo else (404, {"message": "Not Found"})
+
+    def patch_repo(self, state, query, body, owner, name):
+        repo = state.repos.get(name)
+        if repo is None:
+            return 404, {"message": "Not Found"}
+        repo.update(body or {})
+        return 200, repo
+
+    def put_topics(self, state, query, body, owner, name):
+        repo = state.repos.get(name)
+        if repo is None:
+            return 404, {"message": "Not Found"}
+        repo["topics"] = list(body.get("names", []))
+        return 200, {"names": repo["topics"]}
+
+    def get_languages(self, state, query, body, owner, name):
+        repo = state.repos.get(name)
+        if repo is None:
+            return 404, {"message": "Not Found"}
+        return 200, {repo["language"]: 1000 + repo["id"]} if repo.get("language") else {}
+
+    def get_contributors(self, state, query, body, owner, name):
+        return 200, [{"login": OWNER, "contributions": 42}]
+
+    def get_commits(self, state, query, body, owner, name):
+        repo = state.repos.get(name)
+        if repo is None:
+            return 404, {"message": "Not Found"}
+        per_page = int(query.get("per_page", ["30"])[0])
+        return 200, [{"sha": f"{repo['id']:040x}", "commit": {"message": "Update", "author": {"date": repo["pushed_at"]}}}
+                     for _ in range(min(per_page, 10))]
+
+    def get_readme(self, state, query, body, owner, name):
+        repo = state.repos.get(name)
+        if repo is None or repo["id"] % 3 == 2:
+            return 404, {"message": "Not Found"}
+        content = f"# {name}\n".encode()
+        return 200, {"name": "README.md", "path": "README.md", "sha": git_blob_sha(content),
+                     "content": base64.b64encode(content).decode(), "encoding": "base64"}
+
+    def get_workflows(self, state, query, body, owner, name):
+        repo = state.repos.get(name)
+        if repo is None or repo["id"] % 2:
+            return 404, {"message": "Not Found"}
+        return 200, [{"name": "ci.yml", "path": ".github/workflows/ci.yml", "type": "file"}]
+
+    def get_contents(self, state, query, body, owner, name, path):
+        blob = state.trees.get(state.commits.get(state.heads.get(name)), {}).get(path)
+        if blob is None:
+            return 404, {"message": "Not Found"}
+        return 200, {"type": "file", "path": path, "sha": blob,
+                     "content": base64.b64encode(state.blobs[blob]).decode(), "encoding": "base64"}
+
+    def put_contents(self, state, query, body, owner, name, path):
+        head = state.heads.get(name)
+        tree = dict(state.trees.get(state.commits.get(head), {}))
+        if body.get("sha") != tree.get(path):
+            return 409, {"message": f"{path} does not match {body.get('sha')}"}
+        data = base64.b64decode(body["content"])
+        state.blobs[git_blob_sha(data)] = data
+        tree[path] = git_blob_sha(data)
+        tree_sha, commit_sha = f"tree{len(state.trees)}", f"commit{len(state.commits)}"
+        state.trees[tree_sha] = tree
+        state.commits[commit_sha] = tree_sha
+        state.heads[name] = commit_sha
+        return (200 if head else 201), {"content": {"path": path, "sha": tree[path]}, "commit": {"sha": commit_sha}}
+
+    def get_ref(self, state, query, body, owner, name, branch):
+        head = state.heads.get(name)
+        return (200, {"ref": f"refs/heads/{branch}", "object": {"sha": head, "type": "commit"}}) if head \
+            else (404, {"message": "Not Found"})
+
+    def get_tree(self, state, query, body, owner, name, sha):
+        tree_sha = state.commits.get(sha, sha)
+        tree = state.trees.get(tree_sha)
+        if tree is None:
+            return 404, {"message": "Not Found"}
+        return 200, {"sha": tree_sha, "truncated": False,
+                     "tree": [{"path": path, "type": "blob", "mode": "100644", "sha": blob} for path, blob in tree.items()]}
+
+    def post_blob(self, state, query, body, owner, name):
+        data = base64.b64decode(body["content"]) if body.get("encoding") == "base64" else body["content"].encode()
+        state.blobs[git_blob_sha(data)] = data
+        return 201, {"sha": git_blob_sha(data)}
+
+    def post_tree(self, state, query, body, owner, name):
+        tree = dict(state.trees.get(body.get("base_tree"), {}))
+        for entry in body["tree"]:
+            if "content" in entry:
+                data = entry["content"].encode()
+                state.blobs[git_blob_sha(data)] = data
+                tree[entry["path"]] = git_blob_sha(data)
+            elif entry.get("sha") is None:
+                tree.pop(entry["path"], None)
+            else:
+                tree[entry["path"]] = entry["sha"]
+        tree_sha = f"tree{len(state.trees)}"
+        state.trees[tree_sha] = tree
+        return 201, {"sha": tree_sha}
+
+    def post_commit(self, state, query, body, owner, name):
+        commit_sha = f"commit{len(state.commits)}"
+        state.commits[commit_sha] = body["tree"]
+        return 201, {"sha": commit_sha}
+
+    def patch_ref(self, state, query, body, owner, name, branch):
+        state.heads[name] = body["sha"]
+        return 200, {"ref": f"refs/heads/{branch}", "object": {"sha": body["sha"], "type": "commit"}}
+
+def serve(config: Dict, ready) -> None:
+    """Server process entry point: report the port, then serve until terminated."""
+    server = FakeGitHubServer(config)
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+def control(url: str, action: str, query: str = "") -> Dict:
+    """Call a harness control endpoint on the fake server."""
+    method = "POST" if action == "reset" else "GET"
+    request = urllib.request.Request(f"{url}/_bench/{action}" + (f"?{query}" if query else ""), method=method)
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+# ----- flows: (manager, size, args) -> None -----
+
+def flow_setup(manager, size: int, args) -> None:
+    manager.setup_all_repositories_professional(workers=args.workers)
+
+def flow_features(manager, size: int, args) -> None:
+    manager.setup_repositories_features([repo_name(index) for index in range(min(size, FEATURES_FLOW_REPOS))])
+
+def flow_stats(manager, size: int, args) -> None:
+    manager.get_repositories_stats([repo_name(index) for index in range(size)], backend="rest", workers=args.workers)
+
+def flow_health(manager, size: int, args) -> None:
+    manager.analyze_all_repositories(os.path.join(args.scratch, "health_report.json"), workers=args.workers,
+                                     backend="rest")
+
+def flow_list(manager, size: int, args) -> None:
+    repos = manager.list_repositories(compact=True)
+    assert len(repos) == size + 1
+
+def flow_list_raw(manager, size: int, args) -> None:
+    repos = manager.list_repositories()
+    assert len(repos) == size + 1
+
+def flow_backup(manager, size: int, args) -> None:
+    manager.backup_profile_data()
+
+def flow_readme(manager, size: int, args) -> None:
+    manager.update_profile_readme("# Benchmark profile\n\nUpdated by the benchmark suite.\n")
+
+FLOWS: Dict[str, Callable] = {
+    "setup": flow_setup,
+    "features": flow_features,
+    "stats": flow_stats,
+    "health": flow_health,
+    "list": flow_list,
+    "list-raw": flow_list_raw,
+    "backup": flow_backup,
+    "readme": flow_readme,
+}
+
+# Flows that always run under GitHub's real per-token quota, whatever --rate-limit says,
+# so client-side pacing shows up in their wall time
+FLOW_RATE_LIMITS: Dict[str, int] = {
+    "features": GITHUB_RATE_LIMIT,
+}
+
+def run_flow(github_manager, url: str, flow: str, size: int, args) -> Dict:
+    """Run one flow against a freshly reset server; returns its measurements."""
+    control(url, "reset", f"rate_limit={FLOW_RATE_LIMITS[flow]}" if flow in FLOW_RATE_LIMITS else "")
+    tokens = [f"bench-token-{index}" for index in range(args.tokens)]
+    manager = github_manager.GitHubManager(token=tokens[0], tokens=tokens[1:] if args.tokens > 1 else None,
+                                           username=OWNER, base_url=url, username_cache=None,
+                                           pool_size=max(10, args.workers), repo_config_path=args.manifest)
+    error = None
+    gc.collect()
+    if args.memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        try:
+            FLOWS[flow](manager, size, args)
+        except Exception as e:
+            error = repr(e)
+    wall = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] if args.memory else None
+    if args.memory:
+        tracemalloc.stop()
+
+    client = manager.metrics.summary()
+    manager.close()
+    server = control(url, "stats")
+    return {
+        "size": size, "flow": flow, "wall_s": round(wall, 3), "requests": server["requests"],
+        "injected_errors": server["injected_errors"], "client_retries": client["retries"],
+        "http_errors": client["errors"], "peak_mib": round(peak / 2 ** 20, 2) if peak is not None else None,
+        "error": error
+    }
+
+def print_results(results: List[Dict], baseline: Dict[Tuple[int, str], Dict] = None) -> None:
+    print(f"\n{'size':>6} {'flow':<8} {'wall s':>8} {'requests':>9} {'retries':>8} {'errors':>7} {'peak MiB':>9}"
+          + ("  vs baseline" if baseline else ""))
+    for row in results:
+        line = (f"{row['size']:>6} {row['flow']:<8} {row['wall_s']:>8} {row['requests']:>9} "
+                f"{row['client_retries']:>8} {row['http_errors']:>7} {row['peak_mib'] if row['peak_mib'] is not None else '-':>9}")
+        old = (baseline or {}).get((row["size"], row["flow"]))
+        if old:
+            line += f"  wall {(row['wall_s'] / old['wall_s'] - 1) * 100:+.1f}%, requests {row['requests'] - old['requests']:+d}"
+            if row["peak_mib"] is not None and old.get("peak_mib"):
+                line += f", peak {(row['peak_mib'] / old['peak_mib'] - 1) * 100:+.1f}%"
+        if row["error"]:
+            line += f"  ❌ {row['error']}"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark github_manager.py against a local fake GitHub API")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES), metavar="N",
+                        help="Synthetic org sizes in repositories (default: 10 1000 10000)")
+    parser.add_argument("--flows", nargs="+", choices=list(FLOWS), default=list(FLOWS), help="Flows to run (default: all)")
+    parser.add_argument("--workers", type=int, default=8, help="Client workers for bulk flows (default: 8)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per flow; the fastest is reported (default: 1)")
+    parser.add_argument("--fixtures", metavar="PATH",
+                        help="Recorded repositories to replay: github_profile_backup.json or a JSON list of repos")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added server latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra latency per request (0..N ms)")
+    parser.add_argument("--page-size", type=int, default=100, help="Maximum per_page the server honors (default: 100)")
+    parser.add_argument("--rate-limit", type=int, default=1_000_000,
+                        help="Core quota per token and window, reported in X-RateLimit headers "
+                             f"(default: effectively unlimited; the features flow always gets {GITHUB_RATE_LIMIT})")
+    parser.add_argument("--tokens", type=int, default=1, help="Credentials in the client's token pool (default: 1)")
+    parser.add_argument("--rate-window", type=int, default=3600, help="Seconds until the quota resets (default: 3600)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 502")
+    parser.add_argument("--secondary-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with a secondary rate limit (403 + Retry-After)")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds for injected secondary limits")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for latency jitter and error injection")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="Skip tracemalloc peak-memory tracking (it slows the client down)")
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="Show changes against a previous --json result file")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {(row["size"], row["flow"]): row for row in json.load(f)["results"]}
+
+    results = []
+    with tempfile.TemporaryDirectory() as scratch:
+        args.scratch = scratch
+        args.manifest = os.path.join(scratch, "repositories.json")
+        with open(args.manifest, "w") as f:
+            json.dump({"rules": [{"match": "bench-*", "description": BENCH_DESCRIPTION, "topics": BENCH_TOPICS,
+                                  "homepage": BENCH_HOMEPAGE}]}, f)
+
+        # Flows that write files (backup, health report) do so in the scratch directory
+        cwd = os.getcwd()
+        os.chdir(scratch)
+        try:
+            for size in args.sizes:
+                config = {"size": size, "fixtures": os.path.join(cwd, args.fixtures) if args.fixtures else None,
+                          "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "page_size": args.page_size,
+                          "rate_limit": args.rate_limit, "rate_window": args.rate_window, "error_rate": args.error_rate,
+                          "secondary_rate": args.secondary_rate, "retry_after": args.retry_after, "seed": args.seed}
+                context = multiprocessing.get_context("spawn")
+                ready = context.Queue()
+                process = context.Process(target=serve, args=(config, ready), daemon=True)
+                process.start()
+                url = f"http://127.0.0.1:{ready.get(timeout=60)}"
+                print(f"🧪 {size} repositories at {url}")
+                try:
+                    for flow in args.flows:
+                        runs = [run_flow(github_manager, url, flow, size, args) for _ in range(max(args.repeat, 1))]
+                        best = min(runs, key=lambda row: row["wall_s"])
+                        results.append(best)
+                        print(f"  {flow:<8} {best['wall_s']:>8}s  {best['requests']} requests"
+                              + (f"  ❌ {best['error']}" if best["error"] else ""))
+                finally:
+                    process.terminate()
+                    process.join()
+        finally:
+            os.chdir(cwd)
+
+    print_results(results, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": {key: value for key, value in vars(args).items() if key not in ("scratch", "manifest")},
+                       "results": results}, f, indent=2)
+        print(f"\n✅ Results saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -15,45 +15,1927 @@ Author: Victor-Dixon (DaDudeKC)
 License: MIT
 """
 
+from __future__ import annotations
+
 import argparse
 import base64
+import bisect
+import csv
+import fnmatch
+import gzip
+import hashlib
+import itertools
 import json
+import math
 import os
+import re
+import sqlite3
 import sys
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import closing
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-import requests
-from dotenv import load_dotenv
+# requests, python-dotenv, asyncio and httpx are imported where they are first needed so
+# that --help and offline commands start without paying for them.
+if TYPE_CHECKING:
+    import httpx
+    import requests
 
-# Load environment variables from local .env file
+# Environment variables are loaded from this local .env file on first use (see _load_env)
 local_env_path = Path(__file__).parent / ".env"
-load_dotenv(local_env_path)
+
+DEFAULT_BASE_URL = "https://api.github.com"
+WRITE_METHODS = frozenset(["POST", "PUT", "PATCH", "DELETE"])
+SECONDARY_LIMIT_RETRIES = 3
+RATE_LIMIT_LOW_WATER = 0.1
+CONCURRENT_WRITE_INTERVAL = 0.25
+PER_PAGE = 100
+GRAPHQL_BATCH_SIZE = 50
+README_PATHS = ("README.md", "README", "README.rst", "readme.md")
+STALE_AFTER_DAYS = 365
+DEFAULT_HEALTH_REPORT = "health_report.json"
+
+GRAPHQL_REPO_STATS_FRAGMENT = """
+fragment RepoStats on Repository {
+  name
+  nameWithOwner
+  description
+  homepageUrl
+  url
+  isPrivate
+  isFork
+  isArchived
+  stargazerCount
+  forkCount
+  createdAt
+  updatedAt
+  pushedAt
+  primaryLanguage { name }
+  licenseInfo { spdxId name }
+  repositoryTopics(first: 20) { nodes { topic { name } } }
+  languages(first: 20, orderBy: {field: SIZE, direction: DESC}) { edges { size node { name } } }
+  defaultBranchRef {
+    name
+    target {
+      ... on Commit {
+        history(first: 10) {
+          nodes { oid messageHeadline committedDate author { name email user { login } } }
+        }
+      }
+    }
+  }
+  workflows: object(expression: "HEAD:.github/workflows") { ... on Tree { entries { name } } }
+%s
+}
+""" % "\n".join(f'  readme{i}: object(expression: "HEAD:{path}") {{ id }}' for i, path in enumerate(README_PATHS))
+DEFAULT_CACHE_PATH = Path(".github_cache.sqlite")
+DEFAULT_BACKUP_DIR = Path("github_backups")
+DEFAULT_MIRROR_PATH = Path(".github_mirror.sqlite")
+DEFAULT_JOB_QUEUE_PATH = Path(".github_jobs.sqlite")
+DEFAULT_RPC_SOCKET = Path(".github_manager.sock")
+DEFAULT_WEBHOOK_ADDRESS = "127.0.0.1:8787"
+# Seconds a served manager reuses a memoized GET, so changes made elsewhere show up
+SERVE_MEMO_TTL = 30
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_BACKOFF = 2.0
+README_INDEX_BYTES = 64 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+# Upper bounds (seconds) of the request latency histogram buckets; a +Inf bucket is implied
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_REPO_CONFIG = Path(__file__).parent / "repositories.yaml"
+DEFAULT_WORKFLOW_TEMPLATES = Path(__file__).parent / "workflow_templates"
+# Defaults for template variables that cannot be detected from repository data
+WORKFLOW_DEFAULTS = {"python_version": "3.9", "node_version": "18"}
+# Template name -> (variable, files read in order for a per-repository version)
+WORKFLOW_VERSION_FILES = {
+    "python": ("python_version", (".python-version", "pyproject.toml")),
+    "javascript": ("node_version", (".nvmrc", "package.json")),
+}
+# GitHub linguist language -> workflow template name
+WORKFLOW_LANGUAGES = {
+    "Python": "python",
+    "Jupyter Notebook": "python",
+    "JavaScript": "javascript",
+    "TypeScript": "javascript",
+    "Vue": "javascript",
+    "Svelte": "javascript",
+}
+USERNAME_CACHE_PATH = Path.home() / ".cache" / "github_manager" / "usernames.json"
+DEFAULT_RPC_TOKEN_FILE = Path.home() / ".cache" / "github_manager" / "rpc_token"
+
+def _load_env() -> None:
+    """Load environment variables from the local .env file (existing variables win)."""
+    from dotenv import load_dotenv
+    load_dotenv(local_env_path)
+
+def token_fingerprint(token: Optional[str]) -> str:
+    """Stable, non-reversible identifier for a token, used as a cache key ("anonymous" without one)."""
+    if not token:
+        return "anonymous"
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+class ResponseCache:
+    """On-disk conditional-request cache for GET responses, backed by SQLite.
+
+    Stores the body together with its ETag/Last-Modified validators so repeat fetches
+    can be sent as If-None-Match/If-Modified-Since requests. GitHub answers those with
+    304 Not Modified, which does not count against the rate limit.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_CACHE_PATH, ttl: float = 86400,
+                 fresh_for: float = 0, max_bytes: int = 50 * 1024 * 1024):
+        """
+        Args:
+            path: SQLite database file
+            ttl: Seconds an entry is kept before it is discarded
+            fresh_for: Seconds an entry is served without revalidating (0 = always revalidate)
+            max_bytes: Total body size kept on disk; least recently used entries are evicted first
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.fresh_for = fresh_for
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+            CREATE INDEX IF NOT EXISTS responses_url ON responses (url);
+        """)
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached entry for key, or None if missing or expired.
+
+        A fresh entry is counted as a hit here, under the same lock as the lookup.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, headers, body, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            now = time.time()
+            if now - row[4] > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            fresh = now - row[4] <= self.fresh_for
+            if fresh:
+                self.hits += 1
+            return {
+                "etag": row[0],
+                "last_modified": row[1],
+                "headers": json.loads(row[2]),
+                "body": row[3],
+                "fresh": fresh
+            }
+
+    def put(self, key: str, url: str, response: requests.Response) -> None:
+        """Store a 200 response if it carries a validator (or fresh_for allows reuse)."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not (etag or last_modified or self.fresh_for):
+            return
+
+        body = response.content
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, etag, last_modified, json.dumps(dict(response.headers)),
+                 body, len(body), now, now)
+            )
+            self._evict()
+            self._db.commit()
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as freshly validated after a 304 response."""
+        with self._lock:
+            self.revalidated += 1
+            now = time.time()
+            self._db.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            self._db.commit()
+
+    def miss(self) -> None:
+        """Count a lookup that had to be answered by a full response."""
+        with self._lock:
+            self.misses += 1
+
+    def invalidate(self, url_prefix: str) -> None:
+        """Drop every entry whose URL starts with url_prefix."""
+        with self._lock:
+            self._db.execute("DELETE FROM responses WHERE substr(url, 1, ?) = ?", (len(url_prefix), url_prefix))
+            self._db.commit()
+
+    def _evict(self) -> None:
+        """Remove expired entries, then least recently used ones until under max_bytes."""
+        cursor = self._db.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.ttl,))
+        self.evictions += max(cursor.rowcount, 0)
+
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters; revalidated responses are 304s that cost no quota."""
+        with self._lock:
+            hits, revalidated, misses, evictions = self.hits, self.revalidated, self.misses, self.evictions
+        lookups = hits + revalidated + misses
+        return {
+            "hits": hits,
+            "revalidated": revalidated,
+            "misses": misses,
+            "evictions": evictions,
+            "hit_rate": round((hits + revalidated) / lookups, 3) if lookups else 0.0,
+            "quota_saved": hits + revalidated
+        }
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self._lock:
+            self._db.close()
+
+class RequestMemo:
+    """In-process singleflight and memo table for GET responses within one run.
+
+    Concurrent identical GETs wait for the request already in flight and share its response.
+    Later identical GETs are answered from a bounded LRU table of successful responses. A write
+    drops every entry of the repository (or top-level resource) it touches, plus all
+    repository listings and searches, which embed repository state. Responses still in flight
+    when a write happens are returned but not stored. Long-lived processes should set a ttl so
+    changes made outside the process become visible.
+    """
+
+    # Paths whose responses summarize many repositories
+    LISTING = re.compile(r"^/(user|users/[^/]+|orgs/[^/]+)/repos$|^/search/")
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024, ttl: float = None):
+        """
+        Args:
+            max_entries: Responses kept before the least recently used are dropped
+            max_bytes: Total body size kept in memory
+            ttl: Seconds a stored response is reused (None: for the life of the process)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.size = 0
+        self._entries: "OrderedDict[str, Tuple[str, requests.Response, float]]" = OrderedDict()
+        self._in_flight: Dict[str, Dict] = {}
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _share(response: requests.Response, outcome: str) -> requests.Response:
+        """A copy of a stored response for another caller (the body bytes are shared, not copied)."""
+        import copy
+
+        shared = copy.copy(response)
+        shared.cache_status = outcome
+        shared.rate_limit_retries = 0
+        return shared
+
+    def fetch(self, key: str, path: str, send: Callable[[], requests.Response]) -> requests.Response:
+        """Answer a GET from the table or an identical request in flight, or send it.
+
+        Args:
+            key: Identity of the request (full URL and Accept header)
+            path: URL path, used to match invalidations
+            send: Sends the request when nobody else has
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[2] > self.ttl:
+                del self._entries[key]
+                self.size -= len(entry[1].content)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._share(entry[1], "memo")
+            flight = self._in_flight.get(key)
+            if flight is None:
+                flight = self._in_flight[key] = {"done": threading.Event(), "response": None}
+                leader, writes = True, self._writes
+            else:
+                leader = False
+                self.coalesced += 1
+
+        if not leader:
+            flight["done"].wait()
+            if flight["response"] is None:
+                return send()  # The shared request failed; let each caller see its own error
+            return self._share(flight["response"], "coalesced")
+
+        response = None
+        try:
+            response = send()
+            return response
+        finally:
+            with self._lock:
+                self.misses += 1
+                del self._in_flight[key]
+                flight["response"] = response
+                if response is not None and response.status_code == 200 and writes == self._writes:
+                    self._store(key, path, response)
+            flight["done"].set()
+
+    def _store(self, key: str, path: str, response: requests.Response) -> None:
+        """Insert a response and evict the least recently used ones (caller holds the lock)."""
+        size = len(response.content)
+        if size > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous[1].content)
+        self._entries[key] = (path, response, time.monotonic())
+        self.size += size
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            _, (_, evicted, _) = self._entries.popitem(last=False)
+            self.size -= len(evicted.content)
+
+    def invalidate(self, path: str) -> None:
+        """Drop entries a write to path may have changed."""
+        parts = path.split("/")
+        scope = "/".join(parts[:4]) if parts[1:2] == ["repos"] else "/".join(parts[:2])
+        with self._lock:
+            self._writes += 1
+            for key, (entry_path, response, _) in list(self._entries.items()):
+                if entry_path == scope or entry_path.startswith(scope + "/") or self.LISTING.match(entry_path):
+                    del self._entries[key]
+                    self.size -= len(response.content)
+
+    def stats(self) -> Dict:
+        """Hit, coalesced and miss counters; hits and coalesced requests cost no API calls."""
+        return {"hits": self.hits, "coalesced": self.coalesced, "misses": self.misses,
+                "entries": len(self._entries), "bytes": self.size, "requests_saved": self.hits + self.coalesced}
+
+    def clear(self) -> None:
+        """Forget every stored response."""
+        with self._lock:
+            self._writes += 1
+            self._entries.clear()
+            self.size = 0
+
+class LocalMirror:
+    """Indexed SQLite mirror of repositories, issues and pull requests for offline reads.
+
+    Each row keeps the full API object as JSON next to the indexed columns, so offline reads
+    return the same dicts as the live endpoints. Sync cursors (the newest updated_at seen)
+    make repeat syncs incremental. Repository names, descriptions, topics and README text are
+    kept in an FTS5 index (sharing rowids with the repos table) for ranked local search.
+    """
+
+    # bm25 column weights for name, description, topics, readme
+    SEARCH_WEIGHTS = (10.0, 3.0, 5.0, 1.0)
+    SEARCH_QUALIFIERS = {
+        "language": "json_extract(r.data, '$.language') = ? COLLATE NOCASE",
+        "topic": "r.name IN (SELECT repo FROM repo_topics WHERE topic = ?)",
+        "archived": "json_extract(r.data, '$.archived') = ?",
+        "fork": "json_extract(r.data, '$.fork') = ?",
+        "is": "r.private = ?",
+    }
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_MIRROR_PATH):
+        """
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS repos (
+                name TEXT PRIMARY KEY COLLATE NOCASE,
+                description TEXT,
+                private INTEGER NOT NULL,
+                stars INTEGER NOT NULL,
+                updated_at TEXT,
+                pushed_at TEXT,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS repo_topics (
+                topic TEXT NOT NULL COLLATE NOCASE,
+                repo TEXT NOT NULL COLLATE NOCASE,
+                PRIMARY KEY (topic, repo)
+            );
+            CREATE TABLE IF NOT EXISTS issues (
+                repo TEXT NOT NULL COLLATE NOCASE,
+                number INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                is_pull_request INTEGER NOT NULL,
+                updated_at TEXT,
+                data TEXT NOT NULL,
+                PRIMARY KEY (repo, number)
+            );
+            CREATE INDEX IF NOT EXISTS issues_state ON issues (repo, state, number);
+            CREATE TABLE IF NOT EXISTS issue_labels (
+                label TEXT NOT NULL COLLATE NOCASE,
+                repo TEXT NOT NULL COLLATE NOCASE,
+                number INTEGER NOT NULL,
+                PRIMARY KEY (label, repo, number)
+            );
+            CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS readmes (
+                repo TEXT PRIMARY KEY COLLATE NOCASE,
+                pushed_at TEXT,
+                text TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS health (
+                repo TEXT PRIMARY KEY COLLATE NOCASE,
+                score INTEGER NOT NULL,
+                scored_at TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+        """)
+        try:
+            self._db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS repo_search USING fts5("
+                             "name, description, topics, readme, tokenize = 'unicode61 remove_diacritics 2')")
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False  # SQLite built without FTS5: search falls back to LIKE matching
+        if self.fts and not self._db.execute("SELECT 1 FROM repo_search LIMIT 1").fetchone():
+            for (name,) in self._db.execute("SELECT name FROM repos").fetchall():
+                self._index(name)
+        self._db.commit()
+
+    def _index(self, repo_name: str, old_rowid: int = None) -> None:
+        """Refresh a repository's search row (caller holds the lock)."""
+        if not self.fts:
+            return
+        if old_rowid is not None:
+            self._db.execute("DELETE FROM repo_search WHERE rowid = ?", (old_rowid,))
+        row = self._db.execute("SELECT rowid, name, description, data FROM repos WHERE name = ?",
+                               (repo_name,)).fetchone()
+        if row is None:
+            return
+        readme = self._db.execute("SELECT text FROM readmes WHERE repo = ?", (repo_name,)).fetchone()
+        self._db.execute(
+            "INSERT OR REPLACE INTO repo_search (rowid, name, description, topics, readme) VALUES (?, ?, ?, ?, ?)",
+            (row[0], row[1], row[2] or "", " ".join(json.loads(row[3]).get("topics") or []),
+             readme[0] if readme else "")
+        )
+
+    def _rowid(self, repo_name: str) -> Optional[int]:
+        row = self._db.execute("SELECT rowid FROM repos WHERE name = ?", (repo_name,)).fetchone()
+        return row[0] if row else None
+
+    def cursor(self, key: str) -> Optional[str]:
+        """Stored sync cursor (an ISO timestamp), or None before the first sync."""
+        with self._lock:
+            row = self._db.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_cursor(self, key: str, value: str) -> None:
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (key, value))
+            self._db.commit()
+
+    def upsert_repos(self, repos: Iterable[Dict]) -> int:
+        """Insert or replace repository records and their topics; returns the number written."""
+        count = 0
+        with self._lock:
+            for repo in repos:
+                old_rowid = self._rowid(repo["name"])
+                self._db.execute(
+                    "INSERT OR REPLACE INTO repos VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (repo["name"], repo.get("description"), int(bool(repo.get("private"))),
+                     repo.get("stargazers_count") or 0, repo.get("updated_at"), repo.get("pushed_at"),
+                     json.dumps(repo))
+                )
+                self._db.execute("DELETE FROM repo_topics WHERE repo = ?", (repo["name"],))
+                self._db.executemany("INSERT OR IGNORE INTO repo_topics VALUES (?, ?)",
+                                     [(topic, repo["name"]) for topic in repo.get("topics") or []])
+                self._index(repo["name"], old_rowid)
+                count += 1
+            self._db.commit()
+        return count
+
+    def _drop(self, repo_name: str) -> None:
+        """Delete a repository and everything stored for it (caller holds the lock)."""
+        if self.fts:
+            self._db.execute("DELETE FROM repo_search WHERE rowid = ?", (self._rowid(repo_name),))
+        self._db.execute("DELETE FROM repos WHERE name = ?", (repo_name,))
+        for table in ("repo_topics", "issues", "issue_labels", "readmes", "health"):
+            self._db.execute(f"DELETE FROM {table} WHERE repo = ?", (repo_name,))
+        self._db.execute("DELETE FROM sync_state WHERE key = ?", (f"issues:{repo_name}",))
+
+    def remove_repos_except(self, names: Iterable[str]) -> int:
+        """Drop repositories (and their issues) that are not in names; returns the number removed."""
+        keep = {name.lower() for name in names}
+        with self._lock:
+            stale = [name for (name,) in self._db.execute("SELECT name FROM repos") if name.lower() not in keep]
+            for name in stale:
+                self._drop(name)
+            self._db.commit()
+        return len(stale)
+
+    def remove_repo(self, repo_name: str) -> None:
+        """Drop one repository with its issues, README and health score."""
+        with self._lock:
+            self._drop(repo_name)
+            self._db.commit()
+
+    def upsert_issues(self, repo_name: str, issues: Iterable[Dict], replace: bool = False) -> int:
+        """Insert or replace a repository's issues and pull requests; returns the number written.
+
+        Args:
+            replace: Drop the repository's existing issues first (full sync)
+        """
+        count = 0
+        with self._lock:
+            if replace:
+                self._db.execute("DELETE FROM issues WHERE repo = ?", (repo_name,))
+                self._db.execute("DELETE FROM issue_labels WHERE repo = ?", (repo_name,))
+            for issue in issues:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?)",
+                    (repo_name, issue["number"], issue["state"], int("pull_request" in issue),
+                     issue.get("updated_at"), json.dumps(issue))
+                )
+                self._db.execute("DELETE FROM issue_labels WHERE repo = ? AND number = ?", (repo_name, issue["number"]))
+                self._db.executemany("INSERT OR IGNORE INTO issue_labels VALUES (?, ?, ?)",
+                                     [(label["name"], repo_name, issue["number"]) for label in issue.get("labels") or []])
+                count += 1
+            self._db.commit()
+        return count
+
+    def remove_issue(self, repo_name: str, number: int) -> None:
+        """Drop a deleted issue."""
+        with self._lock:
+            self._db.execute("DELETE FROM issues WHERE repo = ? AND number = ?", (repo_name, number))
+            self._db.execute("DELETE FROM issue_labels WHERE repo = ? AND number = ?", (repo_name, number))
+            self._db.commit()
+
+    def store_health(self, repo_name: str, health: Dict) -> None:
+        """Save a repository's latest health result (score, recommendations and the stats behind them)."""
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO health VALUES (?, ?, ?, ?)",
+                             (repo_name, health["health_score"], datetime.now(timezone.utc).isoformat(),
+                              json.dumps(health)))
+            self._db.commit()
+
+    def get_health(self, repo_name: str) -> Optional[Dict]:
+        """Latest stored health result of a repository, or None if it was never scored."""
+        with self._lock:
+            row = self._db.execute("SELECT data FROM health WHERE repo = ?", (repo_name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def repository_names(self) -> List[str]:
+        with self._lock:
+            return [name for (name,) in self._db.execute("SELECT name FROM repos ORDER BY name")]
+
+    def get_repository(self, repo_name: str) -> Optional[Dict]:
+        """Mirrored repository record, or None if it is not mirrored."""
+        with self._lock:
+            row = self._db.execute("SELECT data FROM repos WHERE name = ?", (repo_name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_repositories(self, type_filter: str = "all") -> Iterator[Dict]:
+        """Mirrored repositories; type_filter "public"/"private" is applied, other values list all."""
+        sql = "SELECT data FROM repos"
+        if type_filter in ("public", "private"):
+            sql += f" WHERE private = {int(type_filter == 'private')}"
+        with self._lock:
+            rows = self._db.execute(sql + " ORDER BY updated_at DESC").fetchall()
+        return (json.loads(data) for (data,) in rows)
+
+    def outdated_readmes(self, repos: Iterable[Dict]) -> List[Dict]:
+        """Repositories whose README was never indexed or was indexed before their last push."""
+        with self._lock:
+            indexed = dict(self._db.execute("SELECT repo, pushed_at FROM readmes").fetchall())
+        return [repo for repo in repos if repo["name"] not in indexed or indexed[repo["name"]] != repo.get("pushed_at")]
+
+    def store_readme(self, repo_name: str, pushed_at: Optional[str], text: str) -> None:
+        """Save README text (empty if there is none) and refresh the repository's search row."""
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO readmes VALUES (?, ?, ?)", (repo_name, pushed_at, text))
+            self._index(repo_name, self._rowid(repo_name))
+            self._db.commit()
+
+    def search_repositories(self, query: str, limit: int = None) -> List[Dict]:
+        """Ranked search over repository names, descriptions, topics and README text.
+
+        Every term must match (as a word prefix). Results are ordered by BM25 relevance, with
+        name and topic hits weighing most, then by stars. GitHub-style qualifiers filter the
+        results: language:, topic:, archived:true/false, fork:true/false and is:public/private.
+        """
+        terms, filters, filter_params = [], [], []
+        for token in query.split():
+            qualifier, _, value = token.partition(":")
+            qualifier = qualifier.lower()
+            if value and qualifier in self.SEARCH_QUALIFIERS:
+                filters.append(self.SEARCH_QUALIFIERS[qualifier])
+                if qualifier in ("archived", "fork"):
+                    filter_params.append(int(value.lower() == "true"))
+                elif qualifier == "is":
+                    filter_params.append(int(value.lower() == "private"))
+                else:
+                    filter_params.append(value)
+            elif value and qualifier in ("user", "org"):
+                continue  # Everything in the mirror belongs to the synced account
+            else:
+                terms.append(token)
+
+        if terms and self.fts:
+            sql = ("SELECT r.data FROM repo_search JOIN repos r ON r.rowid = repo_search.rowid"
+                   " WHERE repo_search MATCH ?")
+            params = [" ".join('"' + term.replace('"', '""') + '"*' for term in terms)]
+            order = f"bm25(repo_search, {', '.join(map(str, self.SEARCH_WEIGHTS))}), r.stars DESC"
+        else:
+            sql = "SELECT r.data FROM repos r WHERE 1"
+            params = []
+            for term in terms:
+                sql += (" AND (r.name LIKE ? ESCAPE '\\' OR r.description LIKE ? ESCAPE '\\'"
+                        " OR r.name IN (SELECT repo FROM repo_topics WHERE topic = ?))")
+                pattern = "%" + re.sub(r"([%_\\])", r"\\\1", term) + "%"
+                params += [pattern, pattern, term]
+            order = "r.stars DESC, r.name"
+
+        sql += "".join(f" AND {condition}" for condition in filters) + f" ORDER BY {order}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._db.execute(sql, params + filter_params).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def iter_issues(self, repo_name: str, state: str = "open", labels: str = None,
+                    pull_requests: Optional[bool] = None) -> Iterator[Dict]:
+        """Mirrored issues, newest first, filtered like the issues endpoint.
+
+        Args:
+            state: "open", "closed" or "all"
+            labels: Comma-separated label names; an issue must carry all of them
+            pull_requests: True/False to return only or no pull requests (None = both, like the API)
+        """
+        sql = "SELECT data FROM issues WHERE repo = ?"
+        params: List = [repo_name]
+        if state != "all":
+            sql += " AND state = ?"
+            params.append(state)
+        if pull_requests is not None:
+            sql += " AND is_pull_request = ?"
+            params.append(int(pull_requests))
+        wanted = [label.strip() for label in (labels or "").split(",") if label.strip()]
+        if wanted:
+            sql += (f" AND number IN (SELECT number FROM issue_labels WHERE repo = ? AND label IN"
+                    f" ({', '.join('?' * len(wanted))}) GROUP BY number HAVING COUNT(*) = ?)")
+            params += [repo_name, *wanted, len(wanted)]
+        with self._lock:
+            rows = self._db.execute(sql + " ORDER BY number DESC", params).fetchall()
+        return (json.loads(data) for (data,) in rows)
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self._lock:
+            self._db.close()
+
+class RateLimitBucket:
+    """Token bucket for one GitHub rate-limit resource (core, search, graphql, ...).
+
+    Quota above the low-water mark (RATE_LIMIT_LOW_WATER of the limit) is spent at full
+    speed. Below it the bucket holds at most burst tokens, refilled at the rate that
+    spreads the remaining quota evenly over the time left until the reset, so long jobs
+    are paced instead of draining the quota and stalling.
+    """
+
+    def __init__(self, resource: str, burst: int):
+        self.resource = resource
+        self.burst = burst
+        self.capacity = float(burst)
+        self.limit = None
+        self.remaining = None
+        self.reset = None
+        self.tokens = float(burst)
+        self.rate = None
+        self.blocked_until = 0.0
+        self._refilled_at = time.time()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent against this resource."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def reserve(self) -> float:
+        """Reserve the next request slot and return the seconds to wait before using it.
+
+        Never sleeps itself, so threaded callers (acquire) and asyncio callers can share
+        one bucket. Slots are handed out in order, so concurrent callers queue up behind
+        each other instead of all waking at once.
+        """
+        with self._lock:
+            now = time.time()
+            self._roll_over(now)
+
+            if self.remaining is not None and self.remaining <= 0 and self.reset is not None:
+                resume_at = datetime.fromtimestamp(self.reset).strftime("%H:%M:%S")
+                print(f"⏸️  {self.resource} rate limit exhausted, resuming at {resume_at}...")
+                self.blocked_until = max(self.blocked_until, self.reset + 1)
+
+            start = max(now, self.blocked_until)
+            self._roll_over(start)
+
+            if self.rate:
+                self.tokens = min(self.capacity, self.tokens + (start - self._refilled_at) * self.rate)
+                if self.tokens < 1:
+                    start += (1 - self.tokens) / self.rate
+                    self.tokens = 1.0
+                self.tokens -= 1
+            self._refilled_at = max(self._refilled_at, start)
+
+            if self.remaining is not None:
+                self.remaining -= 1
+            return start - now
+
+    def _roll_over(self, at: float) -> None:
+        """Restore the full quota once the reset time has passed."""
+        if self.reset is not None and at >= self.reset:
+            self.remaining = self.limit
+            self.reset = None
+            self.rate = None
+            self.capacity = float(self.burst)
+            self.tokens = float(self.burst)
+
+    def update(self, limit: int, remaining: int, reset: float) -> None:
+        """Record quota state reported by the API."""
+        with self._lock:
+            now = time.time()
+            self.limit = limit
+            self.remaining = remaining
+            self.reset = reset
+            self.rate = remaining / max(reset - now, 1.0)
+            spare = remaining - limit * RATE_LIMIT_LOW_WATER
+            self.capacity = max(float(self.burst), spare)
+            self.tokens = min(max(self.tokens, spare), self.capacity, float(remaining))
+
+    def block_for(self, seconds: float) -> None:
+        """Pause this resource, e.g. after a Retry-After response."""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.time() + seconds)
+
+class RateLimitScheduler:
+    """Per-resource rate-limit buckets fed from every response's X-RateLimit-* headers."""
+
+    def __init__(self, burst: int = 100):
+        """
+        Args:
+            burst: Requests allowed back-to-back once the quota is below the low-water mark
+        """
+        self.burst = burst
+        self.buckets: Dict[str, RateLimitBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, resource: str) -> RateLimitBucket:
+        """Get (or create) the bucket for a resource."""
+        with self._lock:
+            if resource not in self.buckets:
+                self.buckets[resource] = RateLimitBucket(resource, self.burst)
+            return self.buckets[resource]
+
+    @staticmethod
+    def resource_for(url: str) -> str:
+        """Guess the rate-limit resource a request will be charged to."""
+        path = url.split("?")[0]
+        if "/search/" in path:
+            return "search"
+        if path.endswith("/graphql"):
+            return "graphql"
+        return "core"
+
+    def acquire(self, url: str) -> None:
+        """Wait for permission to send a request to url."""
+        self.bucket(self.resource_for(url)).acquire()
+
+    def reserve(self, url: str) -> float:
+        """Reserve a slot for a request to url and return the seconds to wait (non-blocking)."""
+        return self.bucket(self.resource_for(url)).reserve()
+
+    def observe(self, url: str, response: requests.Response) -> None:
+        """Update buckets from rate-limit and Retry-After headers on a response."""
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource") or self.resource_for(url)
+        bucket = self.bucket(resource)
+
+        if "X-RateLimit-Remaining" in headers and "X-RateLimit-Reset" in headers:
+            bucket.update(int(headers.get("X-RateLimit-Limit", 0)),
+                          int(headers["X-RateLimit-Remaining"]),
+                          float(headers["X-RateLimit-Reset"]))
+
+        retry_after = headers.get("Retry-After")
+        if response.status_code in (403, 429) and retry_after:
+            bucket.block_for(float(retry_after))
+
+    def load(self, resources: Dict[str, Dict]) -> None:
+        """Seed buckets from a /rate_limit "resources" payload."""
+        for resource, quota in resources.items():
+            self.bucket(resource).update(quota["limit"], quota["remaining"], float(quota["reset"]))
+
+    def remaining(self, resource: str = "core") -> Optional[int]:
+        """Return the last known remaining quota for a resource."""
+        bucket = self.buckets.get(resource)
+        return bucket.remaining if bucket else None
+
+class TokenPool:
+    """Several credentials, each paced by its own RateLimitScheduler.
+
+    Reads go to the token with the most remaining quota for the request's resource; tokens
+    whose quota is still unknown count as having the most, so every token is probed early.
+    Writes stick to one identity and only move to another token when that one is exhausted.
+    Identity-bound endpoints (/user, /user/..., /rate_limit) always use the primary token,
+    because their answers depend on who is asking. Requests wait only when every candidate
+    token is exhausted, and then for the earliest reset.
+    """
+
+    def __init__(self, tokens: Iterable[str], burst: int = 100):
+        """
+        Args:
+            tokens: Personal access tokens or installation tokens; the first is the primary
+                identity (username, /user endpoints) and the initial write token
+            burst: Requests per token allowed back-to-back once its quota is below the low-water mark
+        """
+        self.tokens = list(dict.fromkeys(token for token in tokens if token))
+        if not self.tokens:
+            raise ValueError("a token pool needs at least one token")
+        self.primary = self.tokens[0]
+        self.write_token = self.primary
+        self.schedulers = {token: RateLimitScheduler(burst) for token in self.tokens}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["TokenPool"]:
+        """Pool from $GITHUB_TOKENS (comma- or whitespace-separated), or None when it is not set."""
+        tokens = re.split(r"[\s,]+", os.getenv("GITHUB_TOKENS", "").strip())
+        return cls(tokens) if any(tokens) else None
+
+    def _headroom(self, token: str, resource: str, now: float) -> float:
+        """Requests the token can send right now against resource (inf while unknown)."""
+        bucket = self.schedulers[token].buckets.get(resource)
+        if bucket is None:
+            return math.inf
+        if bucket.blocked_until > now:
+            return 0
+        if bucket.reset is not None and now >= bucket.reset:
+            return bucket.limit or math.inf
+        return math.inf if bucket.remaining is None else bucket.remaining
+
+    def _available_at(self, token: str, resource: str) -> float:
+        """When an exhausted token can send again."""
+        bucket = self.schedulers[token].buckets[resource]
+        return max(bucket.blocked_until, bucket.reset or 0)
+
+    def choose(self, url: str, write: bool = False, identity: bool = False) -> str:
+        """Pick the token for a request to url.
+
+        Args:
+            url: Request URL (decides the rate-limit resource)
+            write: Keep to the sticky write token unless it is exhausted
+            identity: The answer depends on the caller, so always use the primary token
+        """
+        if identity:
+            return self.primary
+
+        resource = RateLimitScheduler.resource_for(url)
+        with self._lock:
+            now = time.time()
+            if write and self._headroom(self.write_token, resource, now) > 0:
+                return self.write_token
+
+            token = max(self.tokens, key=lambda candidate: self._headroom(candidate, resource, now))
+            if self._headroom(token, resource, now) <= 0:
+                token = min(self.tokens, key=lambda candidate: self._available_at(candidate, resource))
+            if write and token != self.write_token:
+                print(f"🔁 Token {token_fingerprint(self.write_token)[:8]} is out of {resource} quota, "
+                      f"writes continue as {token_fingerprint(token)[:8]}")
+                self.write_token = token
+            return token
+
+    def remaining(self, resource: str = "core") -> Optional[int]:
+        """Known remaining quota summed over the pool (None until any token has reported)."""
+        known = [scheduler.remaining(resource) for scheduler in self.schedulers.values()]
+        known = [remaining for remaining in known if remaining is not None]
+        return sum(known) if known else None
+
+    def status(self) -> List[Dict]:
+        """Per-token quota state, identified by token fingerprint."""
+        return [{
+            "token": token_fingerprint(token)[:8],
+            "primary": token == self.primary,
+            "writes": token == self.write_token,
+            "resources": {resource: {"remaining": bucket.remaining, "limit": bucket.limit}
+                          for resource, bucket in self.schedulers[token].buckets.items()}
+        } for token in self.tokens]
+
+def endpoint_template(path: str) -> str:
+    """Collapse a request path to its endpoint, e.g. /repos/{owner}/{repo}/issues/{number}."""
+    parts = [part for part in path.split("/") if part]
+    if parts[:1] == ["repos"] and len(parts) >= 3:
+        template, rest = ["repos", "{owner}", "{repo}"], parts[3:]
+    elif parts[:1] in (["users"], ["orgs"]) and len(parts) >= 2:
+        template, rest = [parts[0], "{name}"], parts[2:]
+    else:
+        template, rest = [], parts
+
+    for index, part in enumerate(rest):
+        previous = rest[index - 1] if index else None
+        if previous in ("contents", "ref", "refs"):
+            template.append("{path}" if previous == "contents" else "{ref}")
+            break  # File paths and branch names may contain further slashes
+        if part.isdigit():
+            template.append("{number}")
+        elif previous in ("trees", "commits", "blobs") or re.fullmatch(r"[0-9a-f]{40}", part):
+            template.append("{sha}")
+        else:
+            template.append(part)
+    return "/" + "/".join(template)
+
+class RequestMetrics:
+    """Thread-safe request instrumentation, aggregated per (method, endpoint).
+
+    Records latency histograms, bytes transferred, retries, status codes, cache outcomes
+    and the rate-limit headroom seen in response headers. Summaries can be printed, exported
+    as JSON or Prometheus text, and hooks receive one event dict per request for tracing.
+    """
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.endpoints: Dict[Tuple[str, str], Dict] = {}
+        self.rate_limits: Dict[str, Dict] = {}
+        self.hooks: List[Callable[[Dict], None]] = []
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Callable[[Dict], None]) -> Callable[[Dict], None]:
+        """Call hook with every request event (usable as a decorator)."""
+        self.hooks.append(hook)
+        return hook
+
+    def record(self, event: Dict) -> None:
+        """Aggregate one request event.
+
+        Args:
+            event: method, endpoint, url, status (None if the request raised), seconds, bytes_in,
+                bytes_out, retries, cache ("hit", "revalidated", "miss" or None) and error
+        """
+        key = (event["method"], event["endpoint"])
+        with self._lock:
+            stats = self.endpoints.get(key)
+            if stats is None:
+                stats = self.endpoints[key] = {
+                    "count": 0, "errors": 0, "seconds": 0.0, "max": 0.0, "bytes_in": 0, "bytes_out": 0,
+                    "retries": 0, "statuses": {}, "cache": {}, "histogram": [0] * (len(self.buckets) + 1)
+                }
+            stats["count"] += 1
+            stats["errors"] += event["status"] is None or event["status"] >= 400
+            stats["seconds"] += event["seconds"]
+            stats["max"] = max(stats["max"], event["seconds"])
+            stats["bytes_in"] += event["bytes_in"]
+            stats["bytes_out"] += event["bytes_out"]
+            stats["retries"] += event["retries"]
+            status = str(event["status"] or "error")
+            stats["statuses"][status] = stats["statuses"].get(status, 0) + 1
+            if event["cache"]:
+                stats["cache"][event["cache"]] = stats["cache"].get(event["cache"], 0) + 1
+            stats["histogram"][bisect.bisect_left(self.buckets, event["seconds"])] += 1
+
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception as e:
+                print(f"⚠️  Trace hook failed: {e}")
+
+    def observe_rate_limit(self, headers) -> None:
+        """Track remaining quota (and the lowest value seen) per rate-limit resource."""
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        resource = headers.get("X-RateLimit-Resource", "core")
+        remaining = int(headers["X-RateLimit-Remaining"])
+        with self._lock:
+            entry = self.rate_limits.setdefault(resource, {"min_remaining": remaining})
+            entry.update(limit=int(headers.get("X-RateLimit-Limit", 0)), remaining=remaining,
+                         min_remaining=min(entry["min_remaining"], remaining))
+
+    def _quantile(self, stats: Dict, q: float) -> float:
+        """Upper bound of the histogram bucket holding the q-quantile (the max for the last bucket)."""
+        target = q * stats["count"]
+        seen = 0
+        for index, count in enumerate(stats["histogram"]):
+            seen += count
+            if seen >= target and count:
+                return min(self.buckets[index], stats["max"]) if index < len(self.buckets) else stats["max"]
+        return stats["max"]
+
+    def summary(self) -> Dict:
+        """Totals, per-endpoint rows (slowest total time first) and rate-limit headroom."""
+        with self._lock:
+            items = [(key, dict(stats, statuses=dict(stats["statuses"]), cache=dict(stats["cache"]),
+                                histogram=list(stats["histogram"]))) for key, stats in self.endpoints.items()]
+            rate_limits = {resource: dict(entry) for resource, entry in self.rate_limits.items()}
+
+        rows = []
+        for (method, endpoint), stats in sorted(items, key=lambda item: item[1]["seconds"], reverse=True):
+            rows.append({
+                "method": method, "endpoint": endpoint, "count": stats["count"], "errors": stats["errors"],
+                "total_s": round(stats["seconds"], 3),
+                "mean_ms": round(stats["seconds"] / stats["count"] * 1000, 1),
+                "p50_ms": round(self._quantile(stats, 0.5) * 1000, 1),
+                "p95_ms": round(self._quantile(stats, 0.95) * 1000, 1),
+                "max_ms": round(stats["max"] * 1000, 1),
+                "bytes_in": stats["bytes_in"], "bytes_out": stats["bytes_out"], "retries": stats["retries"],
+                "statuses": stats["statuses"], "cache": stats["cache"],
+                "histogram": dict(zip([str(bound) for bound in self.buckets] + ["+Inf"], stats["histogram"]))
+            })
+
+        return {
+            "wall_s": round(time.monotonic() - self.started, 3),
+            "requests": sum(row["count"] for row in rows),
+            "errors": sum(row["errors"] for row in rows),
+            "request_s": round(sum(row["total_s"] for row in rows), 3),
+            "bytes_in": sum(row["bytes_in"] for row in rows),
+            "bytes_out": sum(row["bytes_out"] for row in rows),
+            "retries": sum(row["retries"] for row in rows),
+            "cache": {outcome: sum(row["cache"].get(outcome, 0) for row in rows)
+                      for outcome in ("hit", "revalidated", "miss")},
+            "rate_limits": rate_limits,
+            "endpoints": rows
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.summary(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition of the collected metrics."""
+        def labels(**values) -> str:
+            pairs = []
+            for name, value in values.items():
+                value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+                pairs.append(f'{name}="{value}"')
+            return "{" + ",".join(pairs) + "}"
+
+        with self._lock:
+            items = sorted((key, dict(stats, histogram=list(stats["histogram"]), statuses=dict(stats["statuses"]),
+                                      cache=dict(stats["cache"]))) for key, stats in self.endpoints.items())
+            rate_limits = {resource: dict(entry) for resource, entry in self.rate_limits.items()}
+
+        lines = ["# TYPE github_manager_request_duration_seconds histogram"]
+        for (method, endpoint), stats in items:
+            cumulative = 0
+            for bound, count in zip([str(bound) for bound in self.buckets] + ["+Inf"], stats["histogram"]):
+                cumulative += count
+                lines.append(f"github_manager_request_duration_seconds_bucket"
+                             f"{labels(method=method, endpoint=endpoint, le=bound)} {cumulative}")
+            lines.append(f"github_manager_request_duration_seconds_sum{labels(method=method, endpoint=endpoint)} "
+                         f"{stats['seconds']:.6f}")
+            lines.append(f"github_manager_request_duration_seconds_count{labels(method=method, endpoint=endpoint)} "
+                         f"{stats['count']}")
+
+        counters = [("requests_total", "statuses", "status"), ("cache_requests_total", "cache", "result")]
+        for name, field, label in counters:
+            lines.append(f"# TYPE github_manager_{name} counter")
+            for (method, endpoint), stats in items:
+                for value, count in sorted(stats[field].items()):
+                    lines.append(f"github_manager_{name}{labels(method=method, endpoint=endpoint, **{label: value})} "
+                                 f"{count}")
+
+        for name, field in (("response_bytes_total", "bytes_in"), ("request_bytes_total", "bytes_out"),
+                            ("retries_total", "retries")):
+            lines.append(f"# TYPE github_manager_{name} counter")
+            for (method, endpoint), stats in items:
+                lines.append(f"github_manager_{name}{labels(method=method, endpoint=endpoint)} {stats[field]}")
+
+        lines.append("# TYPE github_manager_rate_limit_remaining gauge")
+        for resource, entry in sorted(rate_limits.items()):
+            lines.append(f"github_manager_rate_limit_remaining{labels(resource=resource)} {entry['remaining']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Union[str, Path]) -> Path:
+        """Write the metrics as JSON for .json paths, otherwise as Prometheus text."""
+        path = Path(path)
+        path.write_text(self.to_json() if path.suffix.lower() == ".json" else self.to_prometheus())
+        return path
+
+    def print_summary(self, limit: int = 15) -> None:
+        """Print totals and the endpoints with the most total request time."""
+        summary = self.summary()
+        cache = summary["cache"]
+        print(f"\n📈 {summary['requests']} requests in {summary['wall_s']}s wall "
+              f"({summary['request_s']}s in requests), {summary['errors']} errors, {summary['retries']} retries, "
+              f"{summary['bytes_in'] / 1024:.1f} KiB in / {summary['bytes_out'] / 1024:.1f} KiB out")
+        if any(cache.values()):
+            print(f"   cache: {cache['hit']} hits, {cache['revalidated']} revalidated, {cache['miss']} misses")
+        for resource, entry in sorted(summary["rate_limits"].items()):
+            print(f"   rate limit {resource}: {entry['remaining']}/{entry['limit']} remaining "
+                  f"(lowest {entry['min_remaining']})")
+
+        print(f"   {'calls':>6} {'err':>4} {'total s':>8} {'mean ms':>8} {'p95 ms':>8} {'max ms':>8} {'KiB':>8}  endpoint")
+        for row in summary["endpoints"][:limit]:
+            print(f"   {row['count']:>6} {row['errors']:>4} {row['total_s']:>8} {row['mean_ms']:>8} "
+                  f"{row['p95_ms']:>8} {row['max_ms']:>8} {row['bytes_in'] / 1024:>8.1f}  "
+                  f"{row['method']} {row['endpoint']}")
+
+class ProfileBackup:
+    """Incremental, content-addressed profile backup store.
+
+    Layout under the backup directory:
+        snapshots/<id>.jsonl      one manifest line per record: name, updated_at, pushed_at, hash, pack
+        packs/<id>.jsonl[.gz]     full records first seen in that run, one {"hash", "record"} per line
+
+    A run only writes records whose updated_at/pushed_at (and content hash) changed since the
+    previous snapshot; unchanged records point at the pack that already holds them.
+    """
+
+    def __init__(self, directory: Union[str, Path] = DEFAULT_BACKUP_DIR, compress: bool = False):
+        """
+        Args:
+            directory: Backup root directory
+            compress: Gzip newly written packs
+        """
+        self.directory = Path(directory)
+        self.compress = compress
+        self.snapshot_dir = self.directory / "snapshots"
+        self.pack_dir = self.directory / "packs"
+
+    @staticmethod
+    def record_hash(record: Dict) -> str:
+        """Content hash of a record, independent of key order."""
+        canonical = json.dumps(record, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def snapshots(self) -> List[str]:
+        """Snapshot ids, oldest first."""
+        if not self.snapshot_dir.exists():
+            return []
+        return sorted(path.stem for path in self.snapshot_dir.glob("*.jsonl"))
+
+    def load_manifest(self, snapshot_id: str) -> Dict[str, Dict]:
+        """Manifest entries of a snapshot keyed by "kind:name"."""
+        entries = {}
+        with open(self.snapshot_dir / f"{snapshot_id}.jsonl") as f:
+            for line in f:
+                entry = json.loads(line)
+                entries[f"{entry['kind']}:{entry['name']}"] = entry
+        return entries
+
+    def create(self, user: Dict, repos: Iterable[Dict]) -> Dict:
+        """Write a new snapshot from a user record and a stream of repository records.
+
+        Returns:
+            Summary with the snapshot id and counts of written vs. reused records
+        """
+        previous = self.load_manifest(self.snapshots()[-1]) if self.snapshots() else {}
+        snapshot_id = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        pack_name = f"{snapshot_id}.jsonl" + (".gz" if self.compress else "")
+
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        self.pack_dir.mkdir(parents=True, exist_ok=True)
+        manifest_tmp = self.snapshot_dir / f"{snapshot_id}.jsonl.tmp"
+        summary = {"snapshot": snapshot_id, "written": 0, "unchanged": 0}
+        pack = None
+
+        def add(kind: str, name: str, record: Dict, manifest) -> None:
+            nonlocal pack
+            old = previous.get(f"{kind}:{name}")
+            entry = {"kind": kind, "name": name,
+                     "updated_at": record.get("updated_at"), "pushed_at": record.get("pushed_at")}
+
+            if old and kind == "repo" and (old["updated_at"], old["pushed_at"]) == (entry["updated_at"], entry["pushed_at"]):
+                entry.update(hash=old["hash"], pack=old["pack"])
+            else:
+                entry["hash"] = self.record_hash(record)
+                if old and old["hash"] == entry["hash"]:
+                    entry["pack"] = old["pack"]
+                else:
+                    if pack is None:
+                        pack = self._open(self.pack_dir / pack_name, "wt")
+                    pack.write(json.dumps({"hash": entry["hash"], "record": record}) + "\n")
+                    entry["pack"] = pack_name
+
+            summary["written" if entry["pack"] == pack_name else "unchanged"] += 1
+            manifest.write(json.dumps(entry) + "\n")
+
+        try:
+            with open(manifest_tmp, "w") as manifest:
+                add("user", user.get("login", "user"), user, manifest)
+                for repo in repos:
+                    add("repo", repo["name"], repo, manifest)
+        finally:
+            if pack is not None:
+                pack.close()
+
+        # The manifest only becomes visible once complete, so an interrupted run leaves no snapshot
+        manifest_tmp.replace(self.snapshot_dir / f"{snapshot_id}.jsonl")
+        return summary
+
+    def _open(self, path: Path, mode: str):
+        return gzip.open(path, mode) if path.suffix == ".gz" else open(path, mode)
+
+    def _load_records(self, entries: Iterable[Dict]) -> Dict[str, Dict]:
+        """Load the records referenced by manifest entries, reading each pack once."""
+        wanted: Dict[str, set] = {}
+        for entry in entries:
+            wanted.setdefault(entry["pack"], set()).add(entry["hash"])
+
+        records = {}
+        for pack_name, hashes in wanted.items():
+            with self._open(self.pack_dir / pack_name, "rt") as f:
+                for line in f:
+                    item = json.loads(line)
+                    if item["hash"] in hashes:
+                        records[item["hash"]] = item["record"]
+        return records
+
+    def restore(self, snapshot_id: str, output: Union[str, Path]) -> Path:
+        """Materialize a snapshot as a github_profile_backup.json-style file."""
+        manifest = self.load_manifest(snapshot_id)
+        records = self._load_records(manifest.values())
+        user = next((records[e["hash"]] for e in manifest.values() if e["kind"] == "user"), {})
+
+        output = Path(output)
+        with open(output, "w") as f:
+            json.dump({
+                "user": user,
+                "repositories": [records[e["hash"]] for e in manifest.values() if e["kind"] == "repo"],
+                "timestamp": str(datetime.strptime(snapshot_id, "%Y%m%dT%H%M%S%f"))
+            }, f, indent=2)
+        return output
+
+    def diff(self, old_id: str, new_id: str) -> Dict:
+        """Compare two snapshots: added/removed repositories and changed fields per record."""
+        old = self.load_manifest(old_id)
+        new = self.load_manifest(new_id)
+        changed_keys = [key for key in old.keys() & new.keys() if old[key]["hash"] != new[key]["hash"]]
+        records = self._load_records([old[key] for key in changed_keys] + [new[key] for key in changed_keys])
+
+        changed = {}
+        for key in sorted(changed_keys):
+            before, after = records[old[key]["hash"]], records[new[key]["hash"]]
+            changed[key] = {field: {"old": before.get(field), "new": after.get(field)}
+                            for field in sorted(before.keys() | after.keys()) if before.get(field) != after.get(field)}
+
+        return {
+            "added": sorted(key for key in new.keys() - old.keys()),
+            "removed": sorted(key for key in old.keys() - new.keys()),
+            "changed": changed
+        }
+
+class IssueImportCheckpoint:
+    """Append-only JSONL log of import records that were applied, keyed by record hash.
+
+    Each applied record is written (and flushed) as soon as it completes, so a re-run with the
+    same checkpoint skips everything an interrupted run already did.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.done: Dict[str, Optional[int]] = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Last line of a run killed mid-write
+                    self.done[entry["key"]] = entry.get("number")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.done
+
+    def mark(self, key: str, result: Dict) -> None:
+        """Record a completed import record."""
+        self.done[key] = result.get("number")
+        with open(self.path, "a") as f:
+            f.write(json.dumps({"key": key, "repo": result["repo"], "number": result.get("number"),
+                                "action": result["action"]}) + "\n")
+
+class JobQueue:
+    """Durable SQLite queue of bulk-operation items, so interrupted jobs can be resumed.
+
+    A job is identified by its kind and a hash of its parameters. Every item is stored under an
+    idempotency key (the repository name) with its planned payload and a state: pending,
+    running, done or failed. Item results are committed as soon as they finish, so a resumed job
+    skips finished items without any API calls. Items a killed process left running are simply
+    run again on resume; the writes they carry (PATCH/PUT of desired values) are idempotent.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_JOB_QUEUE_PATH):
+        """
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                params_hash TEXT NOT NULL,
+                params TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                enqueued INTEGER NOT NULL DEFAULT 0,
+                finished_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS job_items (
+                job_id INTEGER NOT NULL,
+                key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (job_id, key)
+            );
+            CREATE INDEX IF NOT EXISTS job_items_state ON job_items (job_id, state);
+        """)
+        self._db.commit()
+
+    def open_job(self, kind: str, params: Dict, resume: bool = False) -> Tuple[int, bool]:
+        """Return (job id, resumed): the newest unfinished matching job if resuming, else a new job."""
+        params_hash = ProfileBackup.record_hash(params)
+        with self._lock:
+            if resume:
+                row = self._db.execute(
+                    "SELECT id FROM jobs WHERE kind = ? AND params_hash = ? AND finished_at IS NULL "
+                    "ORDER BY id DESC LIMIT 1", (kind, params_hash)
+                ).fetchone()
+                if row:
+                    return row[0], True
+            cursor = self._db.execute("INSERT INTO jobs (kind, params_hash, params, created_at) VALUES (?, ?, ?, ?)",
+                                      (kind, params_hash, json.dumps(params, sort_keys=True), time.time()))
+            self._db.commit()
+        return cursor.lastrowid, False
+
+    def is_enqueued(self, job_id: int) -> bool:
+        """Whether every item of the job has been stored."""
+        with self._lock:
+            row = self._db.execute("SELECT enqueued FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def add(self, job_id: int, key: str, payload: Dict) -> str:
+        """Store an item unless its key is already queued; returns the item's current state.
+
+        Insertions are committed together with the next item state change.
+        """
+        with self._lock:
+            self._db.execute("INSERT OR IGNORE INTO job_items (job_id, key, payload, state, updated_at) "
+                             "VALUES (?, ?, ?, 'pending', ?)", (job_id, key, json.dumps(payload), time.time()))
+            return self._db.execute("SELECT state FROM job_items WHERE job_id = ? AND key = ?",
+                                    (job_id, key)).fetchone()[0]
+
+    def mark_enqueued(self, job_id: int) -> None:
+        with self._lock:
+            self._db.execute("UPDATE jobs SET enqueued = 1 WHERE id = ?", (job_id,))
+            self._db.commit()
+
+    def pending(self, job_id: int) -> List[Dict]:
+        """Payloads of every item not yet done, in the order they were queued."""
+        with self._lock:
+            rows = self._db.execute("SELECT payload FROM job_items WHERE job_id = ? AND state != 'done' ORDER BY rowid",
+                                    (job_id,)).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def start(self, job_id: int, key: str) -> None:
+        """Mark an item running and count the attempt."""
+        with self._lock:
+            self._db.execute("UPDATE job_items SET state = 'running', attempts = attempts + 1, updated_at = ? "
+                             "WHERE job_id = ? AND key = ?", (time.time(), job_id, key))
+            self._db.commit()
+
+    def complete(self, job_id: int, key: str, result: Dict) -> None:
+        """Store an item's final result for this run: done if it succeeded, failed otherwise."""
+        with self._lock:
+            self._db.execute("UPDATE job_items SET state = ?, result = ?, error = ?, updated_at = ? "
+                             "WHERE job_id = ? AND key = ?",
+                             ("done" if result["ok"] else "failed", json.dumps(result), result.get("error"),
+                              time.time(), job_id, key))
+            self._db.commit()
+
+    def progress(self, job_id: int) -> Dict[str, int]:
+        """Item counts by state."""
+        with self._lock:
+            rows = self._db.execute("SELECT state, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY state",
+                                    (job_id,)).fetchall()
+        return dict(rows)
+
+    def finish(self, job_id: int) -> None:
+        with self._lock:
+            self._db.execute("UPDATE jobs SET finished_at = ? WHERE id = ?", (time.time(), job_id))
+            self._db.commit()
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self._lock:
+            self._db.close()
+
+class RepoConfig:
+    """Compiled repository manifest: exact entries, ordered pattern rules and defaults.
+
+    Exact names and literal rules are dict lookups. Globs are compiled once each and bucketed
+    by their literal prefix (or, failing that, suffix), so a name is only tested against globs
+    that could match it; regexes keep their own groups and inline flags and are always tried.
+    The lowest-indexed matching rule wins. Resolved names are memoized.
+    """
+
+    FIELDS = ("description", "topics", "homepage")
+
+    def __init__(self, data: Dict = None):
+        data = data or {}
+        self.defaults = {field: (data.get("defaults") or {}).get(field) for field in self.FIELDS}
+        self.repositories = {name: entry or {} for name, entry in (data.get("repositories") or {}).items()}
+        self.rules = list(data.get("rules") or [])
+
+        self._literal_rules = {}
+        self._by_prefix: Dict[str, List[Tuple[int, re.Pattern]]] = {}
+        self._by_suffix: Dict[str, List[Tuple[int, re.Pattern]]] = {}
+        self._unanchored: List[Tuple[int, re.Pattern]] = []
+        for index, rule in enumerate(self.rules):
+            if "regex" in rule:
+                try:
+                    self._unanchored.append((index, re.compile(rule["regex"])))
+                except re.error as e:
+                    raise ValueError(f"Invalid regex in rule {index + 1} ({rule['regex']!r}): {e}") from e
+                continue
+
+            glob = rule["match"]
+            wildcards = [position for position, char in enumerate(glob) if char in "*?["]
+            if not wildcards:
+                self._literal_rules.setdefault(glob, index)
+                continue
+
+            compiled = (index, re.compile(fnmatch.translate(glob)))
+            prefix = glob[:wildcards[0]]
+            # A "]" closes a character class, so only text after the last one is literal
+            suffix = glob[max(wildcards[-1], glob.rfind("]")) + 1:]
+            if prefix:
+                self._by_prefix.setdefault(prefix, []).append(compiled)
+            elif suffix:
+                self._by_suffix.setdefault(suffix, []).append(compiled)
+            else:
+                self._unanchored.append(compiled)
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._by_prefix})
+        self._suffix_lengths = sorted({len(suffix) for suffix in self._by_suffix})
+        self._resolved: Dict[str, Dict] = {}
+
+    def _match_rule(self, repo_name: str) -> Optional[int]:
+        """Index of the first rule matching repo_name, if any."""
+        candidates = list(self._unanchored)
+        for length in self._prefix_lengths:
+            candidates += self._by_prefix.get(repo_name[:length], ())
+        for length in self._suffix_lengths:
+            candidates += self._by_suffix.get(repo_name[-length:], ())
+
+        literal = self._literal_rules.get(repo_name)
+        for index, pattern in sorted(candidates, key=lambda candidate: candidate[0]):
+            if literal is not None and literal < index:
+                break
+            if pattern.fullmatch(repo_name):
+                return index
+        return literal
+
+    def resolve(self, repo_name: str) -> Dict:
+        """Desired description/topics/homepage for a repository (None where unmanaged)."""
+        resolved = self._resolved.get(repo_name)
+        if resolved is None:
+            resolved = dict(self.defaults)
+            rule_index = self._match_rule(repo_name)
+            if rule_index is not None:
+                resolved.update({field: self.rules[rule_index][field]
+                                 for field in self.FIELDS if field in self.rules[rule_index]})
+            entry = self.repositories.get(repo_name, {})
+            resolved.update({field: entry[field] for field in self.FIELDS if field in entry})
+            self._resolved[repo_name] = resolved
+        return resolved
+
+    def descriptions(self) -> Dict[str, str]:
+        """Descriptions of explicitly listed repositories."""
+        return {name: entry["description"] for name, entry in self.repositories.items() if entry.get("description")}
+
+_repo_config_cache: Dict[str, Tuple[Tuple[int, int], RepoConfig]] = {}
+_repo_config_lock = threading.Lock()
+
+def load_repo_config(path: Union[str, Path] = None) -> RepoConfig:
+    """Load and compile a YAML/JSON repository manifest, cached until the file changes.
+
+    Args:
+        path: Manifest path (default: $GITHUB_REPO_CONFIG or repositories.yaml next to this script)
+    """
+    path = Path(path or os.getenv("GITHUB_REPO_CONFIG") or DEFAULT_REPO_CONFIG)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return RepoConfig()
+
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _repo_config_lock:
+        cached = _repo_config_cache.get(str(path))
+        if cached and cached[0] == version:
+            return cached[1]
+
+        with open(path) as f:
+            if path.suffix == ".json":
+                data = json.load(f)
+            else:
+                try:
+                    import yaml
+                except ImportError as e:
+                    raise ImportError("PyYAML is required for YAML repo configs: pip install pyyaml") from e
+                data = yaml.safe_load(f)
+
+        config = RepoConfig(data)
+        _repo_config_cache[str(path)] = (version, config)
+        return config
+
+class WorkflowTemplate:
+    """A workflow file with {{ name }} placeholders, split into literal and variable parts once.
+
+    GitHub Actions expressions (${{ ... }}) are left untouched.
+    """
+
+    PLACEHOLDER = re.compile(r"(?<!\$)\{\{\s*(\w+)\s*\}\}")
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        # Alternating literal text and variable names: [text, var, text, var, ..., text]
+        self._parts: List[str] = []
+        position = 0
+        for match in self.PLACEHOLDER.finditer(source):
+            self._parts += [source[position:match.start()], match.group(1)]
+            position = match.end()
+        self._parts.append(source[position:])
+        self.variables = frozenset(self._parts[1::2])
+
+    def render(self, variables: Dict) -> str:
+        """Substitute variables into the template.
+
+        Raises:
+            ValueError: If a placeholder has no value
+        """
+        missing = self.variables - variables.keys()
+        if missing:
+            raise ValueError(f"Workflow template {self.name!r} is missing variables: {', '.join(sorted(missing))}")
+        return "".join(part if index % 2 == 0 else str(variables[part]) for index, part in enumerate(self._parts))
+
+_workflow_template_cache: Dict[str, Dict[str, WorkflowTemplate]] = {}
+_workflow_template_lock = threading.Lock()
+
+def load_workflow_templates(directory: Union[str, Path] = None) -> Dict[str, WorkflowTemplate]:
+    """Load and parse every *.yml template in a directory once per process, keyed by file stem.
+
+    Args:
+        directory: Template directory (default: $GITHUB_WORKFLOW_TEMPLATES or workflow_templates/
+            next to this script)
+    """
+    directory = Path(directory or os.getenv("GITHUB_WORKFLOW_TEMPLATES") or DEFAULT_WORKFLOW_TEMPLATES)
+    with _workflow_template_lock:
+        templates = _workflow_template_cache.get(str(directory))
+        if templates is None:
+            templates = {path.stem: WorkflowTemplate(path.stem, path.read_text())
+                         for path in sorted(directory.glob("*.yml"))}
+            _workflow_template_cache[str(directory)] = templates
+        return templates
+
+def parse_version_file(path: str, text: str) -> Optional[str]:
+    """Runtime version declared by a version file (.python-version, pyproject.toml, .nvmrc, package.json)."""
+    name = path.rsplit("/", 1)[-1]
+    if name in (".python-version", ".nvmrc"):
+        value = (text.split() or [""])[0].lstrip("v")
+        return value if re.match(r"\d+(\.\d+)*$", value) else None
+    if name == "pyproject.toml":
+        spec = re.search(r"""^\s*requires-python\s*=\s*["']([^"']+)["']""", text, re.MULTILINE)
+        if spec:
+            version = re.search(r"(?:>=|~=|==|\^)\s*(\d+\.\d+)", spec.group(1)) or re.match(r"\s*(\d+\.\d+)", spec.group(1))
+            return version.group(1) if version else None
+    if name == "package.json":
+        try:
+            engine = (json.loads(text).get("engines") or {}).get("node")
+        except (ValueError, AttributeError):
+            return None
+        version = re.search(r"\d+", engine) if isinstance(engine, str) else None
+        return version.group(0) if version else None
+    return None
+
+def detect_workflow_variables(repo: Dict, languages: Dict[str, int] = None, version_files: Dict[str, str] = None,
+                              template: str = None) -> Tuple[Optional[str], Dict]:
+    """Pick a workflow template and its variables for a repository.
+
+    Args:
+        repo: Repository listing entry (language and default_branch are used)
+        languages: /languages data (bytes per language); the first language with a template wins
+        version_files: Path -> text of the template's version files (see WORKFLOW_VERSION_FILES);
+            the first one declaring a version overrides WORKFLOW_DEFAULTS
+        template: Template to use instead of detecting one from the languages
+
+    Returns:
+        (template name or None, variables)
+    """
+    if template is None:
+        ranked = sorted(languages, key=languages.get, reverse=True) if languages else [repo.get("language")]
+        template = next((WORKFLOW_LANGUAGES[language] for language in ranked if language in WORKFLOW_LANGUAGES), None)
+
+    default_branch = repo.get("default_branch") or "main"
+    variables = dict(WORKFLOW_DEFAULTS, branches=", ".join(dict.fromkeys([default_branch, "main", "master"])))
+    if template in WORKFLOW_VERSION_FILES and version_files:
+        variable, paths = WORKFLOW_VERSION_FILES[template]
+        version = next(filter(None, (parse_version_file(path, version_files[path])
+                                     for path in paths if version_files.get(path))), None)
+        if version:
+            variables[variable] = version
+    return template, variables
+
+def _login(user: Optional[Dict]) -> Optional[str]:
+    login = (user or {}).get("login")
+    return sys.intern(login) if login else None
+
+class ApiRecord:
+    """Compact, read-only projection of a GitHub API object.
+
+    Only FIELDS are kept, in __slots__ (no per-instance dict), and nested objects are reduced
+    to the value callers read: a login, a label name, a license id. Repeated low-cardinality
+    strings are interned. Records also answer the dict read interface (record["name"],
+    record.get("description"), "name" in record), so code written against raw API dicts works
+    unchanged.
+    """
+
+    __slots__ = ()
+    FIELDS: Tuple[str, ...] = ()
+    # Fields derived from the raw object by a function instead of copied by key
+    PROJECTIONS: Dict[str, Callable[[Dict], object]] = {}
+    INTERNED: frozenset = frozenset()
+
+    def __init__(self, **values):
+        for field in self.FIELDS:
+            object.__setattr__(self, field, values.get(field))
+
+    @classmethod
+    def from_api(cls, data: Dict) -> "ApiRecord":
+        """Project a raw API object (or a mirrored/backed-up copy of one) onto the record fields."""
+        record = cls.__new__(cls)
+        for field in cls.FIELDS:
+            project = cls.PROJECTIONS.get(field)
+            value = project(data) if project else data.get(field)
+            if field in cls.INTERNED and value is not None:
+                value = sys.intern(value)
+            object.__setattr__(record, field, value)
+        return record
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"{type(self).__name__} records are read-only")
+
+    def __getitem__(self, key: str):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.FIELDS
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.FIELDS
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        key = self.FIELDS[0]
+        return f"{type(self).__name__}({key}={getattr(self, key)!r})"
+
+class Repo(ApiRecord):
+    """Repository fields used by listings, plans, rollouts and health checks."""
+
+    FIELDS = ("name", "full_name", "owner", "description", "homepage", "html_url", "private", "fork", "archived",
+              "language", "topics", "license", "default_branch", "stargazers_count", "forks_count",
+              "open_issues_count", "created_at", "updated_at", "pushed_at")
+    __slots__ = FIELDS
+    PROJECTIONS = {
+        "owner": lambda data: _login(data.get("owner")),
+        "license": lambda data: (data.get("license") or {}).get("spdx_id"),
+    }
+    INTERNED = frozenset(["owner", "language", "default_branch"])
+
+class Issue(ApiRecord):
+    """Issue fields used by listings and the issue importer."""
+
+    FIELDS = ("number", "title", "state", "body", "user", "labels", "assignees", "milestone", "comments",
+              "html_url", "created_at", "updated_at", "closed_at")
+    __slots__ = FIELDS
+    PROJECTIONS = {
+        "user": lambda data: _login(data.get("user")),
+        "labels": lambda data: [sys.intern(label["name"]) for label in data.get("labels") or []],
+        "assignees": lambda data: [_login(user) for user in data.get("assignees") or []],
+        "milestone": lambda data: (data.get("milestone") or {}).get("number"),
+    }
+    INTERNED = frozenset(["state"])
+
+class PullRequest(Issue):
+    """Pull request entry of an issue listing."""
+
+    FIELDS = Issue.FIELDS + ("draft", "merged_at")
+    __slots__ = ("draft", "merged_at")
+    PROJECTIONS = {**Issue.PROJECTIONS, "merged_at": lambda data: (data.get("pull_request") or {}).get("merged_at")}
+
+    def __contains__(self, key: str) -> bool:
+        # Issue listings mark pull requests with a "pull_request" key
+        return key == "pull_request" or super().__contains__(key)
+
+class Commit(ApiRecord):
+    """Commit listing entry."""
+
+    FIELDS = ("sha", "message", "author_name", "author_email", "author_login", "date")
+    __slots__ = FIELDS
+    PROJECTIONS = {
+        "message": lambda data: data["commit"]["message"],
+        "author_name": lambda data: (data["commit"].get("author") or {}).get("name"),
+        "author_email": lambda data: (data["commit"].get("author") or {}).get("email"),
+        "author_login": lambda data: _login(data.get("author")),
+        "date": lambda data: (data["commit"].get("author") or {}).get("date"),
+    }
+
+def issue_record(data: Dict) -> Issue:
+    """Project an issues-endpoint entry onto Issue or PullRequest."""
+    return (PullRequest if "pull_request" in data else Issue).from_api(data)
+
+def webhook_repository(repo: Dict) -> Dict:
+    """Normalize a webhook repository object to the REST shape (push events send Unix timestamps)."""
+    repo = dict(repo)
+    for field in ("created_at", "pushed_at"):
+        if isinstance(repo.get(field), (int, float)):
+            repo[field] = datetime.fromtimestamp(repo[field], timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return repo
+
+def pull_request_issue(pr: Dict) -> Dict:
+    """A pull request object reshaped as the issues endpoint lists it."""
+    issue = {field: pr.get(field) for field in (
+        "id", "node_id", "number", "title", "state", "locked", "user", "labels", "assignee", "assignees",
+        "milestone", "comments", "created_at", "updated_at", "closed_at", "author_association", "body", "draft")}
+    issue.update(url=pr.get("issue_url"), html_url=pr.get("html_url"), pull_request={
+        "url": pr.get("url"), "html_url": pr.get("html_url"), "diff_url": pr.get("diff_url"),
+        "patch_url": pr.get("patch_url"), "merged_at": pr.get("merged_at")})
+    return issue
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator:
+    """Decode the elements of a top-level JSON array one at a time from byte chunks.
+
+    Only the element being decoded (plus one chunk of text) is held, so a large list response
+    never exists as one nested structure.
+    """
+    import codecs
+
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer, position = "", 0
+    started = exhausted = False
+
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position < len(buffer):
+            if not started:
+                if buffer[position] != "[":
+                    raise ValueError("expected a JSON array")
+                started = True
+                position += 1
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except ValueError:
+                end = None  # Element continues in the next chunk
+            # A number or literal is only complete once a delimiter follows it ("2." may be "2.5")
+            if end is not None and (buffer[position] in '{["' or exhausted
+                                    or (end < len(buffer) and buffer[end] in " \t\r\n,]")):
+                yield value
+                position = end
+                continue
+        if exhausted:
+            raise ValueError("truncated JSON array")
+        chunk = next(chunks, None)
+        exhausted = chunk is None
+        buffer, position = buffer[position:] + text.decode(chunk or b"", final=exhausted), 0
 
 class GitHubManager:
     """Ultimate GitHub Manager Tool for AI Agents - Complete GitHub Automation Suite."""
 
-    def __init__(self, token: str = None, username: str = None):
+    def __init__(self, token: str = None, username: str = None, base_url: str = DEFAULT_BASE_URL,
+                 pool_size: int = 10, timeout: Union[float, Tuple[float, float]] = (5, 30),
+                 max_retries: int = 3, backoff_factor: float = 0.5, write_interval: float = 0.0,
+                 cache: ResponseCache = None, rate_limiter: RateLimitScheduler = None,
+                 repo_config_path: Union[str, Path] = None,
+                 username_cache: Optional[Union[str, Path]] = USERNAME_CACHE_PATH,
+                 mirror: LocalMirror = None, offline: bool = False, metrics: RequestMetrics = None,
+                 tokens: Union[TokenPool, Iterable[str]] = None, memo: RequestMemo = None):
         """
         Initialize the ultimate GitHub manager.
 
+        No network calls are made here: the username and rate-limit status are resolved
+        on first use.
+
         Args:
             token: GitHub personal access token (optional - will prompt if not provided)
-            username: GitHub username (optional - will fetch if not provided)
+            username: GitHub username (optional - resolved from the token on first use)
+            base_url: API root (override to point at GitHub Enterprise or a local stand-in server)
+            pool_size: Maximum number of keep-alive connections held per host
+            timeout: Request timeout in seconds, or a (connect, read) tuple
+            max_retries: Retries for connection errors and 5xx responses
+            backoff_factor: Exponential backoff factor between retries
+            write_interval: Minimum seconds between write requests across all threads
+            cache: Optional ResponseCache used for conditional GET requests
+            rate_limiter: Scheduler pacing requests against GitHub's rate limits (with a token
+                pool, each token is paced by its own scheduler instead)
+            repo_config_path: Repository manifest with descriptions, topics and homepages
+            username_cache: JSON file remembering the username per token fingerprint across
+                runs (None disables it; the token itself is never stored)
+            mirror: LocalMirror filled by sync_mirror
+            offline: Answer repository/issue listings, searches and basic stats from the mirror
+                (no token needed for those reads)
+            metrics: Collector for per-endpoint latency, bytes, retries and cache outcomes
+            tokens: Extra credentials (or a TokenPool) to spread requests over, routed by remaining
+                quota; token, if given, becomes the primary identity. Default: $GITHUB_TOKENS
+            memo: In-process table sharing identical GETs in flight and repeating them from memory
         """
-        self.base_url = "https://api.github.com"
-        self.token = token or self._get_token()
-        self.headers = {
-            "Authorization": f"token {self.token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
-        self.username = username or self._get_username()
-        self.rate_limit_remaining = None
-        self._update_rate_limit()
+        if offline and mirror is None:
+            raise ValueError("offline mode needs a mirror")
+
+        self.base_url = base_url.rstrip("/")
+        if tokens is None and not token:
+            _load_env()
+            tokens = TokenPool.from_env()
+        if tokens is not None and not isinstance(tokens, TokenPool):
+            tokens = TokenPool(([token] if token else []) + list(tokens))
+        self.token_pool = tokens
+        if tokens is not None:
+            token = tokens.primary
+        self.token = token or (os.getenv("GITHUB_TOKEN") if offline else self._get_token())
+        self.headers = {"Accept": "application/vnd.github.v3+json"}
+        if self.token:
+            self.headers["Authorization"] = f"token {self.token}"
+        self.timeout = timeout
+        self.session = self._create_session(pool_size, max_retries, backoff_factor)
+        self.write_interval = write_interval
+        self._write_lock = threading.Lock()
+        self._last_write = 0.0
+        self.cache = cache
+        self.memo = memo
+        self.rate_limiter = tokens.schedulers[token] if tokens is not None else rate_limiter or RateLimitScheduler()
+        self.metrics = metrics or RequestMetrics()
+        self._base_path = urlsplit(self.base_url).path
+        self.repo_config_path = repo_config_path
+        self.username_cache = Path(username_cache) if username_cache else None
+        self._username = username
+        self._username_lock = threading.Lock()
+        self.mirror = mirror
+        self.offline = offline
 
     def _get_token(self) -> str:
         """Securely get GitHub token from user input."""
+        _load_env()
         token = os.getenv("GITHUB_TOKEN")
         if not token:
             print("\n🔐 GitHub Token Required")
@@ -68,9 +1950,367 @@ class GitHubManager:
 
         return token
 
+    def _create_session(self, pool_size: int, max_retries: int, backoff_factor: float) -> requests.Session:
+        """Create the pooled keep-alive session shared by every API call."""
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(["GET", "HEAD", "OPTIONS", "PUT", "PATCH", "DELETE"]),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(self.headers)
+        session.headers["Accept-Encoding"] = "gzip, deflate"
+        return session
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send an API request through the pooled session.
+
+        Args:
+            method: HTTP method
+            path: API path relative to base_url (e.g. "/user/repos") or an absolute URL
+            **kwargs: Extra arguments passed to requests (params, json, headers, ...)
+        """
+        url = path if path.startswith(("http://", "https://")) else f"{self.base_url}{path}"
+        kwargs.setdefault("timeout", self.timeout)
+
+        started = time.perf_counter()
+        response = error = None
+        try:
+            response = self._dispatch(method, url, **kwargs)
+            return response
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._record_request(method, url, time.perf_counter() - started, response, error)
+
+    def _record_request(self, method: str, url: str, seconds: float,
+                        response: Optional[requests.Response], error: Optional[Exception]) -> None:
+        """Report one request to the metrics collector."""
+        cache_status = getattr(response, "cache_status", None)
+        retries = 0
+        bytes_in = bytes_out = 0
+        if response is not None:
+            history = getattr(getattr(response.raw, "retries", None), "history", None) or ()
+            if cache_status not in ("memo", "coalesced"):
+                retries = len(history) + getattr(response, "rate_limit_retries", 0)
+            if cache_status not in ("hit", "revalidated", "memo", "coalesced"):
+                bytes_in = len(response.content)
+            body = getattr(response.request, "body", None) if response.request is not None else None
+            bytes_out = len(body or b"")
+
+        self.metrics.record({
+            "method": method.upper(),
+            "endpoint": endpoint_template(urlsplit(url).path[len(self._base_path):]),
+            "url": url,
+            "status": response.status_code if response is not None else None,
+            "seconds": seconds,
+            "bytes_in": bytes_in,
+            "bytes_out": bytes_out,
+            "retries": retries,
+            "cache": cache_status,
+            "error": repr(error) if error else None
+        })
+
+    def _dispatch(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Route a request through the in-process memo and the response cache when configured."""
+        if self.memo is None or method.upper() != "GET":
+            response = self._exchange(method, url, **kwargs)
+            if self.memo is not None and self._is_write(method, url):
+                self.memo.invalidate(urlsplit(url).path[len(self._base_path):])
+            return response
+
+        import requests
+
+        full_url = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+        accept = (kwargs.get("headers") or {}).get("Accept", self.headers["Accept"])
+        key = f"{token_fingerprint(self.token)} {accept} {full_url}"
+        return self.memo.fetch(key, urlsplit(full_url).path[len(self._base_path):],
+                               lambda: self._exchange("GET", url, **kwargs))
+
+    def _exchange(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request, through the response cache when one is configured."""
+        if self.cache is None:
+            return self._send(method, url, **kwargs)
+        if method.upper() != "GET":
+            response = self._send(method, url, **kwargs)
+            if self._is_write(method, url):
+                self.cache.invalidate(url.split("?")[0])
+            return response
+        return self._cached_get(url, **kwargs)
+
+    def _cached_get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the response cache using If-None-Match/If-Modified-Since."""
+        import requests
+
+        full_url = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+        accept = (kwargs.get("headers") or {}).get("Accept", self.headers["Accept"])
+        key = f"{token_fingerprint(self.token)} {accept} {full_url}"
+
+        entry = self.cache.get(key)
+        if entry and entry["fresh"]:
+            return self._cached_response(full_url, entry, "hit")
+
+        if entry:
+            conditional = {}
+            if entry["etag"]:
+                conditional["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                conditional["If-Modified-Since"] = entry["last_modified"]
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), **conditional}
+
+        response = self._send("GET", url, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self.cache.touch(key)
+            return self._cached_response(full_url, entry, "revalidated")
+
+        self.cache.miss()
+        response.cache_status = "miss"
+        if response.status_code == 200:
+            self.cache.put(key, full_url, response)
+        return response
+
+    @staticmethod
+    def _cached_response(url: str, entry: Dict, cache_status: str) -> requests.Response:
+        """Rebuild a requests.Response from a cache entry."""
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.headers.pop("Content-Encoding", None)
+        response.headers.pop("Content-Length", None)
+        response._content = entry["body"]
+        response.encoding = "utf-8"
+        response.url = url
+        response.from_cache = True
+        response.cache_status = cache_status
+        return response
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request under the rate-limit scheduler, retrying after rate-limit responses.
+
+        With a token pool, each attempt picks its token afresh, so a request that hits an
+        exhausted token is retried with another one.
+        """
+        write = self._is_write(method, url)
+        for attempt in range(SECONDARY_LIMIT_RETRIES + 1):
+            rate_limiter = self.rate_limiter
+            if self.token_pool is not None:
+                token = self.token_pool.choose(url, write=write, identity=self._identity_bound(url))
+                rate_limiter = self.token_pool.schedulers[token]
+                kwargs["headers"] = {**(kwargs.get("headers") or {}), "Authorization": f"token {token}"}
+
+            rate_limiter.acquire(url)
+            if write:
+                self._wait_for_write_slot()
+
+            response = self.session.request(method, url, **kwargs)
+            response.rate_limit_retries = attempt
+            rate_limiter.observe(url, response)
+            # Only headers that came off the network: cache and memo replays carry stale quota
+            self.metrics.observe_rate_limit(response.headers)
+
+            if response.status_code not in (403, 429) or attempt == SECONDARY_LIMIT_RETRIES:
+                return response
+
+            # Secondary rate limits answer with Retry-After; primary exhaustion with Remaining: 0.
+            # The scheduler now holds the pause, so the next acquire() waits it out.
+            if response.headers.get("Retry-After"):
+                print(f"⏳ Secondary rate limit hit, retrying in {response.headers['Retry-After']}s...")
+            elif response.headers.get("X-RateLimit-Remaining") != "0":
+                return response
+
+    @staticmethod
+    def _is_write(method: str, url: str) -> bool:
+        """Whether a request changes state; GraphQL queries are POSTed but only read."""
+        return method.upper() in WRITE_METHODS and RateLimitScheduler.resource_for(url) != "graphql"
+
+    def _identity_bound(self, url: str) -> bool:
+        """Whether the answer to url depends on which credential asks (/user, /user/..., /rate_limit)."""
+        path = urlsplit(url).path[len(self._base_path):]
+        return path in ("/user", "/rate_limit") or path.startswith("/user/")
+
+    def _wait_for_write_slot(self) -> None:
+        """Space out write requests so concurrent workers don't trip secondary rate limits."""
+        if self.write_interval <= 0:
+            return
+        with self._write_lock:
+            delay = self._last_write + self.write_interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._last_write = time.monotonic()
+
+    def _run_concurrently(self, func: Callable, items: Iterable, workers: int = 1) -> List:
+        """Apply func to every item using a bounded thread pool, preserving input order.
+
+        Items are consumed lazily with at most 2 * workers tasks in flight, so work can
+        start while a paginated listing is still arriving.
+        """
+        if workers <= 1:
+            return [func(item) for item in items]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        results = []
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for item in items:
+                pending.append(executor.submit(func, item))
+                if len(pending) >= workers * 2:
+                    results.append(pending.popleft().result())
+            while pending:
+                results.append(pending.popleft().result())
+        return results
+
+    def _iter_concurrently(self, func: Callable, items: Iterable, workers: int = 1) -> Iterator[Tuple]:
+        """Apply func to every item with a bounded thread pool, yielding (item, result) as each completes."""
+        if workers <= 1:
+            for item in items:
+                yield item, func(item)
+            return
+
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {}
+            for item in items:
+                pending[executor.submit(func, item)] = item
+                if len(pending) >= workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), future.result()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+
+    def _paginate(self, path: str, params: Dict = None, item_key: str = None,
+                  prefetch: bool = False, strict: bool = False, record: Callable[[Dict], object] = None,
+                  **kwargs) -> Iterator[Dict]:
+        """Yield items from a paginated endpoint, following Link rel="next" lazily.
+
+        Args:
+            path: API path of the first page
+            params: Query parameters for the first page (later pages use the next link as-is)
+            item_key: Key holding the item list for wrapped responses (e.g. "items" for search)
+            prefetch: Fetch the next page in a background thread while the current one is consumed
+            strict: Raise requests.HTTPError on a failed page instead of ending the listing early
+            record: Projects each raw item (e.g. Repo.from_api); list pages are then decoded one
+                element at a time, so a page never exists as a full list of raw dicts
+            **kwargs: Extra arguments passed to _request
+
+        Only the current page (plus the prefetched one) is held in memory.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        params = {"per_page": PER_PAGE, **(params or {})}
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+
+        def fetch(url: str, page_params: Optional[Dict]) -> requests.Response:
+            return self._request("GET", url, params=page_params, **kwargs)
+
+        try:
+            response = fetch(path, params)
+            while True:
+                if response.status_code != 200:
+                    if strict:
+                        response.raise_for_status()
+                    print(f"❌ Failed to fetch {path}: {response.status_code}")
+                    return
+
+                next_url = response.links.get("next", {}).get("url")
+                next_page = None
+                if next_url and executor:
+                    next_page = executor.submit(fetch, next_url, None)
+
+                if record is None:
+                    data = response.json()
+                    yield from (data.get(item_key, []) if item_key else data)
+                elif item_key:
+                    yield from map(record, response.json().get(item_key, []))
+                else:
+                    content = response.content
+                    chunks = (content[start:start + STREAM_CHUNK_SIZE]
+                              for start in range(0, len(content), STREAM_CHUNK_SIZE))
+                    yield from map(record, iter_json_array(chunks))
+
+                if not next_url:
+                    return
+                response = next_page.result() if next_page else fetch(next_url, None)
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+
+    def close(self) -> None:
+        """Close pooled connections, the response cache and the mirror."""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.mirror is not None:
+            self.mirror.close()
+
+    def __enter__(self) -> "GitHubManager":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def username(self) -> str:
+        """GitHub username, resolved from the token on first use (from the mirror when offline)."""
+        if self._username is None:
+            with self._username_lock:
+                if self._username is None:
+                    self._username = self._offline_username() if self.offline else self._cached_username()
+        return self._username
+
+    def _offline_username(self) -> str:
+        """Owner of the mirrored repositories; no request is made offline."""
+        repo = next(iter(self.mirror.iter_repositories()), None)
+        return (_login(repo.get("owner")) if repo else None) or ""
+
+    @username.setter
+    def username(self, value: str) -> None:
+        self._username = value
+
+    def _cached_username(self) -> str:
+        """Look up the username for this token in the on-disk cache, fetching it on a miss."""
+        if self.username_cache is None:
+            return self._get_username()
+
+        key = f"{self.base_url} {token_fingerprint(self.token)}"
+        try:
+            usernames = json.loads(self.username_cache.read_text())
+        except (OSError, ValueError):
+            usernames = {}
+        if key in usernames:
+            return usernames[key]
+
+        username = self._get_username()
+        usernames[key] = username
+        try:
+            self.username_cache.parent.mkdir(parents=True, exist_ok=True)
+            self.username_cache.write_text(json.dumps(usernames, indent=2))
+        except OSError:
+            pass
+        return username
+
     def _get_username(self) -> str:
         """Get GitHub username from token."""
-        response = requests.get(f"{self.base_url}/user", headers=self.headers)
+        response = self._request("GET", "/user")
         if response.status_code == 401:
             print("❌ Invalid GitHub token. Please check your credentials.")
             sys.exit(1)
@@ -78,47 +2318,83 @@ class GitHubManager:
         return response.json()["login"]
 
     def _update_rate_limit(self) -> None:
-        """Update current rate limit status."""
-        response = requests.get(f"{self.base_url}/rate_limit", headers=self.headers)
+        """Update current rate limit status for every resource."""
+        response = self._request("GET", "/rate_limit")
         if response.status_code == 200:
-            self.rate_limit_remaining = response.json()["rate"]["remaining"]
-        else:
-            self.rate_limit_remaining = None
+            self.rate_limiter.load(response.json().get("resources", {}))
+
+    @property
+    def rate_limit_remaining(self) -> Optional[int]:
+        """Remaining core API quota (fetched from /rate_limit if no response has reported it yet).
+
+        With a token pool this is the known quota summed over all tokens.
+        """
+        if self.rate_limiter.remaining("core") is None:
+            self._update_rate_limit()
+        if self.token_pool is not None:
+            return self.token_pool.remaining("core")
+        return self.rate_limiter.remaining("core")
 
     # ===== REPOSITORY MANAGEMENT =====
 
     def update_repository_descriptions(self, descriptions: Dict[str, str]) -> None:
-        """Update repository descriptions for repositories."""
+        """Update repository descriptions for repositories, skipping ones already up to date."""
         print(f"\n🔄 Updating repository descriptions for {self.username}...")
 
+        current = self._current_repositories(descriptions.keys())
+
         for repo_name, description in descriptions.items():
-            url = f"{self.base_url}/repos/{self.username}/{repo_name}"
-            data = {"description": description}
+            if repo_name in current and (current[repo_name].get("description") or "") == description:
+                print(f"⏭️  {repo_name} already up to date")
+                continue
 
-            response = requests.patch(url, headers=self.headers, json=data)
+            status = self._patch_repository(repo_name, {"description": description})
 
-            if response.status_code == 200:
+            if status == 200:
                 print(f"✅ Updated {repo_name}")
-            elif response.status_code == 404:
+            elif status == 404:
                 print(f"⚠️  Repository {repo_name} not found")
             else:
-                print(f"❌ Failed to update {repo_name}: {response.status_code}")
+                print(f"❌ Failed to update {repo_name}: {status}")
 
-    def setup_repository_features(self, repo_name: str) -> None:
-        """Set up professional repository features."""
+    def _patch_repository(self, repo_name: str, data: Dict) -> int:
+        """PATCH repository settings and return the response status code."""
+        response = self._request("PATCH", f"/repos/{self.username}/{repo_name}", json=data)
+        return response.status_code
+
+    def _put_topics(self, repo_name: str, topics: List[str]) -> int:
+        """Replace repository topics and return the response status code."""
+        response = self._request("PUT", f"/repos/{self.username}/{repo_name}/topics", headers={
+            "Accept": "application/vnd.github.mercy-preview+json"
+        }, json={"names": topics})
+        return response.status_code
+
+    def _current_repositories(self, repo_names: Iterable[str], strict: bool = False) -> Dict[str, Dict]:
+        """Fetch current state of the named repositories from a single paginated listing."""
+        wanted = set(repo_names)
+        return {repo["name"]: repo for repo in self.iter_repositories(strict=strict, compact=True)
+                if repo["name"] in wanted}
+
+    def setup_repository_features(self, repo_name: str, topics: List[str] = None, current: Dict = None) -> None:
+        """Set up professional repository features, skipping settings that already match.
+
+        Args:
+            repo_name: Repository to set up
+            topics: Topics to apply (default: _get_topics_for_repo)
+            current: Repository as already listed or created (fetched when omitted)
+        """
         print(f"\n🔧 Setting up features for {repo_name}...")
 
+        if current is None:
+            response = self._request("GET", f"/repos/{self.username}/{repo_name}")
+            current = response.json() if response.status_code == 200 else {}
+
         # Add topics
-        topics = self._get_topics_for_repo(repo_name)
+        topics = topics or self._get_topics_for_repo(repo_name)
         if topics:
-            url = f"{self.base_url}/repos/{self.username}/{repo_name}/topics"
-            data = {"names": topics}
-            response = requests.put(url, headers={
-                **self.headers,
-                "Accept": "application/vnd.github.mercy-preview+json"
-            }, json=data)
-
-            if response.status_code == 200:
+            if _normalize_topics(current.get("topics")) == _normalize_topics(topics):
+                print(f"⏭️  Topics already set for {repo_name}")
+            elif self._put_topics(repo_name, topics) == 200:
                 print(f"✅ Added topics to {repo_name}: {', '.join(topics)}")
             else:
                 print(f"⚠️  Could not add topics to {repo_name}")
@@ -126,15 +2402,27 @@ class GitHubManager:
         # Set homepage if applicable
         homepage = self._get_homepage_for_repo(repo_name)
         if homepage:
-            url = f"{self.base_url}/repos/{self.username}/{repo_name}"
-            data = {"homepage": homepage}
-            response = requests.patch(url, headers=self.headers, json=data)
-
-            if response.status_code == 200:
+            if current.get("homepage") == homepage:
+                print(f"⏭️  Homepage already set for {repo_name}")
+            elif self._patch_repository(repo_name, {"homepage": homepage}) == 200:
                 print(f"✅ Set homepage for {repo_name}: {homepage}")
             else:
                 print(f"⚠️  Could not set homepage for {repo_name}")
 
+    def setup_repositories_features(self, repo_names: Iterable[str]) -> None:
+        """Set up topics and homepages for several repositories from one paginated listing.
+
+        Args:
+            repo_names: Repositories to set up
+        """
+        repo_names = list(repo_names)
+        current = self._current_repositories(repo_names)
+        for repo_name in repo_names:
+            if repo_name not in current:
+                print(f"⚠️  Repository {repo_name} not found")
+                continue
+            self.setup_repository_features(repo_name, current=current[repo_name])
+
     def create_repository(self, name: str, description: str = "", private: bool = False,
                          topics: List[str] = None) -> Dict:
         """Create a new repository."""
@@ -145,7 +2433,7 @@ class GitHubManager:
             "auto_init": True
         }
 
-        response = requests.post(f"{self.base_url}/user/repos", headers=self.headers, json=data)
+        response = self._request("POST", "/user/repos", json=data)
 
         if response.status_code == 201:
             repo_data = response.json()
@@ -153,7 +2441,7 @@ class GitHubManager:
 
             # Add topics if provided
             if topics:
-                self.setup_repository_features(name, topics)
+                self.setup_repository_features(name, topics, current=repo_data)
 
             return repo_data
         else:
@@ -167,7 +2455,7 @@ class GitHubManager:
             print(f"Run with confirm=True to delete {repo_name}")
             return False
 
-        response = requests.delete(f"{self.base_url}/repos/{self.username}/{repo_name}", headers=self.headers)
+        response = self._request("DELETE", f"/repos/{self.username}/{repo_name}")
 
         if response.status_code == 204:
             print(f"🗑️  Deleted repository: {repo_name}")
@@ -191,8 +2479,7 @@ class GitHubManager:
         if assignees:
             data["assignees"] = assignees
 
-        response = requests.post(f"{self.base_url}/repos/{self.username}/{repo_name}/issues",
-                               headers=self.headers, json=data)
+        response = self._request("POST", f"/repos/{self.username}/{repo_name}/issues", json=data)
 
         if response.status_code == 201:
             issue_data = response.json()
@@ -202,20 +2489,24 @@ class GitHubManager:
             print(f"❌ Failed to create issue: {response.status_code}")
             return None
 
-    def list_issues(self, repo_name: str, state: str = "open", labels: str = None) -> List[Dict]:
-        """List repository issues."""
+    def list_issues(self, repo_name: str, state: str = "open", labels: str = None,
+                    compact: bool = False) -> List[Dict]:
+        """List repository issues (compact: as Issue/PullRequest records)."""
+        return list(self.iter_issues(repo_name, state, labels, compact=compact))
+
+    def iter_issues(self, repo_name: str, state: str = "open", labels: str = None,
+                    prefetch: bool = False, compact: bool = False) -> Iterator[Dict]:
+        """Stream repository issues page by page (compact: as Issue/PullRequest records)."""
+        if self.offline:
+            issues = self.mirror.iter_issues(repo_name, state, labels)
+            return map(issue_record, issues) if compact else issues
+
         params = {"state": state}
         if labels:
             params["labels"] = labels
 
-        response = requests.get(f"{self.base_url}/repos/{self.username}/{repo_name}/issues",
-                              headers=self.headers, params=params)
-
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"❌ Failed to list issues: {response.status_code}")
-            return []
+        return self._paginate(f"/repos/{self.username}/{repo_name}/issues", params, prefetch=prefetch,
+                              record=issue_record if compact else None)
 
     def update_issue(self, repo_name: str, issue_number: int, title: str = None,
                     body: str = None, state: str = None, labels: List[str] = None) -> bool:
@@ -230,8 +2521,7 @@ class GitHubManager:
         if labels:
             data["labels"] = labels
 
-        response = requests.patch(f"{self.base_url}/repos/{self.username}/{repo_name}/issues/{issue_number}",
-                                headers=self.headers, json=data)
+        response = self._request("PATCH", f"/repos/{self.username}/{repo_name}/issues/{issue_number}", json=data)
 
         if response.status_code == 200:
             print(f"✅ Updated issue #{issue_number}")
@@ -240,6 +2530,118 @@ class GitHubManager:
             print(f"❌ Failed to update issue #{issue_number}: {response.status_code}")
             return False
 
+    def _issue_index(self, repo_name: str) -> Dict[str, Dict]:
+        """Index a repository's issues by number and normalized title from one paginated listing."""
+        index = {"number": {}, "title": {}}
+        for issue in self.iter_issues(repo_name, state="all", prefetch=True, compact=True):
+            if "pull_request" in issue:
+                continue
+            index["number"][issue["number"]] = issue
+            index["title"].setdefault(_issue_title_key(issue["title"]), issue)
+        return index
+
+    def import_issues(self, records: Iterable[Dict], repo_name: str = None, workers: int = 1,
+                      checkpoint: Union[str, Path] = None, update_existing: bool = True) -> List[Dict]:
+        """Create or update issues from a stream of records.
+
+        Each repository's issues are listed once and indexed by title, so a record matching an
+        existing issue updates it (or is left alone when nothing differs) instead of creating a
+        duplicate. Records with a "number" target that issue directly.
+
+        Args:
+            records: Dicts with a title and optional repo, body, labels, assignees, state and number
+            repo_name: Repository for records that do not name one
+            workers: Number of records written concurrently
+            checkpoint: JSONL file of applied records; records already in it are skipped
+            update_existing: Update issues that differ from their record (otherwise only report them)
+
+        Returns:
+            Per-record result dicts in completion order
+        """
+        import requests
+
+        done = IssueImportCheckpoint(checkpoint) if checkpoint else None
+        indexes: Dict[str, Dict] = {}
+        claimed = set()
+
+        def plan() -> Iterator[Dict]:
+            for line, record in enumerate(records, 1):
+                repo = record.get("repo") or repo_name
+                entry = {"line": line, "repo": repo, "record": record, "key": None,
+                         "action": None, "issue": None, "changes": {}, "error": None}
+                if not repo or not (record.get("title") or record.get("number")):
+                    entry["error"] = "record needs a repo and a title or number"
+                    yield entry
+                    continue
+
+                entry["key"] = ProfileBackup.record_hash({**record, "repo": repo})
+                if done is not None and entry["key"] in done:
+                    entry["action"] = "checkpointed"
+                    yield entry
+                    continue
+
+                try:
+                    if repo not in indexes:
+                        indexes[repo] = self._issue_index(repo)
+                except requests.RequestException as e:
+                    entry["error"] = str(e)
+                    yield entry
+                    continue
+
+                if record.get("number"):
+                    issue = indexes[repo]["number"].get(int(record["number"]))
+                    if issue is None:
+                        entry["error"] = f"issue #{record['number']} not found"
+                        yield entry
+                        continue
+                else:
+                    issue = indexes[repo]["title"].get(_issue_title_key(record["title"]))
+
+                if issue is None:
+                    # A title repeated within the input is only created once
+                    identity = (repo, _issue_title_key(record["title"]))
+                    entry["action"] = "duplicate" if identity in claimed else "create"
+                    claimed.add(identity)
+                else:
+                    entry["issue"] = issue
+                    entry["changes"] = _issue_changes(issue, record)
+                    entry["action"] = "update" if entry["changes"] and update_existing else "unchanged"
+                yield entry
+
+        def apply(entry: Dict) -> Dict:
+            record = entry["record"]
+            issue = entry["issue"] or {}
+            result = {"line": entry["line"], "repo": entry["repo"], "title": record.get("title"),
+                      "action": entry["action"], "number": issue.get("number"),
+                      "ok": entry["error"] is None, "error": entry["error"]}
+            if entry["error"] is not None:
+                return result
+
+            try:
+                if entry["action"] == "create":
+                    created = self.create_issue(entry["repo"], record["title"], record.get("body", ""),
+                                                record.get("labels"), record.get("assignees"))
+                    result["ok"] = created is not None
+                    if created is not None:
+                        result["number"] = created["number"]
+                        if record.get("state") == "closed":
+                            result["ok"] = self.update_issue(entry["repo"], created["number"], state="closed")
+                elif entry["action"] == "update":
+                    result["ok"] = self.update_issue(entry["repo"], issue["number"], **entry["changes"])
+            except requests.RequestException as e:
+                result.update(ok=False, error=str(e))
+            return result
+
+        print(f"\n📥 Importing issues (workers={workers})...")
+        results = []
+        for entry, result in self._iter_concurrently(apply, plan(), workers):
+            if done is not None and result["ok"] and result["action"] != "checkpointed":
+                done.mark(entry["key"], result)
+            results.append(result)
+
+        print_issue_import_report(results)
+        return results
+
     # ===== PULL REQUEST MANAGEMENT =====
 
     def create_pull_request(self, repo_name: str, title: str, head: str, base: str = "main",
@@ -253,8 +2655,7 @@ class GitHubManager:
             "draft": draft
         }
 
-        response = requests.post(f"{self.base_url}/repos/{self.username}/{repo_name}/pulls",
-                               headers=self.headers, json=data)
+        response = self._request("POST", f"/repos/{self.username}/{repo_name}/pulls", json=data)
 
         if response.status_code == 201:
             pr_data = response.json()
@@ -268,8 +2669,7 @@ class GitHubManager:
         """Merge a pull request."""
         data = {"merge_method": merge_method}
 
-        response = requests.put(f"{self.base_url}/repos/{self.username}/{repo_name}/pulls/{pr_number}/merge",
-                              headers=self.headers, json=data)
+        response = self._request("PUT", f"/repos/{self.username}/{repo_name}/pulls/{pr_number}/merge", json=data)
 
         if response.status_code == 200:
             print(f"✅ Merged PR #{pr_number}")
@@ -288,9 +2688,9 @@ class GitHubManager:
         }
 
         # Use the newer Projects API
-        headers = {**self.headers, "Accept": "application/vnd.github+json"}
+        headers = {"Accept": "application/vnd.github+json"}
 
-        response = requests.post(f"{self.base_url}/repos/{self.username}/{repo_name}/projects",
+        response = self._request("POST", f"/repos/{self.username}/{repo_name}/projects",
                                headers=headers, json=data)
 
         if response.status_code == 201:
@@ -305,8 +2705,7 @@ class GitHubManager:
         """Create a column in a GitHub project."""
         data = {"name": name}
 
-        response = requests.post(f"{self.base_url}/projects/{project_id}/columns",
-                               headers=self.headers, json=data)
+        response = self._request("POST", f"/projects/{project_id}/columns", json=data)
 
         if response.status_code == 201:
             column_data = response.json()
@@ -316,248 +2715,831 @@ class GitHubManager:
             print(f"❌ Failed to create column: {response.status_code}")
             return None
 
-    # ===== WORKFLOW & AUTOMATION =====
+    # ===== MULTI-FILE COMMITS =====
 
-    def create_workflow_file(self, repo_name: str, workflow_name: str, content: str) -> bool:
-        """Create a GitHub Actions workflow file."""
-        # Create .github/workflows directory structure
-        workflow_path = f".github/workflows/{workflow_name}.yml"
+    def _remote_tree(self, repo_name: str, commit_sha: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """Root tree SHA and path -> blob SHA map of a commit (one recursive tree call)."""
+        response = self._request("GET", f"/repos/{self.username}/{repo_name}/git/trees/{commit_sha}",
+                                 params={"recursive": 1})
+        if response.status_code != 200:
+            return None, {}
+        tree = response.json()
+        # A truncated listing only means fewer files can be skipped; the commit itself is unaffected
+        return tree["sha"], {entry["path"]: entry["sha"] for entry in tree.get("tree", [])
+                             if entry.get("type") == "blob"}
 
-        # Base64 encode the content
-        encoded_content = base64.b64encode(content.encode()).decode()
+    def commit_files(self, repo_name: str, files: Dict[str, Optional[Union[str, bytes]]], message: str,
+                     branch: str = None, retries: int = 1) -> Optional[Dict]:
+        """Write several files as one atomic commit through the Git Data API.
 
-        # Create or update the file
-        data = {
-            "message": f"Add {workflow_name} workflow",
-            "content": encoded_content
-        }
+        Files whose git blob SHA-1 (computed locally) already matches the branch tip are left
+        out, and nothing is written when no file changed. Text files are sent inline with the
+        tree; only binary files need a separate blob upload. A single file is written through the
+        contents API instead (one GET and at most one PUT).
+
+        Args:
+            repo_name: Repository to commit to
+            files: Repository path to new content (str or bytes), or None to delete the path
+            message: Commit message
+            branch: Target branch (default: the repository's default branch)
+            retries: Times to rebuild the commit if the branch moves while it is being created
+
+        Returns:
+            {"commit", "changed", "unchanged"} (commit is the existing tip when nothing changed, or
+            None for an unchanged single file), or None on failure
+        """
+        if len(files) == 1 and next(iter(files.values())) is not None:
+            (path, content), = files.items()
+            return self._put_file(repo_name, path, content, message, branch, retries)
+
+        repo_path = f"/repos/{self.username}/{repo_name}"
+        if branch is None:
+            response = self._request("GET", repo_path)
+            if response.status_code != 200:
+                print(f"❌ Failed to read {repo_name}: {response.status_code}")
+                return None
+            branch = response.json()["default_branch"]
+
+        for _ in range(retries + 1):
+            ref = self._request("GET", f"{repo_path}/git/ref/heads/{branch}")
+            if ref.status_code == 409 and self._bootstrap_empty_repository(repo_name, branch, files, message):
+                # The Git Data API rejects empty repositories; the first file created the branch
+                ref = self._request("GET", f"{repo_path}/git/ref/heads/{branch}")
+            if ref.status_code != 200:
+                print(f"❌ Failed to resolve {repo_name}@{branch}: {ref.status_code}")
+                return None
+
+            head = ref.json()["object"]["sha"]
+            base_tree, remote = self._remote_tree(repo_name, head)
+
+            entries, changed, unchanged = [], [], []
+            for path, content in files.items():
+                if content is None:
+                    if path in remote:
+                        entries.append({"path": path, "mode": "100644", "type": "blob", "sha": None})
+                        changed.append(path)
+                    continue
+
+                data = content.encode() if isinstance(content, str) else content
+                if remote.get(path) == git_blob_sha(data):
+                    unchanged.append(path)
+                    continue
+
+                changed.append(path)
+                try:
+                    entries.append({"path": path, "mode": "100644", "type": "blob", "content": data.decode()})
+                except UnicodeDecodeError:
+                    blob = self._request("POST", f"{repo_path}/git/blobs",
+                                         json={"content": base64.b64encode(data).decode(), "encoding": "base64"})
+                    if blob.status_code != 201:
+                        print(f"❌ Failed to upload {path}: {blob.status_code}")
+                        return None
+                    entries.append({"path": path, "mode": "100644", "type": "blob", "sha": blob.json()["sha"]})
+
+            if not entries:
+                print(f"⏭️  {repo_name}: all {len(unchanged)} file(s) already up to date")
+                return {"commit": head, "changed": [], "unchanged": unchanged}
+
+            tree_data = {"tree": entries}
+            if base_tree:
+                tree_data["base_tree"] = base_tree
+            tree = self._request("POST", f"{repo_path}/git/trees", json=tree_data)
+            if tree.status_code != 201:
+                print(f"❌ Failed to create tree in {repo_name}: {tree.status_code}")
+                return None
+
+            commit = self._request("POST", f"{repo_path}/git/commits",
+                                   json={"message": message, "tree": tree.json()["sha"], "parents": [head]})
+            if commit.status_code != 201:
+                print(f"❌ Failed to create commit in {repo_name}: {commit.status_code}")
+                return None
+
+            commit_sha = commit.json()["sha"]
+            update = self._request("PATCH", f"{repo_path}/git/refs/heads/{branch}", json={"sha": commit_sha})
+            if update.status_code == 200:
+                print(f"✅ Committed {len(changed)} file(s) to {repo_name}@{branch} ({commit_sha[:7]})")
+                return {"commit": commit_sha, "changed": changed, "unchanged": unchanged}
+            if update.status_code != 422:
+                break
+            # 422: not a fast-forward because the branch moved; rebuild on the new tip
+
+        print(f"❌ Failed to update {repo_name}@{branch}: {update.status_code}")
+        return None
+
+    def _put_file(self, repo_name: str, path: str, content: Union[str, bytes], message: str,
+                  branch: str = None, retries: int = 1) -> Optional[Dict]:
+        """Create or update one file through the contents API, skipping the PUT if it is unchanged."""
+        url = f"/repos/{self.username}/{repo_name}/contents/{path}"
+        data = content.encode() if isinstance(content, str) else content
+        body = {"message": message, "content": base64.b64encode(data).decode()}
+        if branch:
+            body["branch"] = branch
+
+        for _ in range(retries + 1):
+            current = self._request("GET", url, params={"ref": branch} if branch else None)
+            if current.status_code == 200 and isinstance(current.json(), dict):
+                if current.json()["sha"] == git_blob_sha(data):
+                    print(f"⏭️  {repo_name}: {path} already up to date")
+                    return {"commit": None, "changed": [], "unchanged": [path]}
+                body["sha"] = current.json()["sha"]
+            elif current.status_code == 404:
+                body.pop("sha", None)
+            else:
+                print(f"❌ Failed to read {repo_name}/{path}: {current.status_code}")
+                return None
+
+            response = self._request("PUT", url, json=body)
+            if response.status_code in (200, 201):
+                commit_sha = response.json()["commit"]["sha"]
+                print(f"✅ Committed {path} to {repo_name} ({commit_sha[:7]})")
+                return {"commit": commit_sha, "changed": [path], "unchanged": []}
+            if response.status_code != 409:
+                break
+            # 409: the file changed since it was read; retry against the new version
+
+        print(f"❌ Failed to write {repo_name}/{path}: {response.status_code}")
+        return None
+
+    def _bootstrap_empty_repository(self, repo_name: str, branch: str,
+                                    files: Dict[str, Optional[Union[str, bytes]]], message: str) -> bool:
+        """Create the first commit of an empty repository through the contents API."""
+        path, content = next(((path, content) for path, content in files.items() if content is not None),
+                             (None, None))
+        if path is None:
+            return False
+        data = content.encode() if isinstance(content, str) else content
+        response = self._request("PUT", f"/repos/{self.username}/{repo_name}/contents/{path}",
+                                 json={"message": message, "content": base64.b64encode(data).decode(),
+                                       "branch": branch})
+        return response.status_code == 201
+
+    # ===== WORKFLOW & AUTOMATION =====
 
-        response = requests.put(f"{self.base_url}/repos/{self.username}/{repo_name}/contents/{workflow_path}",
-                              headers=self.headers, json=data)
+    def create_workflow_file(self, repo_name: str, workflow_name: str, content: str) -> bool:
+        """Create or update a GitHub Actions workflow file (no commit if it is already current)."""
+        workflow_path = f".github/workflows/{workflow_name}.yml"
+        result = self.commit_files(repo_name, {workflow_path: content}, f"Add {workflow_name} workflow")
 
-        if response.status_code in [201, 200]:
-            print(f"✅ Created workflow: {workflow_name}")
+        if result is not None:
+            print(f"✅ Workflow ready: {workflow_name}")
             return True
         else:
-            print(f"❌ Failed to create workflow: {response.status_code}")
+            print(f"❌ Failed to create workflow: {workflow_name}")
             return False
 
     def setup_basic_ci_cd(self, repo_name: str, language: str = "python") -> bool:
         """Set up basic CI/CD workflow for a repository."""
-        if language.lower() == "python":
-            workflow_content = f"""name: CI/CD
-
-on:
-  push:
-    branches: [ main, master ]
-  pull_request:
-    branches: [ main, master ]
-
-jobs:
-  test:
-    runs-on: ubuntu-latest
-
-    steps:
-    - uses: actions/checkout@v3
-    - name: Set up Python
-      uses: actions/setup-python@v4
-      with:
-        python-version: '3.9'
-
-    - name: Install dependencies
-      run: |
-        python -m pip install --upgrade pip
-        pip install -r requirements.txt
-
-    - name: Run tests
-      run: |
-        python -m pytest || echo "No tests found"
-"""
-        elif language.lower() == "javascript":
-            workflow_content = """name: CI/CD
-
-on:
-  push:
-    branches: [ main, master ]
-  pull_request:
-    branches: [ main, master ]
-
-jobs:
-  test:
-    runs-on: ubuntu-latest
-
-    steps:
-    - uses: actions/checkout@v3
-    - name: Set up Node.js
-      uses: actions/setup-node@v3
-      with:
-        node-version: '18'
-
-    - name: Install dependencies
-      run: npm ci
-
-    - name: Run tests
-      run: npm test
-"""
-        else:
+        template = load_workflow_templates().get(language.lower())
+        if template is None:
             print(f"❌ Unsupported language: {language}")
             return False
 
-        return self.create_workflow_file(repo_name, "ci-cd", workflow_content)
+        _, variables = detect_workflow_variables({})
+        return self.create_workflow_file(repo_name, "ci-cd", template.render(variables))
+
+    def rollout_ci(self, repo_names: Iterable[str] = None, workers: int = 4, template: str = None,
+                   templates_dir: Union[str, Path] = None, workflow_name: str = "ci-cd") -> List[Dict]:
+        """Render and commit a CI workflow to many repositories in parallel.
+
+        The template follows each repository's primary language from the listing; /languages is
+        only fetched when that language has no template. The Python/Node version comes from the
+        repository's version files (WORKFLOW_VERSION_FILES), read until one declares it.
+        Repositories whose rendered workflow already matches are left without a new commit.
+
+        Args:
+            repo_names: Repositories to roll out to (default: every repository you own)
+            workers: Number of repositories processed concurrently
+            template: Template name to use everywhere instead of detecting it
+            templates_dir: Template directory (see load_workflow_templates)
+            workflow_name: Workflow file name under .github/workflows
+
+        Returns:
+            Per-repo result dicts
+        """
+        import requests
+
+        templates = load_workflow_templates(templates_dir)
+        workflow_path = f".github/workflows/{workflow_name}.yml"
+        print(f"\n🚀 Rolling out {workflow_path} (templates: {', '.join(templates) or 'none'})...")
+
+        def roll_out(repo: Dict) -> Dict:
+            result = {"repo": repo["name"], "actions": {}, "ok": True, "error": None}
+            if repo.get("missing"):
+                result.update(ok=False, error="repository not found")
+                return result
+            if repo.get("archived"):
+                result["actions"]["workflow"] = "skipped (archived)"
+                return result
+
+            try:
+                languages = None
+                if template is None and WORKFLOW_LANGUAGES.get(repo.get("language")) not in templates:
+                    response = self._request("GET", f"/repos/{self.username}/{repo['name']}/languages")
+                    languages = response.json() if response.status_code == 200 else None
+                name = detect_workflow_variables(repo, languages, template=template)[0]
+                if name not in templates:
+                    result["actions"]["workflow"] = "skipped (no template)"
+                    return result
+
+                version_files = {}
+                for path in WORKFLOW_VERSION_FILES.get(name, (None, ()))[1]:
+                    version_files[path] = self._read_file(repo["name"], path, repo.get("default_branch"))
+                    if version_files[path] and parse_version_file(path, version_files[path]):
+                        break
+                _, variables = detect_workflow_variables(repo, languages, version_files, template=name)
+
+                committed = self.commit_files(repo["name"], {workflow_path: templates[name].render(variables)},
+                                              f"Add {workflow_name} workflow", branch=repo.get("default_branch"))
+                if committed is None:
+                    result.update(ok=False, error="commit failed")
+                else:
+                    result["actions"]["workflow"] = f"{name} committed" if committed["changed"] else f"{name} unchanged"
+            except (requests.RequestException, ValueError) as e:
+                result.update(ok=False, error=str(e))
+            return result
+
+        if repo_names is None:
+            repos = self.iter_repositories(type_filter="owner", prefetch=True, compact=True)
+        else:
+            repo_names = list(repo_names)
+            current = self._current_repositories(repo_names)
+            repos = [current.get(name, {"name": name, "missing": True}) for name in repo_names]
+
+        results = self._run_concurrently(roll_out, repos, workers)
+        print_bulk_report(results)
+        return results
+
+    def _read_file(self, repo_name: str, path: str, ref: str = None) -> Optional[str]:
+        """Text of a repository file through the contents API, or None if it does not exist."""
+        response = self._request("GET", f"/repos/{self.username}/{repo_name}/contents/{path}",
+                                 params={"ref": ref} if ref else None)
+        if response.status_code != 200 or not isinstance(response.json(), dict) or "content" not in response.json():
+            return None
+        return base64.b64decode(response.json()["content"]).decode("utf-8", "replace")
 
     # ===== ANALYTICS & INSIGHTS =====
 
-    def get_repository_stats(self, repo_name: str) -> Dict:
-        """Get comprehensive repository statistics."""
+    def get_repository_stats(self, repo_name: str, compact: bool = False) -> Dict:
+        """Get comprehensive repository statistics (only "basic" when offline).
+
+        Args:
+            repo_name: Repository to fetch
+            compact: Keep a Repo record, Commit records and contributor logins/counts instead
+                of the raw API objects (see compact_stats)
+        """
+        if self.offline:
+            basic = self.mirror.get_repository(repo_name)
+            stats = {"basic": basic} if basic else {}
+            return compact_stats(stats) if compact else stats
+
         stats = {}
 
         # Basic repo info
-        response = requests.get(f"{self.base_url}/repos/{self.username}/{repo_name}", headers=self.headers)
+        response = self._request("GET", f"/repos/{self.username}/{repo_name}")
         if response.status_code == 200:
             stats["basic"] = response.json()
 
         # Languages
-        response = requests.get(f"{self.base_url}/repos/{self.username}/{repo_name}/languages", headers=self.headers)
+        response = self._request("GET", f"/repos/{self.username}/{repo_name}/languages")
         if response.status_code == 200:
             stats["languages"] = response.json()
 
         # Contributors
-        response = requests.get(f"{self.base_url}/repos/{self.username}/{repo_name}/contributors", headers=self.headers)
+        response = self._request("GET", f"/repos/{self.username}/{repo_name}/contributors")
         if response.status_code == 200:
             stats["contributors"] = response.json()
 
         # Recent commits
-        response = requests.get(f"{self.base_url}/repos/{self.username}/{repo_name}/commits?per_page=10", headers=self.headers)
+        response = self._request("GET", f"/repos/{self.username}/{repo_name}/commits?per_page=10")
         if response.status_code == 200:
             stats["recent_commits"] = response.json()
 
-        return stats
+        return compact_stats(stats) if compact else stats
 
-    def analyze_repository_health(self, repo_name: str) -> Dict:
-        """Analyze repository health and provide recommendations."""
-        stats = self.get_repository_stats(repo_name)
+    def get_repositories_stats(self, repo_names: List[str], backend: str = "auto",
+                               workers: int = 1, compact: bool = False) -> Dict[str, Dict]:
+        """Get statistics for several repositories.
 
-        health_score = 100
-        recommendations = []
+        Args:
+            repo_names: Repositories to fetch
+            backend: "rest" (4 calls per repo), "graphql" (one query per 50 repos) or
+                "auto" (GraphQL whenever more than one repository is requested)
+            workers: Number of REST repos or GraphQL batches fetched concurrently
+            compact: Project each repository's stats as they arrive (see compact_stats)
+
+        Returns:
+            Repository name to stats dict, in the shape returned by get_repository_stats
+        """
+        if backend == "auto":
+            backend = "graphql" if len(repo_names) > 1 else "rest"
 
-        # Check for README
-        if not stats.get("basic", {}).get("has_readme", False):
-            health_score -= 20
-            recommendations.append("Add a comprehensive README.md")
+        if backend == "rest":
+            results = self._run_concurrently(lambda name: self.get_repository_stats(name, compact=compact),
+                                             repo_names, workers)
+            return dict(zip(repo_names, results))
 
-        # Check for description
-        if not stats.get("basic", {}).get("description"):
-            health_score -= 10
-            recommendations.append("Add repository description")
+        batches = [repo_names[i:i + GRAPHQL_BATCH_SIZE] for i in range(0, len(repo_names), GRAPHQL_BATCH_SIZE)]
+        stats = {}
+        for batch_stats in self._run_concurrently(self._get_stats_batch_graphql, batches, workers):
+            stats.update({name: compact_stats(repo_stats) if compact else repo_stats
+                          for name, repo_stats in batch_stats.items()})
+        return stats
 
-        # Check for recent activity
-        recent_commits = stats.get("recent_commits", [])
-        if not recent_commits or len(recent_commits) == 0:
-            health_score -= 15
-            recommendations.append("Repository appears inactive")
+    def _graphql(self, query: str, variables: Dict = None) -> Dict:
+        """Run a GraphQL query and return its data (partial data is kept when some fields fail)."""
+        if self.base_url.endswith("/api/v3"):
+            url = self.base_url[:-len("/v3")] + "/graphql"
+        else:
+            url = f"{self.base_url}/graphql"
+
+        response = self._request("POST", url, json={"query": query, "variables": variables or {}})
+        if response.status_code != 200:
+            print(f"❌ GraphQL query failed: {response.status_code}")
+            return {}
+
+        payload = response.json()
+        for error in payload.get("errors", []):
+            if error.get("type") != "NOT_FOUND":
+                print(f"⚠️  GraphQL error: {error.get('message')}")
+        return payload.get("data") or {}
+
+    def _get_stats_batch_graphql(self, repo_names: List[str]) -> Dict[str, Dict]:
+        """Fetch stats for up to GRAPHQL_BATCH_SIZE repositories in one aliased query."""
+        params = ", ".join(f"$n{i}: String!" for i in range(len(repo_names)))
+        fields = "\n".join(f"  r{i}: repository(owner: $owner, name: $n{i}) {{ ...RepoStats }}"
+                            for i in range(len(repo_names)))
+        query = f"query($owner: String!, {params}) {{\n{fields}\n}}\n{GRAPHQL_REPO_STATS_FRAGMENT}"
+
+        variables = {"owner": self.username}
+        variables.update({f"n{i}": name for i, name in enumerate(repo_names)})
+        data = self._graphql(query, variables)
+
+        return {name: self._graphql_repo_to_stats(data.get(f"r{i}")) for i, name in enumerate(repo_names)}
+
+    @staticmethod
+    def _graphql_repo_to_stats(repo: Optional[Dict]) -> Dict:
+        """Convert a RepoStats GraphQL node into the REST-shaped stats dict."""
+        if not repo:
+            return {}
+
+        branch = repo.get("defaultBranchRef") or {}
+        history = ((branch.get("target") or {}).get("history") or {}).get("nodes", [])
+        license_info = repo.get("licenseInfo")
+
+        basic = {
+            "name": repo["name"],
+            "full_name": repo["nameWithOwner"],
+            "description": repo["description"],
+            "homepage": repo["homepageUrl"],
+            "html_url": repo["url"],
+            "private": repo["isPrivate"],
+            "fork": repo["isFork"],
+            "archived": repo["isArchived"],
+            "stargazers_count": repo["stargazerCount"],
+            "forks_count": repo["forkCount"],
+            "created_at": repo["createdAt"],
+            "updated_at": repo["updatedAt"],
+            "pushed_at": repo["pushedAt"],
+            "language": (repo.get("primaryLanguage") or {}).get("name"),
+            "license": {"spdx_id": license_info["spdxId"], "name": license_info["name"]} if license_info else None,
+            "topics": [node["topic"]["name"] for node in repo["repositoryTopics"]["nodes"]],
+            "default_branch": branch.get("name"),
+            "has_readme": any(repo.get(f"readme{i}") for i in range(len(README_PATHS)))
+        }
 
-        # Check language diversity
-        languages = stats.get("languages", {})
-        if len(languages) == 0:
-            health_score -= 10
-            recommendations.append("Repository may be empty")
+        recent_commits = []
+        for commit in history:
+            # author is null when the commit's git identity can't be resolved
+            author = commit.get("author") or {}
+            user = author.get("user")
+            recent_commits.append({
+                "sha": commit["oid"],
+                "commit": {
+                    "message": commit["messageHeadline"],
+                    "author": {
+                        "name": author.get("name"),
+                        "email": author.get("email"),
+                        "date": commit["committedDate"]
+                    }
+                },
+                "author": {"login": user["login"]} if user else None
+            })
 
         return {
-            "health_score": max(0, health_score),
-            "recommendations": recommendations,
-            "stats": stats
+            "basic": basic,
+            "languages": {edge["node"]["name"]: edge["size"] for edge in repo["languages"]["edges"]},
+            "recent_commits": recent_commits,
+            "workflows": [entry["name"] for entry in (repo.get("workflows") or {}).get("entries", [])]
         }
 
+    def analyze_repository_health(self, repo_name: str, stats: Dict = None,
+                                  rules: List[str] = None) -> Dict:
+        """Analyze repository health and provide recommendations.
+
+        Args:
+            repo_name: Repository to analyze
+            stats: Previously fetched stats; anything a rule needs beyond them is fetched once
+            rules: Names of registered health rules to apply (default: all of HEALTH_RULES)
+        """
+        if self.offline and stats is None and rules is None:
+            stored = self.mirror.get_health(repo_name)
+            if stored is not None:
+                return stored  # Kept current by the webhook receiver
+        return score_repository_health(RepoHealthContext(self, repo_name, stats), rules)
+
+    def analyze_repositories_health(self, repo_names: List[str], backend: str = "auto",
+                                    workers: int = 1) -> Dict[str, Dict]:
+        """Analyze several repositories, batching the stats fetch (GraphQL for multi-repo runs)."""
+        all_stats = self.get_repositories_stats(repo_names, backend, workers)
+        return {name: self.analyze_repository_health(name, stats) for name, stats in all_stats.items()}
+
+    def iter_health_scan(self, workers: int = 4, backend: str = "rest") -> Iterator[Tuple[str, Dict]]:
+        """Score every repository concurrently, yielding (repo_name, health) as each finishes.
+
+        Args:
+            workers: Number of repositories (REST) or batches (GraphQL) scored concurrently
+            backend: "rest" seeds each repo from the listing payload and fetches only what rules
+                still need; "graphql" fetches stats for 50 repositories per query
+        """
+        repos = self.iter_repositories(prefetch=True)
+
+        if backend == "graphql":
+            def scan_batch(batch: List[Dict]) -> List[Tuple[str, Dict]]:
+                all_stats = self._get_stats_batch_graphql([repo["name"] for repo in batch])
+                return [(name, self.analyze_repository_health(name, stats)) for name, stats in all_stats.items()]
+
+            for _, results in self._iter_concurrently(scan_batch, _chunked(repos, GRAPHQL_BATCH_SIZE), workers):
+                yield from results
+            return
+
+        def scan(repo: Dict) -> Dict:
+            return self.analyze_repository_health(repo["name"], {"basic": repo})
+
+        for repo, health in self._iter_concurrently(scan, repos, workers):
+            yield repo["name"], health
+
+    def analyze_all_repositories(self, output: str = DEFAULT_HEALTH_REPORT, workers: int = 4,
+                                 backend: str = "rest") -> List[Dict]:
+        """Scan every repository, stream scores as they finish and write a ranked report.
+
+        Returns:
+            Report rows sorted from least to most healthy
+        """
+        print(f"\n🏥 Scanning repository health for {self.username}...")
+
+        rows = []
+        for repo_name, health in self.iter_health_scan(workers, backend):
+            print(f"  {health['health_score']:>3}/100  {repo_name}")
+            rows.append({
+                "repo": repo_name,
+                "health_score": health["health_score"],
+                "failed_rules": health["failed_rules"],
+                "recommendations": health["recommendations"]
+            })
+
+        rows.sort(key=lambda row: (row["health_score"], row["repo"].lower()))
+        write_health_report(rows, output)
+        print(f"\n✅ Health report for {len(rows)} repositories saved to {output}")
+        return rows
+
     # ===== BULK OPERATIONS =====
 
-    def bulk_update_descriptions(self, description_map: Dict[str, str]) -> None:
-        """Update descriptions for multiple repositories."""
+    def bulk_update_descriptions(self, description_map: Dict[str, str], workers: int = 1) -> List[Dict]:
+        """Update descriptions for multiple repositories.
+
+        Args:
+            description_map: Repository name to description
+            workers: Number of repositories processed concurrently
+
+        Returns:
+            Per-repo result dicts in the order of description_map
+        """
+        import requests
+
         print(f"\n🔄 Bulk updating {len(description_map)} repositories...")
 
-        for repo_name, description in description_map.items():
-            self.update_repository_descriptions({repo_name: description})
+        def update(item) -> Dict:
+            repo_name, description = item
+            result = {"repo": repo_name, "actions": {}, "ok": False, "error": None}
+            try:
+                result["actions"]["description"] = self._patch_repository(repo_name, {"description": description})
+            except requests.RequestException as e:
+                result["error"] = str(e)
+            result["ok"] = result["actions"].get("description") == 200
+            return result
+
+        results = self._run_concurrently(update, description_map.items(), workers)
+        print_bulk_report(results)
+        return results
+
+    def setup_repositories_professional(self, repo_names: Iterable[str], workers: int = 1,
+                                        jobs: JobQueue = None, resume: bool = False) -> List[Dict]:
+        """Apply descriptions, homepages and topics to the given repositories.
 
-    def setup_all_repositories_professional(self) -> None:
-        """Set up all repositories with professional features."""
-        print("
-🎯 Setting up all repositories professionally..."        )
+        Only fields that differ from the current state are written.
 
-        # Get all repositories
-        repos = self.list_repositories()
+        Args:
+            repo_names: Repositories to process
+            workers: Number of repositories processed concurrently
+            jobs: Durable queue tracking per-repo progress (optional)
+            resume: Continue the newest unfinished job for the same repositories in jobs
 
+        Returns:
+            Per-repo result dicts (in the order of repo_names unless a job is used)
+        """
+        repo_names = list(repo_names)
+        if jobs is not None:
+            results = self._run_job(jobs, "professional-setup", {"repos": sorted(repo_names)},
+                                    lambda: self.plan_repository_changes(repo_names, strict=True), workers, resume)
+        else:
+            results = self._run_concurrently(self._apply_repository_plan, self.plan_repository_changes(repo_names),
+                                             workers)
+        print_bulk_report(results)
+        return results
+
+    def setup_all_repositories_professional(self, workers: int = 1, jobs: JobQueue = None,
+                                            resume: bool = False) -> List[Dict]:
+        """Set up all repositories with professional features.
+
+        Args:
+            workers: Number of repositories processed concurrently
+            jobs: Durable queue tracking per-repo progress (optional)
+            resume: Continue the newest unfinished bulk update in jobs
+        """
+        print("\n🎯 Setting up all repositories professionally...")
+
+        # Stream repositories so work starts while later pages are still loading. A job must not
+        # be recorded as fully queued from a truncated listing, so listing errors raise there.
+        def plan(strict: bool = False) -> Iterator[Dict]:
+            return self.iter_plan(self.iter_repositories(prefetch=True, strict=strict, compact=True))
+
+        if jobs is not None:
+            results = self._run_job(jobs, "bulk-update", {"repos": None}, lambda: plan(strict=True), workers, resume)
+        else:
+            results = self._run_concurrently(self._apply_repository_plan, plan(), workers)
+        print_bulk_report(results)
+        return results
+
+    def _run_job(self, jobs: JobQueue, kind: str, params: Dict, plan: Callable[[], Iterable[Dict]],
+                 workers: int = 1, resume: bool = False, max_attempts: int = JOB_MAX_ATTEMPTS) -> List[Dict]:
+        """Apply repository plan entries through a durable job, retrying transient failures.
+
+        Args:
+            jobs: Queue storing the job and its per-repo items
+            kind: Job kind; together with params it identifies the job to resume
+            params: JSON-serializable job parameters
+            plan: Produces the plan entries; not called when resuming a fully queued job
+            workers: Number of items processed concurrently
+            resume: Continue the newest unfinished matching job instead of starting a new one
+            max_attempts: Attempts per item and run for errors worth retrying (5xx, 403/429, network)
+
+        Returns:
+            Result dicts of the items processed in this run, in completion order
+        """
+        job_id, resumed = jobs.open_job(kind, params, resume)
+        if resumed:
+            progress = jobs.progress(job_id)
+            print(f"⏯️ Resuming job {job_id}: {progress.get('done', 0)} repositories already done")
+        elif resume:
+            print(f"ℹ️ No unfinished {kind} job to resume - starting job {job_id}")
+
+        if resumed and jobs.is_enqueued(job_id):
+            # The plan was stored with the job, so finished repositories cost no API calls
+            items = jobs.pending(job_id)
+        else:
+            def enqueue() -> Iterator[Dict]:
+                for entry in plan():
+                    if jobs.add(job_id, entry["repo"], entry) != "done":
+                        yield entry
+                jobs.mark_enqueued(job_id)
+
+            items = enqueue()
+
+        def run(entry: Dict) -> Dict:
+            for attempt in range(1, max_attempts + 1):
+                jobs.start(job_id, entry["repo"])
+                result = self._apply_repository_plan(entry)
+                if result["ok"] or entry["missing"] or not _is_retryable(result) or attempt == max_attempts:
+                    break
+                time.sleep(JOB_RETRY_BACKOFF * 2 ** (attempt - 1))
+            jobs.complete(job_id, entry["repo"], result)
+            return result
+
+        results = [result for _, result in self._iter_concurrently(run, items, workers)]
+
+        progress = jobs.progress(job_id)
+        total = sum(progress.values())
+        if progress.get("done", 0) == total:
+            jobs.finish(job_id)
+            print(f"📒 Job {job_id} finished: {total} repositories")
+        else:
+            print(f"📒 Job {job_id}: {progress.get('done', 0)}/{total} repositories done, "
+                  f"{progress.get('failed', 0)} failed - re-run with --resume to retry")
+        return results
+
+    # ===== RECONCILIATION =====
+
+    def _desired_state(self, repo_name: str) -> Dict:
+        """Desired description, homepage and topics for a repository (only fields we manage)."""
+        resolved = self.repo_config().resolve(repo_name)
+        return {field: value for field, value in resolved.items() if value}
+
+    def _plan_repository(self, repo: Dict) -> Dict:
+        """Diff one repository's current listing entry against its desired state."""
+        desired = self._desired_state(repo["name"])
+        changes = {}
+
+        for field in ("description", "homepage"):
+            if field in desired and (repo.get(field) or "") != desired[field]:
+                changes[field] = {"old": repo.get(field), "new": desired[field]}
+
+        if "topics" in desired and _normalize_topics(repo.get("topics")) != _normalize_topics(desired["topics"]):
+            changes["topics"] = {"old": repo.get("topics") or [], "new": desired["topics"]}
+
+        return {"repo": repo["name"], "changes": changes, "missing": False}
+
+    def iter_plan(self, repos: Iterable[Dict]) -> Iterator[Dict]:
+        """Yield a change plan for every repository in a listing stream."""
         for repo in repos:
-            repo_name = repo["name"]
-            print(f"\n🔧 Processing {repo_name}...")
+            yield self._plan_repository(repo)
+
+    def plan_repository_changes(self, repo_names: Iterable[str] = None, strict: bool = False) -> List[Dict]:
+        """Compute the minimal set of writes from one bulk listing.
+
+        Args:
+            repo_names: Repositories to plan for (default: every repository)
+            strict: Raise if a listing page fails instead of planning from a partial listing
+
+        Returns:
+            One plan entry per repository: {"repo", "changes": {field: {"old", "new"}}, "missing"}
+        """
+        if repo_names is None:
+            return list(self.iter_plan(self.iter_repositories(strict=strict, compact=True)))
 
-            # Update description
-            descriptions = get_repository_descriptions()
-            if repo_name in descriptions:
-                self.update_repository_descriptions({repo_name: descriptions[repo_name]})
+        repo_names = list(repo_names)
+        current = self._current_repositories(repo_names, strict=strict)
+        return [self._plan_repository(current[name]) if name in current
+                else {"repo": name, "changes": {}, "missing": True}
+                for name in repo_names]
 
-            # Setup features
-            self.setup_repository_features(repo_name)
+    def _apply_repository_plan(self, entry: Dict) -> Dict:
+        """Issue only the writes a plan entry needs (description and homepage share one PATCH).
+
+        Returns:
+            Result dict with the repo name, per-action status codes and an overall ok flag
+        """
+        import requests
+
+        result = {"repo": entry["repo"], "actions": {}, "ok": True, "error": None}
+        if entry["missing"]:
+            result.update(ok=False, error="repository not found")
+            return result
+
+        changes = entry["changes"]
+        try:
+            settings = {field: changes[field]["new"] for field in ("description", "homepage") if field in changes}
+            if settings:
+                result["actions"]["settings"] = self._patch_repository(entry["repo"], settings)
+            if "topics" in changes:
+                result["actions"]["topics"] = self._put_topics(entry["repo"], changes["topics"]["new"])
+        except requests.RequestException as e:
+            result["error"] = str(e)
+
+        result["ok"] = result["error"] is None and all(
+            status == 200 for status in result["actions"].values()
+        )
+        return result
 
     # ===== UTILITY METHODS =====
 
-    def list_repositories(self, type_filter: str = "all") -> List[Dict]:
-        """List all repositories for the user."""
-        params = {"per_page": 100}
+    def list_repositories(self, type_filter: str = "all", compact: bool = False) -> List[Dict]:
+        """List all repositories for the user (compact: as Repo records)."""
+        return list(self.iter_repositories(type_filter, compact=compact))
+
+    def iter_repositories(self, type_filter: str = "all", prefetch: bool = False,
+                          strict: bool = False, compact: bool = False) -> Iterator[Dict]:
+        """Stream all repositories for the user page by page.
+
+        Args:
+            type_filter: "all", "owner", "public", "private" or "member"
+            prefetch: Fetch the next page in the background while the current one is consumed
+            strict: Raise if a page fails instead of ending the listing early
+            compact: Yield Repo records instead of raw API dicts
+        """
+        if self.offline:
+            repos = self.mirror.iter_repositories(type_filter)
+            return map(Repo.from_api, repos) if compact else repos
+
+        params = {}
         if type_filter != "all":
             params["type"] = type_filter
 
-        response = requests.get(f"{self.base_url}/user/repos", headers=self.headers, params=params)
-
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"❌ Failed to list repositories: {response.status_code}")
-            return []
+        return self._paginate("/user/repos", params, prefetch=prefetch, strict=strict,
+                              record=Repo.from_api if compact else None)
 
     def search_repositories(self, query: str) -> List[Dict]:
-        """Search user's repositories."""
+        """Search user's repositories (ranked from the local index once a mirror has been synced)."""
+        return list(self.iter_search(query))
+
+    def iter_search(self, query: str, prefetch: bool = False) -> Iterator[Dict]:
+        """Stream repository search results page by page (GitHub caps search at 1000 results)."""
+        # The local index returns every match, ranked, without spending search quota
+        if self.offline or (self.mirror is not None and self.mirror.cursor("repos")):
+            return iter(self.mirror.search_repositories(query))
+
         params = {"q": f"user:{self.username} {query}"}
 
-        response = requests.get(f"{self.base_url}/search/repositories", headers=self.headers, params=params)
+        return self._paginate("/search/repositories", params, item_key="items", prefetch=prefetch)
 
-        if response.status_code == 200:
-            return response.json().get("items", [])
-        else:
-            print(f"❌ Failed to search repositories: {response.status_code}")
-            return []
+    def sync_mirror(self, full: bool = False, workers: int = 4, readmes: bool = True) -> Dict:
+        """Pull changed repositories, issues and pull requests into the local mirror.
+
+        Repositories are listed with since=<newest updated_at seen>, and each repository's
+        issues (which include pull requests) with its own since cursor, so a repeat sync only
+        transfers what changed. A full sync re-reads everything and drops deleted repositories.
+        READMEs are (re)indexed for search only when a repository's pushed_at moved.
+
+        Args:
+            full: Ignore cursors and rebuild the mirror
+            workers: Number of repositories whose issues are fetched concurrently
+            readmes: Fetch README text for the local search index
+
+        Returns:
+            Counts of synced repositories, issues, pull requests and READMEs, plus removed repositories
+        """
+        mirror = self.mirror
+        summary = {"repos": 0, "issues": 0, "pull_requests": 0, "readmes": 0, "removed": 0}
+        print(f"\n🔄 {'Full' if full else 'Incremental'} mirror sync to {mirror.path}...")
+
+        since = None if full else mirror.cursor("repos")
+        params = {"sort": "updated", "direction": "desc"}
+        if since:
+            params["since"] = since
+        changed = list(self._paginate("/user/repos", params, prefetch=True))
+        summary["repos"] = mirror.upsert_repos(changed)
+        if changed:
+            mirror.set_cursor("repos", max(repo["updated_at"] for repo in changed))
+        if full and changed:
+            summary["removed"] = mirror.remove_repos_except(repo["name"] for repo in changed)
+
+        # Issue edits do not always touch the repository's updated_at, so every mirrored
+        # repository is asked for issues changed since its own cursor
+        full_names = {repo["name"]: repo["full_name"] for repo in changed}
+
+        def fetch(repo_name: str) -> List[Dict]:
+            full_name = full_names.get(repo_name) or mirror.get_repository(repo_name)["full_name"]
+            issue_params = {"state": "all", "sort": "updated", "direction": "asc"}
+            cursor = None if full else mirror.cursor(f"issues:{repo_name}")
+            if cursor:
+                issue_params["since"] = cursor
+            return list(self._paginate(f"/repos/{full_name}/issues", issue_params))
+
+        def fetch_readme(repo: Dict) -> str:
+            response = self._request("GET", f"/repos/{repo['full_name']}/readme")
+            if response.status_code != 200:
+                return ""
+            return base64.b64decode(response.json()["content"])[:README_INDEX_BYTES].decode("utf-8", "replace")
+
+        if readmes:
+            for repo, text in self._iter_concurrently(fetch_readme, mirror.outdated_readmes(mirror.iter_repositories()), workers):
+                mirror.store_readme(repo["name"], repo.get("pushed_at"), text)
+                summary["readmes"] += 1
+
+        for repo_name, issues in self._iter_concurrently(fetch, mirror.repository_names(), workers):
+            mirror.upsert_issues(repo_name, issues, replace=full)
+            if issues:
+                mirror.set_cursor(f"issues:{repo_name}", max(issue["updated_at"] for issue in issues))
+            pull_requests = sum(1 for issue in issues if "pull_request" in issue)
+            summary["pull_requests"] += pull_requests
+            summary["issues"] += len(issues) - pull_requests
+
+        print(f"✅ Synced {summary['repos']} repositories, {summary['issues']} issues, "
+              f"{summary['pull_requests']} pull requests and {summary['readmes']} READMEs "
+              f"({summary['removed']} repositories removed)")
+        return summary
+
+    def repo_config(self) -> RepoConfig:
+        """Compiled repository manifest (reloaded only when the file changes)."""
+        return load_repo_config(self.repo_config_path)
 
     def _get_topics_for_repo(self, repo_name: str) -> List[str]:
         """Get appropriate topics for a repository."""
-        topic_map = {
-            "MeTuber": ["youtube", "automation", "content-creation", "python", "analytics"],
-            "Dream.os": ["ai", "multi-agent", "orchestration", "automation", "python"],
-            "AgentTools": ["automation", "devops", "tools", "python", "ci-cd"],
-            "WorkProjects": ["innovation", "prototyping", "ai", "machine-learning", "research"],
-            "Websites": ["web-development", "wordpress", "full-stack", "javascript", "php"],
-            "Flowr": ["javascript", "productivity", "session-management", "voice-api"],
-            "professional-portfolio": ["portfolio", "career", "resume", "professional", "sre"]
-        }
-        return topic_map.get(repo_name, [])
+        return self.repo_config().resolve(repo_name)["topics"] or []
 
     def _get_homepage_for_repo(self, repo_name: str) -> Optional[str]:
         """Get homepage URL for a repository."""
-        homepage_map = {
-            "professional-portfolio": "https://github.com/Victor-Dixon/professional-portfolio",
-            "MeTuber": "https://github.com/Victor-Dixon/MeTuber",
-            "Dream.os": "https://github.com/Victor-Dixon/Dream.os"
-        }
-        return homepage_map.get(repo_name)
+        return self.repo_config().resolve(repo_name)["homepage"]
 
     def backup_profile_data(self) -> Dict:
         """Backup current profile information."""
         print("\n📦 Backing up profile data...")
 
         # Get user profile
-        user_response = requests.get(f"{self.base_url}/user", headers=self.headers)
+        user_response = self._request("GET", "/user")
         user_data = user_response.json()
 
         # Get repositories
-        repos_response = requests.get(f"{self.base_url}/user/repos", headers=self.headers)
-        repos_data = repos_response.json()
+        repos_data = self.list_repositories()
 
         backup = {
             "user": user_data,
@@ -573,48 +3555,1266 @@ jobs:
         print(f"✅ Profile backup saved to {backup_file}")
         return backup
 
+    def backup_profile_incremental(self, directory: Union[str, Path] = DEFAULT_BACKUP_DIR,
+                                   compress: bool = False) -> Dict:
+        """Stream the profile and every repository into an incremental snapshot.
+
+        Only repositories whose updated_at/pushed_at changed since the last snapshot are
+        written; see ProfileBackup for the on-disk layout.
+        """
+        print(f"\n📦 Incremental backup into {directory}...")
+
+        user_response = self._request("GET", "/user")
+        if user_response.status_code != 200:
+            print(f"❌ Failed to fetch profile: {user_response.status_code}")
+            return {}
+
+        store = ProfileBackup(directory, compress)
+        summary = store.create(user_response.json(), self.iter_repositories(prefetch=True))
+
+        print(f"✅ Snapshot {summary['snapshot']}: {summary['written']} records written, "
+              f"{summary['unchanged']} unchanged")
+        return summary
+
     def update_profile_readme(self, content: str) -> None:
         """Update or create profile README."""
         print("\n📝 Updating profile README...")
 
-        # Check if profile README exists
-        readme_response = requests.get(f"{self.base_url}/repos/{self.username}/{self.username}/readme", headers=self.headers)
-
-        if readme_response.status_code == 404:
-            # Create new README
-            url = f"{self.base_url}/repos/{self.username}/{self.username}/contents/README.md"
-            data = {
-                "message": "Create profile README",
-                "content": base64.b64encode(content.encode()).decode()
-            }
-        else:
-            # Update existing README
-            current_readme = readme_response.json()
-            url = f"{self.base_url}/repos/{self.username}/{self.username}/contents/README.md"
-            data = {
-                "message": "Update profile README",
-                "content": base64.b64encode(content.encode()).decode(),
-                "sha": current_readme["sha"]
-            }
-
-        response = requests.put(url, headers=self.headers, json=data)
+        result = self.commit_files(self.username, {"README.md": content}, "Update profile README")
 
-        if response.status_code in [200, 201]:
+        if result is None:
+            print("❌ Failed to update profile README")
+        elif result["changed"]:
             print("✅ Profile README updated")
         else:
-            print(f"❌ Failed to update profile README: {response.status_code}")
+            print("⏭️  Profile README already up to date")
+
+class RepoHealthContext:
+    """Per-repository data shared by health rules.
+
+    Seeded with whatever stats the caller already has (a listing entry, REST or GraphQL
+    stats); anything else is fetched on first use and memoized, so no endpoint is hit
+    twice for the same repository however many rules read it.
+    """
+
+    def __init__(self, manager: GitHubManager, repo_name: str, stats: Dict = None):
+        self.manager = manager
+        self.repo_name = repo_name
+        self.stats = dict(stats or {})
+
+    def _fetch(self, key: str, path: str, default, params: Dict = None):
+        """Fetch path into stats[key] unless it is already known."""
+        if key not in self.stats:
+            response = self.manager._request("GET", f"/repos/{self.manager.username}/{self.repo_name}{path}",
+                                             params=params)
+            self.stats[key] = response.json() if response.status_code == 200 else default
+        return self.stats[key]
+
+    def basic(self) -> Dict:
+        return self._fetch("basic", "", {})
+
+    def languages(self) -> Dict:
+        return self._fetch("languages", "/languages", {})
+
+    def recent_commits(self) -> List[Dict]:
+        return self._fetch("recent_commits", "/commits", [], params={"per_page": 10})
+
+    def has_readme(self) -> bool:
+        if "has_readme" not in self.basic():
+            readme = self._fetch("readme", "/readme", None)
+            self.stats["basic"]["has_readme"] = readme is not None
+        return self.stats["basic"]["has_readme"]
+
+    def workflows(self) -> List[str]:
+        if "workflows" not in self.stats:
+            entries = self._fetch("workflows", "/contents/.github/workflows", [])
+            self.stats["workflows"] = [entry["name"] for entry in entries if entry.get("type") == "file"]
+        return self.stats["workflows"]
+
+# Health rules: name -> (penalty, recommendation, check). A check returns True when the repo passes.
+HEALTH_RULES: Dict[str, Tuple[int, str, Callable[[RepoHealthContext], bool]]] = {}
+
+def register_health_rule(name: str, penalty: int, recommendation: str):
+    """Register a health rule; the decorated check receives a RepoHealthContext."""
+    def decorator(check: Callable[[RepoHealthContext], bool]):
+        HEALTH_RULES[name] = (penalty, recommendation, check)
+        return check
+    return decorator
+
+@register_health_rule("readme", 20, "Add a comprehensive README.md")
+def _rule_readme(context: RepoHealthContext) -> bool:
+    return context.has_readme()
+
+@register_health_rule("description", 10, "Add repository description")
+def _rule_description(context: RepoHealthContext) -> bool:
+    return bool(context.basic().get("description"))
+
+@register_health_rule("activity", 15, "Repository appears inactive")
+def _rule_activity(context: RepoHealthContext) -> bool:
+    return len(context.recent_commits()) > 0
+
+@register_health_rule("languages", 10, "Repository may be empty")
+def _rule_languages(context: RepoHealthContext) -> bool:
+    return len(context.languages()) > 0
+
+@register_health_rule("license", 10, "Add a LICENSE file")
+def _rule_license(context: RepoHealthContext) -> bool:
+    return bool(context.basic().get("license"))
+
+@register_health_rule("ci", 10, "Add a CI workflow under .github/workflows")
+def _rule_ci(context: RepoHealthContext) -> bool:
+    return len(context.workflows()) > 0
+
+@register_health_rule("stale", 15, f"No pushes in the last {STALE_AFTER_DAYS} days")
+def _rule_stale(context: RepoHealthContext) -> bool:
+    pushed_at = context.basic().get("pushed_at")
+    if not pushed_at:
+        return False
+    pushed = datetime.fromisoformat(pushed_at.replace("Z", "+00:00"))
+    return (datetime.now(timezone.utc) - pushed).days <= STALE_AFTER_DAYS
+
+def score_repository_health(context: RepoHealthContext, rules: List[str] = None) -> Dict:
+    """Apply health rules to a repository context and collect the score and recommendations."""
+    health_score = 100
+    recommendations = []
+    failed_rules = []
+
+    for name in rules or HEALTH_RULES:
+        penalty, recommendation, check = HEALTH_RULES[name]
+        if not check(context):
+            health_score -= penalty
+            recommendations.append(recommendation)
+            failed_rules.append(name)
 
-def get_repository_descriptions() -> Dict[str, str]:
-    """Get the improved repository descriptions."""
     return {
-        "MeTuber": "Enterprise-grade YouTube automation platform for content creators. Features advanced analytics integration, automated publishing workflows, and multi-platform content distribution with performance tracking.",
-        "WorkProjects": "Innovation laboratory featuring experimental AI implementations, rapid prototyping frameworks, and cutting-edge technology explorations across machine learning, automation, and system design.",
-        "Dream.os": "Advanced multi-agent AI orchestration system for automated development workflows. Implements swarm intelligence architecture for intelligent task coordination and infrastructure management.",
-        "Websites": "Full-stack web development portfolio including custom WordPress themes, responsive static sites, e-commerce platforms, and deployment automation solutions with modern development practices.",
-        "AgentTools": "Comprehensive developer automation toolkit featuring CI/CD pipelines, testing frameworks, infrastructure management scripts, and productivity enhancement utilities for modern development workflows.",
-        "Flowr": "Advanced session management application with intelligent timing features, voice-activated controls via Web Speech API, comprehensive analytics, and local data persistence for enhanced user experience.",
-        "professional-portfolio": "Professional portfolio showcasing system reliability expertise and enterprise software development. Features comprehensive career materials, project documentation, and SRE positioning for senior engineering roles."
+        "health_score": max(0, health_score),
+        "recommendations": recommendations,
+        "failed_rules": failed_rules,
+        "stats": context.stats
+    }
+
+class AsyncGitHubManager:
+    """Asyncio counterpart of GitHubManager for embedding in event-loop services.
+
+    Built on a pooled httpx.AsyncClient; a semaphore bounds in-flight requests and the
+    same RateLimitScheduler paces them without blocking the loop. Methods mirror
+    GitHubManager and return the same values.
+
+    Usage:
+        async with AsyncGitHubManager(token="...") as gh:
+            issues = await gh.list_issues("repo-name")
+    """
+
+    def __init__(self, token: str = None, username: str = None, base_url: str = DEFAULT_BASE_URL,
+                 max_connections: int = 100, max_concurrency: int = 50,
+                 timeout: Union[float, Tuple[float, float]] = (5, 30), max_retries: int = 3,
+                 backoff_factor: float = 0.5, rate_limiter: RateLimitScheduler = None,
+                 metrics: RequestMetrics = None):
+        """
+        Initialize the async GitHub manager (no network calls until first use).
+
+        Args:
+            token: GitHub personal access token (default: $GITHUB_TOKEN)
+            username: GitHub username (resolved from the token on first use if omitted)
+            base_url: API root (override to point at GitHub Enterprise or a local stand-in server)
+            max_connections: Connection pool size
+            max_concurrency: Maximum number of requests in flight at once
+            timeout: Request timeout in seconds, or a (connect, read) tuple
+            max_retries: Retries for connection errors and 5xx responses
+            backoff_factor: Exponential backoff factor between retries
+            rate_limiter: Scheduler pacing requests (may be shared with a GitHubManager)
+            metrics: Collector for per-endpoint request metrics (may be shared with a GitHubManager)
+        """
+        import asyncio
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError("AsyncGitHubManager requires httpx: pip install httpx") from e
+
+        _load_env()
+        self.base_url = base_url.rstrip("/")
+        self.token = token or os.getenv("GITHUB_TOKEN")
+        if not self.token:
+            raise ValueError("No GitHub token provided (pass token= or set GITHUB_TOKEN)")
+        self.headers = {
+            "Authorization": f"token {self.token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+        self.username = username
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.rate_limiter = rate_limiter or RateLimitScheduler()
+        self.metrics = metrics or RequestMetrics()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.client = httpx.AsyncClient(
+            headers={**self.headers, "Accept-Encoding": "gzip, deflate"},
+            timeout=httpx.Timeout(read, connect=connect),
+            transport=httpx.AsyncHTTPTransport(retries=max_retries, limits=limits)
+        )
+
+    async def __aenter__(self) -> "AsyncGitHubManager":
+        if self.username is None:
+            self.username = await self._get_username()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close pooled connections."""
+        await self.client.aclose()
+
+    async def _request(self, method: str, path: str, **kwargs) -> "httpx.Response":
+        """Send an API request under the concurrency semaphore and rate-limit scheduler."""
+        url = path if path.startswith(("http://", "https://")) else f"{self.base_url}{path}"
+
+        started = time.perf_counter()
+        response = error = None
+        attempts = 0
+        try:
+            response, attempts = await self._send(method, url, **kwargs)
+            return response
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            request = response.request if response is not None else None
+            if response is not None:
+                self.metrics.observe_rate_limit(response.headers)
+            self.metrics.record({
+                "method": method.upper(),
+                "endpoint": endpoint_template(urlsplit(url).path[len(urlsplit(self.base_url).path):]),
+                "url": url,
+                "status": response.status_code if response is not None else None,
+                "seconds": time.perf_counter() - started,
+                "bytes_in": len(response.content) if response is not None else 0,
+                "bytes_out": len(request.content) if request is not None else 0,
+                "retries": attempts,
+                "cache": None,
+                "error": repr(error) if error else None
+            })
+
+    async def _send(self, method: str, url: str, **kwargs) -> Tuple["httpx.Response", int]:
+        """Send with 5xx backoff and rate-limit retries; returns the response and the retry count."""
+        import asyncio
+
+        for attempt in range(self.max_retries + 1):
+            delay = self.rate_limiter.reserve(url)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            async with self._semaphore:
+                response = await self.client.request(method, url, **kwargs)
+            self.rate_limiter.observe(url, response)
+
+            if attempt == self.max_retries:
+                return response, attempt
+            if response.status_code in (500, 502, 503, 504):
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+                continue
+            if response.status_code not in (403, 429):
+                return response, attempt
+
+            if response.headers.get("Retry-After"):
+                print(f"⏳ Secondary rate limit hit, retrying in {response.headers['Retry-After']}s...")
+            elif response.headers.get("X-RateLimit-Remaining") != "0":
+                return response, attempt
+
+    async def _paginate(self, path: str, params: Dict = None, item_key: str = None):
+        """Yield items from a paginated endpoint, following Link rel="next" lazily."""
+        url, params = path, {"per_page": PER_PAGE, **(params or {})}
+        while url:
+            response = await self._request("GET", url, params=params)
+            if response.status_code != 200:
+                print(f"❌ Failed to fetch {path}: {response.status_code}")
+                return
+
+            data = response.json()
+            for item in (data.get(item_key, []) if item_key else data):
+                yield item
+            url, params = response.links.get("next", {}).get("url"), None
+
+    async def _get_username(self) -> str:
+        """Get GitHub username from token."""
+        response = await self._request("GET", "/user")
+        if response.status_code == 401:
+            raise ValueError("Invalid GitHub token. Please check your credentials.")
+        return response.json()["login"]
+
+    # ===== REPOSITORY MANAGEMENT =====
+
+    async def create_repository(self, name: str, description: str = "", private: bool = False) -> Dict:
+        """Create a new repository."""
+        data = {"name": name, "description": description, "private": private, "auto_init": True}
+        response = await self._request("POST", "/user/repos", json=data)
+
+        if response.status_code == 201:
+            print(f"✅ Created repository: {name}")
+            return response.json()
+        print(f"❌ Failed to create repository {name}: {response.status_code}")
+        return None
+
+    async def delete_repository(self, repo_name: str, confirm: bool = False) -> bool:
+        """Delete a repository (dangerous operation)."""
+        if not confirm:
+            print("⚠️  DELETION REQUIRES CONFIRMATION")
+            print(f"Run with confirm=True to delete {repo_name}")
+            return False
+
+        response = await self._request("DELETE", f"/repos/{self.username}/{repo_name}")
+        if response.status_code == 204:
+            print(f"🗑️  Deleted repository: {repo_name}")
+            return True
+        print(f"❌ Failed to delete repository {repo_name}: {response.status_code}")
+        return False
+
+    async def list_repositories(self, type_filter: str = "all") -> List[Dict]:
+        """List all repositories for the user."""
+        return [repo async for repo in self.iter_repositories(type_filter)]
+
+    def iter_repositories(self, type_filter: str = "all"):
+        """Stream all repositories for the user page by page (async iterator)."""
+        params = {} if type_filter == "all" else {"type": type_filter}
+        return self._paginate("/user/repos", params)
+
+    async def search_repositories(self, query: str) -> List[Dict]:
+        """Search user's repositories."""
+        params = {"q": f"user:{self.username} {query}"}
+        return [repo async for repo in self._paginate("/search/repositories", params, item_key="items")]
+
+    # ===== ISSUE MANAGEMENT =====
+
+    async def create_issue(self, repo_name: str, title: str, body: str = "",
+                           labels: List[str] = None, assignees: List[str] = None) -> Dict:
+        """Create a new issue."""
+        data = {"title": title, "body": body}
+        if labels:
+            data["labels"] = labels
+        if assignees:
+            data["assignees"] = assignees
+
+        response = await self._request("POST", f"/repos/{self.username}/{repo_name}/issues", json=data)
+        if response.status_code == 201:
+            issue_data = response.json()
+            print(f"✅ Created issue: {title} (#{issue_data['number']})")
+            return issue_data
+        print(f"❌ Failed to create issue: {response.status_code}")
+        return None
+
+    async def list_issues(self, repo_name: str, state: str = "open", labels: str = None) -> List[Dict]:
+        """List repository issues."""
+        return [issue async for issue in self.iter_issues(repo_name, state, labels)]
+
+    def iter_issues(self, repo_name: str, state: str = "open", labels: str = None):
+        """Stream repository issues page by page (async iterator)."""
+        params = {"state": state}
+        if labels:
+            params["labels"] = labels
+        return self._paginate(f"/repos/{self.username}/{repo_name}/issues", params)
+
+    async def update_issue(self, repo_name: str, issue_number: int, title: str = None,
+                           body: str = None, state: str = None, labels: List[str] = None) -> bool:
+        """Update an existing issue."""
+        data = {key: value for key, value in
+                (("title", title), ("body", body), ("state", state), ("labels", labels)) if value}
+
+        response = await self._request("PATCH", f"/repos/{self.username}/{repo_name}/issues/{issue_number}",
+                                       json=data)
+        if response.status_code == 200:
+            print(f"✅ Updated issue #{issue_number}")
+            return True
+        print(f"❌ Failed to update issue #{issue_number}: {response.status_code}")
+        return False
+
+    # ===== PULL REQUEST MANAGEMENT =====
+
+    async def create_pull_request(self, repo_name: str, title: str, head: str, base: str = "main",
+                                  body: str = "", draft: bool = False) -> Dict:
+        """Create a pull request."""
+        data = {"title": title, "head": head, "base": base, "body": body, "draft": draft}
+        response = await self._request("POST", f"/repos/{self.username}/{repo_name}/pulls", json=data)
+
+        if response.status_code == 201:
+            pr_data = response.json()
+            print(f"✅ Created PR: {title} (#{pr_data['number']})")
+            return pr_data
+        print(f"❌ Failed to create PR: {response.status_code}")
+        return None
+
+    async def merge_pull_request(self, repo_name: str, pr_number: int, merge_method: str = "merge") -> bool:
+        """Merge a pull request."""
+        response = await self._request("PUT", f"/repos/{self.username}/{repo_name}/pulls/{pr_number}/merge",
+                                       json={"merge_method": merge_method})
+        if response.status_code == 200:
+            print(f"✅ Merged PR #{pr_number}")
+            return True
+        print(f"❌ Failed to merge PR #{pr_number}: {response.status_code}")
+        return False
+
+    # ===== ANALYTICS & INSIGHTS =====
+
+    async def _get_json(self, path: str, params: Dict = None):
+        """GET a resource and return its JSON body, or None unless the status is 200."""
+        response = await self._request("GET", path, params=params)
+        return response.json() if response.status_code == 200 else None
+
+    async def get_repository_stats(self, repo_name: str) -> Dict:
+        """Get comprehensive repository statistics (the four calls run concurrently)."""
+        import asyncio
+
+        prefix = f"/repos/{self.username}/{repo_name}"
+        keys = ("basic", "languages", "contributors", "recent_commits")
+        results = await asyncio.gather(
+            self._get_json(prefix),
+            self._get_json(f"{prefix}/languages"),
+            self._get_json(f"{prefix}/contributors"),
+            self._get_json(f"{prefix}/commits", {"per_page": 10})
+        )
+        return {key: value for key, value in zip(keys, results) if value is not None}
+
+    async def analyze_repository_health(self, repo_name: str, rules: List[str] = None) -> Dict:
+        """Analyze repository health, prefetching what the built-in rules read concurrently."""
+        import asyncio
+
+        prefix = f"/repos/{self.username}/{repo_name}"
+        basic, languages, commits, readme, workflows = await asyncio.gather(
+            self._get_json(prefix),
+            self._get_json(f"{prefix}/languages"),
+            self._get_json(f"{prefix}/commits", {"per_page": 10}),
+            self._get_json(f"{prefix}/readme"),
+            self._get_json(f"{prefix}/contents/.github/workflows")
+        )
+
+        basic = basic or {}
+        basic["has_readme"] = readme is not None
+        stats = {
+            "basic": basic,
+            "languages": languages or {},
+            "recent_commits": commits or [],
+            "readme": readme,
+            "workflows": [entry["name"] for entry in workflows or [] if entry.get("type") == "file"]
+        }
+        return score_repository_health(RepoHealthContext(None, repo_name, stats), rules)
+
+class RemoteError(RuntimeError):
+    """A JSON-RPC call that failed on the ManagerServer side."""
+
+    def __init__(self, code: int, message: str, data: Dict = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data or {}
+
+def parse_rpc_address(address: Union[str, Path, Tuple[str, int]]) -> Union[str, Tuple[str, int]]:
+    """Unix socket path, or (host, port) for "HOST:PORT" / "PORT" (host defaults to 127.0.0.1)."""
+    if isinstance(address, tuple):
+        return address
+    address = str(address)
+    host, _, port = address.rpartition(":")
+    if port.isdigit() and "/" not in address:
+        return (host.strip("[]") or "127.0.0.1", int(port))
+    return address
+
+def _rpc_json_default(value):
+    """JSON encoding for the non-JSON values manager methods return."""
+    if isinstance(value, ApiRecord):
+        return value.to_dict()
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, (set, frozenset, Iterator)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def load_rpc_token(path: Union[str, Path] = DEFAULT_RPC_TOKEN_FILE, create: bool = False) -> str:
+    """Read the secret shared by a ManagerServer and its clients from an owner-only file.
+
+    Args:
+        path: Token file
+        create: Write a new random secret (mode 0600) if the file does not exist yet
+
+    Raises:
+        ValueError: If the file is empty or readable by group or others
+    """
+    import secrets
+
+    path = Path(path)
+    if create and not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass  # Another server created it first
+        else:
+            with os.fdopen(fd, "w") as f:
+                f.write(secrets.token_urlsafe(32) + "\n")
+
+    if os.name == "posix" and path.stat().st_mode & 0o077:
+        raise ValueError(f"{path} must be readable by its owner only (chmod 600 {path})")
+    token = path.read_text().strip()
+    if not token:
+        raise ValueError(f"{path} is empty")
+    return token
+
+class ManagerServer:
+    """Serve a warm GitHubManager as JSON-RPC 2.0 over a Unix socket or loopback HTTP.
+
+    One manager (pooled connections, caches, memo, token pool and rate-limit schedulers) answers
+    every call, so callers skip interpreter startup and cold connections and share one quota.
+    Requests are POSTed to "/" with keep-alive; each runs on its own thread. Only the methods in
+    METHODS (plus "status" and "methods") can be called. TCP addresses must be loopback, and a
+    Unix socket is created readable by the owner only.
+
+    Every request must carry "Authorization: Bearer <secret>" (see load_rpc_token), be sent as
+    application/json and name a loopback Host (and Origin, if any), so web pages cannot reach
+    the server through a browser. Path arguments (PATH_PARAMS) must stay inside root.
+    """
+
+    METHODS = frozenset({
+        "list_repositories", "search_repositories", "get_repository_stats", "get_repositories_stats",
+        "analyze_repository_health", "analyze_repositories_health", "analyze_all_repositories",
+        "plan_repository_changes", "list_issues", "create_issue", "update_issue", "import_issues",
+        "create_pull_request", "merge_pull_request", "create_project", "create_project_column",
+        "create_repository", "update_repository_descriptions", "setup_repository_features",
+        "setup_repositories_features", "bulk_update_descriptions", "setup_repositories_professional",
+        "setup_all_repositories_professional",
+        "commit_files", "create_workflow_file", "setup_basic_ci_cd", "rollout_ci", "sync_mirror",
+        "backup_profile_data", "backup_profile_incremental", "update_profile_readme",
+    })
+    # Arguments naming local files or directories the call reads or writes
+    PATH_PARAMS = {
+        "analyze_all_repositories": ("output",),
+        "backup_profile_incremental": ("directory",),
+        "import_issues": ("checkpoint",),
+        "rollout_ci": ("templates_dir",),
     }
+    LOOPBACK = ("127.0.0.1", "localhost", "::1")
+
+    def __init__(self, manager: GitHubManager, address: Union[str, Path, Tuple[str, int]] = DEFAULT_RPC_SOCKET,
+                 token_file: Union[str, Path] = DEFAULT_RPC_TOKEN_FILE, root: Union[str, Path] = None):
+        """
+        Args:
+            manager: Manager whose operations are served
+            address: Unix socket path, or "HOST:PORT" / (host, port) on a loopback interface
+            token_file: Owner-only file holding the shared secret (created if missing)
+            root: Directory that path arguments must stay inside (default: the working directory)
+        """
+        import socket
+        import socketserver
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.manager = manager
+        self.address = parse_rpc_address(address)
+        self.token = load_rpc_token(token_file, create=True)
+        self.root = Path(root or Path.cwd()).resolve()
+        self.started = time.monotonic()
+        self.calls = 0
+        self._lock = threading.Lock()
+        rpc = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = isinstance(rpc.address, tuple)  # TCP_NODELAY does not apply to Unix sockets
+
+            def do_POST(self):
+                refusal = rpc.refuse(self.headers)
+                if refusal:
+                    # The body is left unread, so the connection cannot be reused
+                    self.close_connection = True
+                    status, message = refusal
+                    return self._reply(status, {"jsonrpc": "2.0", "id": None,
+                                                "error": {"code": -32001, "message": message}})
+                try:
+                    request = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+                except ValueError as e:
+                    reply = {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": f"Parse error: {e}"}}
+                else:
+                    if isinstance(request, list):
+                        reply = [rpc.handle(item) for item in request]
+                    else:
+                        reply = rpc.handle(request)
+                self._reply(200, reply)
+
+            def _reply(self, status: int, reply) -> None:
+                body = json.dumps(reply, default=_rpc_json_default).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def address_string(self):
+                return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+            def log_message(self, format, *args):
+                pass
+
+        if isinstance(self.address, tuple):
+            if self.address[0] not in self.LOOPBACK:
+                raise ValueError(f"refusing to serve on non-loopback address {self.address[0]!r}")
+            server_class = type("Server", (ThreadingHTTPServer,), {"daemon_threads": True})
+            if ":" in self.address[0]:
+                server_class.address_family = socket.AF_INET6
+            self.server = server_class(self.address, Handler)
+            self.address = self.server.server_address[:2]
+        else:
+            if os.path.exists(self.address):
+                probe = socket.socket(socket.AF_UNIX)
+                try:
+                    probe.connect(self.address)
+                except OSError:
+                    os.unlink(self.address)  # Left behind by a server that did not shut down cleanly
+                else:
+                    raise ValueError(f"a server is already listening on {self.address}")
+                finally:
+                    probe.close()
+            server_class = type("Server", (socketserver.ThreadingMixIn, socketserver.UnixStreamServer),
+                                {"daemon_threads": True})
+            umask = os.umask(0o177)
+            try:
+                self.server = server_class(self.address, Handler)
+            finally:
+                os.umask(umask)
+
+    def refuse(self, headers) -> Optional[Tuple[int, str]]:
+        """HTTP status and reason for rejecting a request before it is read, or None to accept it."""
+        import hmac
+
+        content_type = (headers.get("Content-Type") or "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            return 415, "Content-Type must be application/json"
+        if urlsplit(f"//{headers.get('Host') or ''}").hostname not in self.LOOPBACK:
+            return 403, "Host must be a loopback name"
+        origin = headers.get("Origin")
+        if origin is not None and urlsplit(origin).hostname not in self.LOOPBACK:
+            return 403, "Cross-origin calls are not allowed"
+        if not hmac.compare_digest((headers.get("Authorization") or "").encode(), f"Bearer {self.token}".encode()):
+            return 401, "Missing or invalid bearer token"
+        return None
+
+    def _inside_root(self, path) -> bool:
+        """Whether a path argument resolves to a location inside root."""
+        try:
+            Path(path).resolve().relative_to(self.root)
+        except (TypeError, ValueError):
+            return False
+        return True
+
+    def handle(self, request: Dict) -> Dict:
+        """Run one JSON-RPC request object and return its response object."""
+        request_id = request.get("id") if isinstance(request, dict) else None
+
+        def error(code: int, message: str, data: Dict = None) -> Dict:
+            body = {"code": code, "message": message}
+            if data:
+                body["data"] = data
+            return {"jsonrpc": "2.0", "id": request_id, "error": body}
+
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return error(-32600, "Invalid request")
+        method, params = request["method"], request.get("params") or {}
+        if not isinstance(params, (list, dict)):
+            return error(-32600, "params must be an array or an object")
+        with self._lock:
+            self.calls += 1
+
+        if method == "status":
+            return {"jsonrpc": "2.0", "id": request_id, "result": self.status()}
+        if method == "methods":
+            return {"jsonrpc": "2.0", "id": request_id, "result": sorted(self.METHODS | {"status", "methods"})}
+        if method not in self.METHODS:
+            return error(-32601, f"Method not found: {method}")
+
+        import inspect
+        import requests
+
+        function = getattr(self.manager, method)
+        args, kwargs = (params, {}) if isinstance(params, list) else ([], params)
+        try:
+            bound = inspect.signature(function).bind(*args, **kwargs)
+        except TypeError as e:
+            return error(-32602, f"Invalid params: {e}")
+        for name in self.PATH_PARAMS.get(method, ()):
+            if bound.arguments.get(name) is not None and not self._inside_root(bound.arguments[name]):
+                return error(-32602, f"Invalid params: {name} must be a path inside {self.root}")
+        try:
+            result = function(*args, **kwargs)
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            return error(-32000, str(e), {"type": type(e).__name__, "status": status})
+        except Exception as e:
+            return error(-32000, str(e), {"type": type(e).__name__})
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def status(self) -> Dict:
+        """Uptime, call count, quota headroom and cache/memo counters of the warm manager."""
+        manager = self.manager
+        return {
+            "username": manager.username,
+            "uptime_s": round(time.monotonic() - self.started, 1),
+            "calls": self.calls,
+            "requests": manager.metrics.summary()["requests"],
+            "rate_limit_remaining": manager.rate_limit_remaining,
+            "memo": manager.memo.stats() if manager.memo is not None else None,
+            "cache": manager.cache.stats() if manager.cache is not None else None,
+        }
+
+    def serve_forever(self) -> None:
+        """Answer calls until shutdown() is called from another thread (or the process is interrupted)."""
+        self.server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop serve_forever()."""
+        self.server.shutdown()
+
+    def close(self) -> None:
+        """Release the listening socket (and remove the Unix socket file)."""
+        self.server.server_close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+class ManagerClient:
+    """Thin client for a ManagerServer; remote methods are called as attributes.
+
+    Example:
+        client = ManagerClient(".github_manager.sock")
+        stats = client.get_repository_stats("repo-name")
+
+    The connection is kept alive between calls and reopened once if the server dropped it.
+    Failed calls raise RemoteError.
+    """
+
+    def __init__(self, address: Union[str, Path, Tuple[str, int]] = DEFAULT_RPC_SOCKET, timeout: float = None,
+                 token: str = None, token_file: Union[str, Path] = DEFAULT_RPC_TOKEN_FILE):
+        """
+        Args:
+            address: Unix socket path, or "HOST:PORT" / (host, port) the server listens on
+            timeout: Seconds to wait for a call (None: wait for long-running operations)
+            token: Shared secret of the server (default: read from token_file)
+            token_file: Owner-only file the server wrote its secret to
+        """
+        self.address = parse_rpc_address(address)
+        self.timeout = timeout
+        self.token = token or load_rpc_token(token_file)
+        self._connection = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Open an HTTP connection over TCP or the Unix socket."""
+        import http.client
+        import socket
+
+        if isinstance(self.address, tuple):
+            return http.client.HTTPConnection(*self.address, timeout=self.timeout)
+        path = self.address
+
+        class UnixConnection(http.client.HTTPConnection):
+            def connect(self):
+                self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.sock.settimeout(self.timeout)
+                self.sock.connect(path)
+
+        return UnixConnection("localhost", timeout=self.timeout)
+
+    def call(self, method: str, *args, **kwargs):
+        """Call a remote method with positional or keyword arguments (JSON-RPC allows one kind)."""
+        import http.client
+
+        if args and kwargs:
+            raise ValueError("pass either positional or keyword arguments to a remote call, not both")
+        body = json.dumps({"jsonrpc": "2.0", "id": next(self._ids), "method": method,
+                           "params": list(args) if args else kwargs}, default=_rpc_json_default).encode()
+        with self._lock:
+            for attempt in range(2):
+                reused = self._connection is not None
+                if not reused:
+                    self._connection = self._connect()
+                try:
+                    self._connection.request("POST", "/", body, {"Content-Type": "application/json",
+                                                                 "Authorization": f"Bearer {self.token}"})
+                    reply = json.loads(self._connection.getresponse().read())
+                    break
+                except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                    self.close()
+                    if not reused or attempt:
+                        raise
+        if "error" in reply:
+            error = reply["error"]
+            raise RemoteError(error["code"], error["message"], error.get("data"))
+        return reply["result"]
+
+    def __getattr__(self, name: str) -> Callable:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+
+    def close(self) -> None:
+        """Close the connection (the next call reopens it)."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+class WebhookReceiver:
+    """Keep the local mirror, health scores and backups current from GitHub webhook deliveries.
+
+    Handles push, issues, pull_request and repository events (ping is acknowledged). Deliveries
+    are checked against the shared secret (X-Hub-Signature-256), de-duplicated by delivery id and
+    applied in arrival order on one worker thread, so GitHub gets its response right away.
+    Repository and push events re-score health from the stats stored with the previous score,
+    fetching only what the event changed. With a backup directory, a snapshot is written from the
+    mirror (no listing calls) at most once per backup_interval after a change. Verified deliveries
+    can be recorded to a JSON Lines file and replayed later without a server.
+    """
+
+    EVENTS = ("ping", "push", "issues", "pull_request", "repository")
+    MAX_BODY = 25 * 1024 * 1024  # GitHub caps payloads at 25 MB
+    RECENT_DELIVERIES = 1000
+
+    def __init__(self, manager: GitHubManager, secret: Union[str, bytes] = None, apply_config: bool = False,
+                 backup_dir: Union[str, Path] = None, backup_interval: float = 300.0, compress: bool = False,
+                 record: Union[str, Path] = None):
+        """
+        Args:
+            manager: Manager with the LocalMirror to update
+            secret: Webhook secret configured on GitHub (needed to accept deliveries over HTTP)
+            apply_config: Write the manifest's description, homepage and topics to repositories as
+                they are created, renamed or edited
+            backup_dir: Incremental backup directory refreshed after changes (None disables backups)
+            backup_interval: Minimum seconds between backup snapshots
+            compress: Gzip backup packs
+            record: JSON Lines file every verified delivery is appended to, for replay
+        """
+        import queue
+
+        if manager.mirror is None:
+            raise ValueError("the webhook receiver needs a mirror")
+        self.manager = manager
+        self.mirror = manager.mirror
+        self.secret = secret.encode() if isinstance(secret, str) else secret
+        self.apply_config = apply_config
+        self.backup = ProfileBackup(backup_dir, compress) if backup_dir else None
+        self.backup_interval = backup_interval
+        self.record = Path(record) if record else None
+        self.server = None
+        self.counts: Dict[str, int] = {}
+        self._queue = queue.Queue()
+        self._worker = None
+        self._deliveries: "OrderedDict[str, None]" = OrderedDict()
+        self._dirty = False
+        self._last_backup = 0.0
+        self._lock = threading.Lock()
+
+    def verify(self, body: bytes, signature: Optional[str]) -> bool:
+        """Check an X-Hub-Signature-256 header ("sha256=<hex HMAC of the body>")."""
+        import hmac
+
+        if not self.secret or not signature or not signature.startswith("sha256="):
+            return False
+        expected = hmac.new(self.secret, body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature[len("sha256="):])
+
+    def deliver(self, event: str, body: bytes, signature: Optional[str],
+                delivery: str = None) -> Tuple[int, Dict]:
+        """Verify a delivery and queue it for the worker.
+
+        Returns:
+            HTTP status and response body for GitHub
+        """
+        if not self.verify(body, signature):
+            return 401, {"error": "invalid signature"}
+        if event not in self.EVENTS:
+            return 200, {"ignored": event}
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return 400, {"error": "body is not JSON"}
+
+        with self._lock:
+            if delivery and delivery in self._deliveries:
+                return 200, {"duplicate": delivery}  # GitHub redelivers on timeouts and manual retries
+            if delivery:
+                self._deliveries[delivery] = None
+                if len(self._deliveries) > self.RECENT_DELIVERIES:
+                    self._deliveries.popitem(last=False)
+            if self.record is not None:
+                with open(self.record, "a") as f:
+                    f.write(json.dumps({"event": event, "delivery": delivery, "payload": payload}) + "\n")
+            self._queue.put((event, payload))
+        return 202, {"queued": event}
+
+    def apply(self, event: str, payload: Dict) -> Dict:
+        """Apply one event to the mirror (and health scores) right away.
+
+        Returns:
+            Summary with the event, action, repository name and what was updated
+        """
+        action = payload.get("action")
+        repo = payload.get("repository")
+        summary = {"event": event, "action": action, "repo": repo.get("name") if repo else None, "updated": []}
+        if event != "ping" and repo is not None:
+            if self.manager.memo is not None:
+                # Responses memoized before the event are stale now
+                self.manager.memo.invalidate(f"/repos/{repo.get('full_name') or repo['name']}")
+            summary["updated"] = getattr(self, f"_on_{event}")(payload, webhook_repository(repo))
+        if summary["updated"]:
+            self._dirty = True
+        self.counts[event] = self.counts.get(event, 0) + 1
+        return summary
+
+    def replay(self, path: Union[str, Path]) -> List[Dict]:
+        """Apply recorded deliveries ({"event", "payload"} per line) in order, then refresh the backup."""
+        summaries = []
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    delivery = json.loads(line)
+                    summaries.append(self.apply(delivery["event"], delivery["payload"]))
+        self._refresh_backup(force=True)
+        return summaries
+
+    def _store_repo(self, repo: Dict) -> Dict:
+        """Merge a webhook repository object into the mirrored record."""
+        merged = {**(self.mirror.get_repository(repo["name"]) or {}), **repo}
+        self.mirror.upsert_repos([merged])
+        return merged
+
+    def _on_repository(self, payload: Dict, repo: Dict) -> List[str]:
+        action = payload.get("action")
+        if action == "deleted":
+            self.mirror.remove_repo(repo["name"])
+            return ["repository removed"]
+        updated = []
+        if action == "renamed":
+            self.mirror.remove_repo(payload["changes"]["repository"]["name"]["from"])
+            updated.append("old name removed")
+        repo = self._store_repo(repo)
+        updated.append("repository")
+        if self.apply_config and action in ("created", "edited", "renamed", "transferred"):
+            entry = self.manager._plan_repository(repo)
+            if entry["changes"]:
+                result = self.manager._apply_repository_plan(entry)
+                updated.append("configured" if result["ok"] else f"configure failed: {result['error'] or result['actions']}")
+        return updated + self._rescore(repo)
+
+    def _on_push(self, payload: Dict, repo: Dict) -> List[str]:
+        repo = self._store_repo(repo)
+        if payload.get("ref") != f"refs/heads/{repo.get('default_branch')}":
+            return ["repository"]
+
+        commits = payload.get("commits") or []
+        added = {path for commit in commits for path in commit.get("added") or []}
+        removed = {path for commit in commits for path in commit.get("removed") or []}
+        touched = added | removed | {path for commit in commits for path in commit.get("modified") or []}
+        invalidate = set()
+        if any(os.path.dirname(path) in ("", "docs", ".github") and
+               os.path.basename(path).lower().startswith("readme") for path in touched):
+            invalidate.add("readme")
+        if any(path.startswith(".github/workflows/") for path in touched):
+            invalidate.add("workflows")
+        if added or removed:
+            invalidate.add("languages")
+        recent = [{"sha": commit["id"], "commit": {
+            "message": commit.get("message"),
+            "author": {"name": (commit.get("author") or {}).get("name"),
+                       "email": (commit.get("author") or {}).get("email"),
+                       "date": commit.get("timestamp")}}} for commit in reversed(commits)]
+        return ["repository"] + self._rescore(repo, invalidate, recent)
+
+    def _on_issues(self, payload: Dict, repo: Dict) -> List[str]:
+        self._store_repo(repo)
+        issue = payload["issue"]
+        if payload.get("action") == "deleted":
+            self.mirror.remove_issue(repo["name"], issue["number"])
+            return [f"issue #{issue['number']} removed"]
+        self.mirror.upsert_issues(repo["name"], [issue])
+        return [f"issue #{issue['number']}"]
+
+    def _on_pull_request(self, payload: Dict, repo: Dict) -> List[str]:
+        self._store_repo(repo)
+        issue = pull_request_issue(payload["pull_request"])
+        self.mirror.upsert_issues(repo["name"], [issue])
+        return [f"pull request #{issue['number']}"]
+
+    def _rescore(self, repo: Dict, invalidate: Iterable[str] = (), recent_commits: List[Dict] = None) -> List[str]:
+        """Re-score health from the stored stats, dropping what the event invalidated."""
+        stored = self.mirror.get_health(repo["name"])
+        stats = dict(stored["stats"]) if stored else {}
+        has_readme = stats.pop("has_readme", None)
+        for key in invalidate:
+            stats.pop(key, None)
+        stats["basic"] = dict(repo)
+        if has_readme is not None and "readme" not in invalidate:
+            stats["basic"]["has_readme"] = has_readme
+        if recent_commits:
+            stats["recent_commits"] = (recent_commits + stats.get("recent_commits", []))[:10]
+
+        health = self.manager.analyze_repository_health(repo["name"], stats)
+        # The repository record lives in the mirror already and README bodies are not needed again
+        kept = {key: value for key, value in health["stats"].items() if key not in ("basic", "readme")}
+        kept["has_readme"] = health["stats"]["basic"].get("has_readme")
+        self.mirror.store_health(repo["name"], dict(health, stats=kept))
+        return [f"health {health['health_score']}"]
+
+    def _refresh_backup(self, force: bool = False) -> None:
+        """Snapshot the mirrored repositories if something changed and the interval has passed."""
+        if self.backup is None or not self._dirty:
+            return
+        if not force and time.monotonic() - self._last_backup < self.backup_interval:
+            return
+        response = self.manager._request("GET", "/user")
+        if response.status_code != 200:
+            print(f"⚠️  Backup postponed: failed to fetch profile ({response.status_code})")
+            return
+        self._dirty = False
+        self._last_backup = time.monotonic()
+        summary = self.backup.create(response.json(), self.mirror.iter_repositories())
+        print(f"📦 Snapshot {summary['snapshot']}: {summary['written']} records written, "
+              f"{summary['unchanged']} unchanged")
+
+    def _work(self) -> None:
+        """Apply queued deliveries in order until stop() queues None."""
+        import queue
+
+        while True:
+            try:
+                item = self._queue.get(timeout=self.backup_interval if self.backup is not None else None)
+            except queue.Empty:
+                self._refresh_backup()
+                continue
+            if item is None:
+                break
+            event, payload = item
+            try:
+                summary = self.apply(event, payload)
+                action = f".{summary['action']}" if summary["action"] else ""
+                print(f"📬 {event}{action} {summary['repo'] or ''}: {', '.join(summary['updated']) or 'no changes'}")
+            except Exception as e:
+                print(f"⚠️  Failed to apply {event} delivery: {e}")
+            self._refresh_backup()
+        self._refresh_backup(force=True)
+
+    def listen(self, address: Union[str, Tuple[str, int]] = DEFAULT_WEBHOOK_ADDRESS) -> Tuple[str, int]:
+        """Bind the HTTP endpoint and start the worker; returns the bound (host, port).
+
+        GitHub must be able to reach the address (directly, through a reverse proxy or a tunnel).
+        """
+        import socket
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        if not self.secret:
+            raise ValueError("a webhook secret is required to accept deliveries")
+        address = parse_rpc_address(address)
+        if not isinstance(address, tuple):
+            raise ValueError(f"expected HOST:PORT, got {address!r}")
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > receiver.MAX_BODY:
+                    status, reply = 413, {"error": "payload too large"}
+                    self.close_connection = True
+                else:
+                    status, reply = receiver.deliver(self.headers.get("X-GitHub-Event", ""), self.rfile.read(length),
+                                                     self.headers.get("X-Hub-Signature-256"),
+                                                     self.headers.get("X-GitHub-Delivery"))
+                body = json.dumps(reply).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server_class = type("Server", (ThreadingHTTPServer,), {"daemon_threads": True})
+        if ":" in address[0]:
+            server_class.address_family = socket.AF_INET6
+        self.server = server_class(address, Handler)
+        self._worker = threading.Thread(target=self._work, name="webhook-worker", daemon=True)
+        self._worker.start()
+        return self.server.server_address[:2]
+
+    def serve_forever(self) -> None:
+        """Accept deliveries until shutdown() is called from another thread (or the process is interrupted)."""
+        self.server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop serve_forever()."""
+        self.server.shutdown()
+
+    def close(self) -> None:
+        """Release the socket, finish queued deliveries and write a final backup if needed."""
+        if self.server is not None:
+            self.server.server_close()
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+
+def write_health_report(rows: List[Dict], output: str) -> None:
+    """Write health report rows as CSV (for .csv paths) or JSON."""
+    if str(output).lower().endswith(".csv"):
+        with open(output, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["repo", "health_score", "failed_rules", "recommendations"])
+            for row in rows:
+                writer.writerow([row["repo"], row["health_score"], ";".join(row["failed_rules"]),
+                                 "; ".join(row["recommendations"])])
+    else:
+        with open(output, "w") as f:
+            json.dump(rows, f, indent=2)
+
+def _chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Group an iterable into lists of at most size items."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def compact_stats(stats: Dict) -> Dict:
+    """Replace the raw objects in a repository stats dict with compact projections.
+
+    basic becomes a Repo record, recent_commits Commit records and contributors
+    {"login", "contributions"} dicts; languages and workflows are already small.
+    """
+    compact = dict(stats)
+    if stats.get("basic"):
+        compact["basic"] = Repo.from_api(stats["basic"])
+    if "recent_commits" in stats:
+        compact["recent_commits"] = [Commit.from_api(commit) for commit in stats["recent_commits"]]
+    if "contributors" in stats:
+        compact["contributors"] = [{"login": _login(contributor), "contributions": contributor.get("contributions")}
+                                   for contributor in stats["contributors"]]
+    return compact
+
+def git_blob_sha(data: bytes) -> str:
+    """Compute the git blob SHA-1 GitHub reports for file content."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+def _normalize_topics(topics: Optional[List[str]]) -> List[str]:
+    """Topics as GitHub stores them: lowercase and order-insensitive."""
+    return sorted(topic.lower() for topic in topics or [])
+
+def _issue_title_key(title: str) -> str:
+    """Issue title normalized for duplicate detection (case and whitespace-insensitive)."""
+    return " ".join(title.split()).casefold()
+
+def _issue_changes(issue: Dict, record: Dict) -> Dict:
+    """Fields of an import record that differ from the existing issue (only fields the record sets)."""
+    changes = {}
+    if record.get("number") and record.get("title") and record["title"] != issue["title"]:
+        changes["title"] = record["title"]
+    if record.get("body") and record["body"] != (issue.get("body") or ""):
+        changes["body"] = record["body"]
+    if record.get("state") and record["state"] != issue["state"]:
+        changes["state"] = record["state"]
+    if record.get("labels") and _normalize_topics(record["labels"]) != _normalize_topics(
+            [label if isinstance(label, str) else label["name"] for label in issue.get("labels") or []]):
+        changes["labels"] = record["labels"]
+    return changes
+
+def read_issue_records(path: Union[str, Path]) -> Iterator[Dict]:
+    """Stream issue records from a JSONL file, or a CSV file with a header row for .csv paths.
+
+    In CSV files labels and assignees are ";"-separated and empty cells are ignored.
+    """
+    path = Path(path)
+    with open(path, newline="") as f:
+        if path.suffix.lower() == ".csv":
+            for row in csv.DictReader(f):
+                record = {field: value for field, value in row.items() if field and value}
+                for field in ("labels", "assignees"):
+                    if field in record:
+                        record[field] = [item.strip() for item in record[field].split(";") if item.strip()]
+                yield record
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def print_plan(plan: Iterable[Dict]) -> int:
+    """Print a reconciliation plan and return the number of writes it would issue."""
+    writes = 0
+    for entry in plan:
+        if entry["missing"]:
+            print(f"⚠️  {entry['repo']}: repository not found")
+            continue
+        changes = entry["changes"]
+        if not changes:
+            continue
+
+        print(f"\n📝 {entry['repo']}")
+        for field, change in changes.items():
+            print(f"  - {field}: {change['old']!r}")
+            print(f"  + {field}: {change['new']!r}")
+        writes += any(field in changes for field in ("description", "homepage")) + ("topics" in changes)
+
+    print(f"\n📊 Plan: {writes} write call(s) needed")
+    return writes
+
+def _is_retryable(result: Dict) -> bool:
+    """Whether a failed bulk result may succeed on retry (network error, rate limit or 5xx)."""
+    if result["error"]:
+        return True
+    return any(status in (403, 429) or status >= 500 for status in result["actions"].values())
+
+def print_bulk_report(results: List[Dict]) -> None:
+    """Print a per-repo summary of bulk operation results."""
+    for result in results:
+        actions = ", ".join(f"{action}={status}" for action, status in result["actions"].items())
+        if result["ok"]:
+            print(f"✅ {result['repo']}: {actions or 'already up to date'}")
+        elif result["error"]:
+            print(f"❌ {result['repo']}: {result['error']}")
+        else:
+            print(f"⚠️  {result['repo']}: {actions}")
+
+    succeeded = sum(1 for result in results if result["ok"])
+    print(f"\n📊 {succeeded}/{len(results)} repositories updated successfully")
+
+def print_issue_import_report(results: List[Dict]) -> None:
+    """Print failed records and per-action counts of an issue import."""
+    counts: Dict[str, int] = {}
+    for result in results:
+        if result["ok"]:
+            counts[result["action"]] = counts.get(result["action"], 0) + 1
+        else:
+            print(f"❌ line {result['line']} ({result['repo']}: {result['title']}): "
+                  f"{result['error'] or result['action'] + ' failed'}")
+
+    summary = ", ".join(f"{count} {action}" for action, count in sorted(counts.items()))
+    print(f"\n📊 {sum(counts.values())}/{len(results)} issue records applied ({summary or 'none'})")
+
+def print_token_pool(pool: TokenPool) -> None:
+    """Print the remaining quota of every token in a pool."""
+    print(f"\n🔑 Token pool ({len(pool.tokens)} tokens):")
+    for entry in pool.status():
+        roles = ", ".join(role for role in ("primary", "writes") if entry[role])
+        quotas = ", ".join(f"{resource} {quota['remaining']}/{quota['limit']}"
+                           for resource, quota in entry["resources"].items()) or "unused"
+        print(f"  • {entry['token']}{f' ({roles})' if roles else ''}: {quotas}")
+
+def print_trace_event(event: Dict) -> None:
+    """Tracing hook printing one line per request."""
+    status = event["status"] or event["error"]
+    extras = "".join(f" {name}={event[name]}" for name in ("cache", "retries") if event[name])
+    print(f"  ↪ {event['method']} {event['url']} -> {status} in {event['seconds'] * 1000:.0f} ms "
+          f"({event['bytes_in']} B){extras}")
+
+def get_repository_descriptions(config_path: Union[str, Path] = None) -> Dict[str, str]:
+    """Get the improved repository descriptions from the repository manifest."""
+    return load_repo_config(config_path).descriptions()
 
 def main():
     parser = argparse.ArgumentParser(description="Ultimate GitHub Manager Tool for AI Agents")
@@ -622,61 +4822,230 @@ def main():
     parser.add_argument("--setup-features", action="store_true", help="Set up repository topics and homepages")
     parser.add_argument("--professional-setup", action="store_true", help="Complete professional setup (descriptions + features)")
     parser.add_argument("--backup-profile", action="store_true", help="Backup current profile data")
+    parser.add_argument("--backup-incremental", nargs="?", const=str(DEFAULT_BACKUP_DIR), metavar="DIR",
+                        help=f"Incremental snapshot backup (default: {DEFAULT_BACKUP_DIR})")
+    parser.add_argument("--backup-gzip", action="store_true", help="Gzip records written by --backup-incremental")
+    parser.add_argument("--list-backups", nargs="?", const=str(DEFAULT_BACKUP_DIR), metavar="DIR",
+                        help="List incremental backup snapshots")
+    parser.add_argument("--restore-backup", nargs=2, metavar=("SNAPSHOT", "OUTPUT"),
+                        help="Restore a snapshot (or 'latest') to a JSON file")
+    parser.add_argument("--diff-backups", nargs=2, metavar=("OLD", "NEW"), help="Diff two backup snapshots")
+    parser.add_argument("--backup-dir", default=str(DEFAULT_BACKUP_DIR), metavar="DIR",
+                        help="Backup directory used by --restore-backup and --diff-backups")
     parser.add_argument("--update-profile", action="store_true", help="Update profile README")
     parser.add_argument("--list-repos", action="store_true", help="List current repositories")
+    parser.add_argument("--list-issues", metavar="REPO", help="List issues of a repository")
+    parser.add_argument("--state", default="open", choices=["open", "closed", "all"], help="Issue state for --list-issues")
+    parser.add_argument("--labels", metavar="LABELS", help="Comma-separated labels an issue must have (--list-issues)")
+    parser.add_argument("--mirror", nargs="?", const=str(DEFAULT_MIRROR_PATH), metavar="PATH",
+                        help=f"Local SQLite mirror used by --sync and --offline (default: {DEFAULT_MIRROR_PATH})")
+    parser.add_argument("--sync", action="store_true", help="Incrementally sync repositories, issues and PRs into the mirror")
+    parser.add_argument("--full-sync", action="store_true", help="Rebuild the mirror from scratch")
+    parser.add_argument("--offline", action="store_true",
+                        help="Answer --list-repos, --list-issues and --search-repos from the mirror without network access")
 
     # New advanced features
     parser.add_argument("--create-repo", nargs=2, metavar=("NAME", "DESCRIPTION"), help="Create new repository")
     parser.add_argument("--create-issue", nargs=3, metavar=("REPO", "TITLE", "BODY"), help="Create issue in repository")
+    parser.add_argument("--import-issues", metavar="FILE",
+                        help="Create or update issues from a JSONL or CSV file (existing titles are not duplicated)")
+    parser.add_argument("--issue-repo", metavar="REPO", help="Repository for imported records that do not name one")
+    parser.add_argument("--import-checkpoint", metavar="PATH",
+                        help="Checkpoint file for resuming an interrupted --import-issues (default: FILE.checkpoint)")
     parser.add_argument("--create-pr", nargs=4, metavar=("REPO", "TITLE", "HEAD", "BASE"), help="Create pull request")
+    parser.add_argument("--commit-files", nargs="+", metavar=("REPO", "FILE"),
+                        help="Commit local files (at the same relative paths) to a repository in one commit")
+    parser.add_argument("--message", default="Update files via GitHub Manager", help="Commit message for --commit-files")
+    parser.add_argument("--branch", metavar="BRANCH", help="Branch for --commit-files (default: repository default)")
     parser.add_argument("--setup-ci", nargs=2, metavar=("REPO", "LANGUAGE"), help="Setup CI/CD workflow")
-    parser.add_argument("--analyze-health", nargs=1, metavar="REPO", help="Analyze repository health")
+    parser.add_argument("--rollout-ci", nargs="*", metavar="REPO",
+                        help="Commit a CI workflow rendered from workflow_templates/ to the given repos (default: all)")
+    parser.add_argument("--workflow-template", metavar="NAME",
+                        help="Template for --rollout-ci (default: detected from each repository's languages)")
+    parser.add_argument("--workflow-templates", metavar="DIR",
+                        help="Workflow template directory (default: $GITHUB_WORKFLOW_TEMPLATES or workflow_templates/)")
+    parser.add_argument("--analyze-health", nargs="+", metavar="REPO",
+                        help="Analyze repository health (several repos are fetched in one GraphQL batch)")
+    parser.add_argument("--analyze-all", nargs="?", const=DEFAULT_HEALTH_REPORT, metavar="REPORT",
+                        help=f"Score every repository and write a ranked .json/.csv report (default: {DEFAULT_HEALTH_REPORT})")
     parser.add_argument("--bulk-update", action="store_true", help="Bulk update all repositories professionally")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted --bulk-update/--professional-setup, skipping finished repositories")
+    parser.add_argument("--job-queue", default=str(DEFAULT_JOB_QUEUE_PATH), metavar="PATH",
+                        help=f"Job queue recording bulk progress for --resume (default: {DEFAULT_JOB_QUEUE_PATH})")
     parser.add_argument("--search-repos", nargs=1, metavar="QUERY", help="Search repositories")
+    parser.add_argument("--config", metavar="PATH",
+                        help="Repository manifest (YAML/JSON) with descriptions, topics and homepages "
+                             "(default: $GITHUB_REPO_CONFIG or repositories.yaml)")
+    parser.add_argument("--plan", action="store_true",
+                        help="Dry run: show the description/homepage/topic changes a bulk update would make")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="Process repositories concurrently in bulk operations (default: 1)")
+    parser.add_argument("--write-interval", type=float, metavar="SECONDS",
+                        help="Minimum delay between write requests to respect secondary rate limits "
+                             f"(default: {CONCURRENT_WRITE_INTERVAL} with --workers > 1, otherwise 0)")
+    parser.add_argument("--cache", nargs="?", const=str(DEFAULT_CACHE_PATH), metavar="PATH",
+                        help=f"Cache GET responses on disk with conditional requests (default: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--stats", action="store_true",
+                        help="Print per-endpoint latency, bytes, retries, cache and rate-limit stats at the end")
+    parser.add_argument("--stats-file", metavar="PATH",
+                        help="Write request metrics to PATH (.json for JSON, anything else for Prometheus text)")
+    parser.add_argument("--trace", action="store_true", help="Print one line per API request")
+    parser.add_argument("--cache-ttl", type=float, default=86400, metavar="SECONDS",
+                        help="Seconds cached responses are kept (default: 86400)")
+    parser.add_argument("--no-memo", action="store_true",
+                        help="Send every GET even when an identical one was already answered in this run")
+    parser.add_argument("--memo-ttl", type=float, metavar="SECONDS",
+                        help=f"Seconds an identical GET is answered from memory (default: whole run; "
+                             f"{SERVE_MEMO_TTL} with --serve)")
+    parser.add_argument("--serve", nargs="?", const=str(DEFAULT_RPC_SOCKET), metavar="ADDRESS",
+                        help=f"Keep a warm manager running and serve its operations as JSON-RPC on a Unix socket "
+                             f"PATH or loopback HOST:PORT (default: {DEFAULT_RPC_SOCKET})")
+    parser.add_argument("--call", metavar="METHOD", help="Call METHOD on a running --serve process and print the result")
+    parser.add_argument("--params", default="{}", metavar="JSON",
+                        help="Arguments for --call as a JSON object (keyword) or array (positional)")
+    parser.add_argument("--connect", default=str(DEFAULT_RPC_SOCKET), metavar="ADDRESS",
+                        help=f"Address of the --serve process for --call (default: {DEFAULT_RPC_SOCKET})")
+    parser.add_argument("--rpc-token-file", default=str(DEFAULT_RPC_TOKEN_FILE), metavar="PATH",
+                        help=f"Owner-only file with the secret shared by --serve and --call, created by --serve "
+                             f"if missing (default: {DEFAULT_RPC_TOKEN_FILE})")
+    parser.add_argument("--webhook", nargs="?", const=DEFAULT_WEBHOOK_ADDRESS, metavar="HOST:PORT",
+                        help=f"Receive GitHub webhooks and apply them to the mirror (default: {DEFAULT_WEBHOOK_ADDRESS})")
+    parser.add_argument("--webhook-secret", metavar="SECRET",
+                        help="Webhook secret configured on GitHub (default: $GITHUB_WEBHOOK_SECRET)")
+    parser.add_argument("--webhook-record", metavar="PATH", help="Append verified webhook deliveries to a JSONL file")
+    parser.add_argument("--replay-webhooks", metavar="PATH",
+                        help="Apply recorded webhook deliveries (see --webhook-record) to the mirror")
+    parser.add_argument("--webhook-apply-config", action="store_true",
+                        help="Apply manifest descriptions, homepages and topics to created or edited repositories")
+    parser.add_argument("--webhook-backup", nargs="?", const=str(DEFAULT_BACKUP_DIR), metavar="DIR",
+                        help=f"Refresh an incremental backup after webhook changes (default: {DEFAULT_BACKUP_DIR})")
+    parser.add_argument("--backup-interval", type=float, default=300, metavar="SECONDS",
+                        help="Minimum seconds between --webhook-backup snapshots (default: 300)")
 
     args = parser.parse_args()
 
+    # Calls into a running server need no token, dotenv or warm-up of their own
+    if args.call:
+        try:
+            client = ManagerClient(args.connect, token_file=args.rpc_token_file)
+        except (OSError, ValueError) as e:
+            print(f"❌ Cannot read the server token: {e}")
+            sys.exit(1)
+        params = json.loads(args.params)
+        try:
+            result = client.call(args.call, *params) if isinstance(params, list) else client.call(args.call, **params)
+        except RemoteError as e:
+            print(f"❌ {args.call} failed: {e}")
+            sys.exit(1)
+        finally:
+            client.close()
+        print(json.dumps(result, indent=2))
+        return
+
+    _load_env()
+
+    # Offline backup commands need no token or network access
+    if args.list_backups or args.restore_backup or args.diff_backups:
+        store = ProfileBackup(args.list_backups or args.backup_dir)
+        snapshots = store.snapshots()
+
+        def resolve(snapshot: str) -> str:
+            return snapshots[-1] if snapshot == "latest" and snapshots else snapshot
+
+        if args.list_backups:
+            print(f"\n🗂️ Snapshots in {store.directory}:")
+            for snapshot in snapshots:
+                print(f"  • {snapshot}")
+        if args.restore_backup:
+            snapshot, output = args.restore_backup
+            print(f"✅ Restored snapshot to {store.restore(resolve(snapshot), output)}")
+        if args.diff_backups:
+            print(json.dumps(store.diff(*map(resolve, args.diff_backups)), indent=2))
+        return
+
     # Check if any action was specified
     basic_actions = [args.update_descriptions, args.setup_features, args.professional_setup,
-                    args.backup_profile, args.update_profile, args.list_repos]
-    advanced_actions = [args.create_repo, args.create_issue, args.create_pr, args.setup_ci,
-                       args.analyze_health, args.bulk_update, args.search_repos]
+                    args.backup_profile, args.backup_incremental, args.update_profile, args.list_repos,
+                    args.list_issues, args.sync, args.full_sync, args.serve, args.webhook, args.replay_webhooks]
+    advanced_actions = [args.create_repo, args.create_issue, args.import_issues, args.create_pr, args.commit_files,
+                       args.setup_ci, args.rollout_ci is not None, args.analyze_health, args.analyze_all, args.bulk_update, args.search_repos, args.plan]
 
     if not any(basic_actions + advanced_actions):
         parser.print_help()
         return
 
+    # A dry run must never be combined with anything that writes to GitHub
+    write_flags = {"--update-descriptions": args.update_descriptions, "--setup-features": args.setup_features,
+                   "--professional-setup": args.professional_setup, "--update-profile": args.update_profile,
+                   "--create-repo": args.create_repo, "--create-issue": args.create_issue,
+                   "--import-issues": args.import_issues, "--create-pr": args.create_pr,
+                   "--commit-files": args.commit_files, "--setup-ci": args.setup_ci,
+                   "--rollout-ci": args.rollout_ci is not None, "--bulk-update": args.bulk_update,
+                   "--serve": args.serve, "--webhook-apply-config": args.webhook_apply_config}
+    if args.plan and any(write_flags.values()):
+        parser.error(f"--plan is a dry run and cannot be combined with "
+                     f"{', '.join(flag for flag, value in write_flags.items() if value)}")
+
+    manager = None
     try:
-        manager = GitHubManager()
+        cache = ResponseCache(args.cache, ttl=args.cache_ttl) if args.cache else None
+        use_mirror = (args.mirror or args.sync or args.full_sync or args.offline or args.webhook
+                      or args.replay_webhooks)
+        mirror = LocalMirror(args.mirror or DEFAULT_MIRROR_PATH) if use_mirror else None
+        write_interval = args.write_interval
+        if write_interval is None:
+            # Concurrent writers burst past GitHub's secondary limits unless they are spaced out
+            write_interval = CONCURRENT_WRITE_INTERVAL if args.workers > 1 else 0.0
+        manager = GitHubManager(pool_size=max(10, args.workers), write_interval=write_interval,
+                                cache=cache, repo_config_path=args.config, mirror=mirror, offline=args.offline,
+                                memo=None if args.no_memo else RequestMemo(
+                                    ttl=args.memo_ttl if args.memo_ttl is not None or not args.serve
+                                    else SERVE_MEMO_TTL))
+        if args.trace:
+            manager.metrics.add_hook(print_trace_event)
+
+        if args.sync or args.full_sync:
+            if args.offline:
+                parser.error("--sync needs network access; drop --offline")
+            manager.sync_mirror(full=args.full_sync, workers=max(args.workers, 4))
+
+        if args.plan:
+            print(f"\n🧭 Planning repository changes for {manager.username}...")
+            print_plan(manager.iter_plan(manager.iter_repositories(prefetch=True, compact=True)))
 
         if args.list_repos:
             print(f"\n📋 Repositories for {manager.username}:")
-            response = requests.get(f"{manager.base_url}/user/repos", headers=manager.headers)
-            repos = response.json()
-            for repo in repos[:10]:  # Show first 10
+            for repo in itertools.islice(manager.iter_repositories(compact=True), 10):  # Show first 10
                 print(f"  • {repo['name']}: {repo['description'] or 'No description'}")
 
+        if args.list_issues:
+            print(f"\n📋 {args.state.capitalize()} issues in {args.list_issues}:")
+            for issue in manager.iter_issues(args.list_issues, state=args.state, labels=args.labels, compact=True):
+                kind = "PR" if "pull_request" in issue else "issue"
+                print(f"  • #{issue['number']} [{issue['state']} {kind}] {issue['title']}")
+
         if args.backup_profile:
             manager.backup_profile_data()
 
+        if args.backup_incremental:
+            manager.backup_profile_incremental(args.backup_incremental, compress=args.backup_gzip)
+
         if args.update_descriptions:
-            descriptions = get_repository_descriptions()
+            descriptions = get_repository_descriptions(args.config)
             manager.update_repository_descriptions(descriptions)
 
         if args.setup_features:
             print("\n🏷️ Setting up repository features...")
-            descriptions = get_repository_descriptions()
-            for repo_name in descriptions.keys():
-                manager.setup_repository_features(repo_name)
+            descriptions = get_repository_descriptions(args.config)
+            manager.setup_repositories_features(descriptions.keys())
 
         if args.professional_setup:
             print("\n🎯 Running complete professional repository setup...")
-            descriptions = get_repository_descriptions()
-            manager.update_repository_descriptions(descriptions)
-
-            print("\n🏷️ Setting up repository features...")
-            for repo_name in descriptions.keys():
-                manager.setup_repository_features(repo_name)
+            descriptions = get_repository_descriptions(args.config)
+            with closing(JobQueue(args.job_queue)) as jobs:
+                manager.setup_repositories_professional(list(descriptions.keys()), workers=args.workers,
+                                                        jobs=jobs, resume=args.resume)
 
             print("\n✅ Professional setup complete!")
             print("📋 Review your repositories at: https://github.com/Victor-Dixon")
@@ -700,36 +5069,105 @@ def main():
             repo, title, body = args.create_issue
             manager.create_issue(repo, title, body)
 
+        if args.import_issues:
+            manager.import_issues(read_issue_records(args.import_issues), repo_name=args.issue_repo,
+                                  workers=args.workers,
+                                  checkpoint=args.import_checkpoint or f"{args.import_issues}.checkpoint")
+
         if args.create_pr:
             repo, title, head, base = args.create_pr
             manager.create_pull_request(repo, title, head, base)
 
+        if args.commit_files:
+            repo, *paths = args.commit_files
+            if not paths:
+                parser.error("--commit-files needs a repository and at least one file")
+            files = {Path(path).as_posix(): Path(path).read_bytes() for path in paths}
+            manager.commit_files(repo, files, args.message, branch=args.branch)
+
         if args.setup_ci:
             repo, language = args.setup_ci
             manager.setup_basic_ci_cd(repo, language)
 
+        if args.rollout_ci is not None:
+            manager.rollout_ci(args.rollout_ci or None, workers=max(args.workers, 4), template=args.workflow_template,
+                               templates_dir=args.workflow_templates)
+
         if args.analyze_health:
-            repo = args.analyze_health[0]
-            health_data = manager.analyze_repository_health(repo)
-            print(f"\n🏥 Health Score for {repo}: {health_data['health_score']}/100")
-            print("\n📋 Recommendations:")
-            for rec in health_data['recommendations']:
-                print(f"  • {rec}")
+            health_results = manager.analyze_repositories_health(args.analyze_health, workers=args.workers)
+            for repo, health_data in health_results.items():
+                print(f"\n🏥 Health Score for {repo}: {health_data['health_score']}/100")
+                print("\n📋 Recommendations:")
+                for rec in health_data['recommendations']:
+                    print(f"  • {rec}")
+
+        if args.analyze_all:
+            manager.analyze_all_repositories(args.analyze_all, workers=max(args.workers, 4))
 
         if args.bulk_update:
-            manager.setup_all_repositories_professional()
+            with closing(JobQueue(args.job_queue)) as jobs:
+                manager.setup_all_repositories_professional(workers=args.workers, jobs=jobs, resume=args.resume)
 
         if args.search_repos:
             query = args.search_repos[0]
             results = manager.search_repositories(query)
-            print(f"\n🔍 Search results for '{query}':")
-            for repo in results[:5]:  # Show top 5
+            print(f"\n🔍 Search results for '{query}' ({len(results)} matches):")
+            for repo in results[:10]:  # Show top 10
                 print(f"  • {repo['name']}: {repo['description'] or 'No description'}")
 
+        if args.webhook or args.replay_webhooks:
+            receiver = WebhookReceiver(manager, args.webhook_secret or os.getenv("GITHUB_WEBHOOK_SECRET"),
+                                       apply_config=args.webhook_apply_config, backup_dir=args.webhook_backup,
+                                       backup_interval=args.backup_interval, compress=args.backup_gzip,
+                                       record=args.webhook_record)
+            if args.replay_webhooks:
+                summaries = receiver.replay(args.replay_webhooks)
+                changed = sum(1 for summary in summaries if summary["updated"])
+                print(f"\n📼 Replayed {len(summaries)} webhook deliveries ({changed} changed the mirror)")
+            if args.webhook:
+                host, port = receiver.listen(args.webhook)
+                print(f"\n📡 Receiving GitHub webhooks on http://{host}:{port}/ (Ctrl+C to stop)")
+                try:
+                    receiver.serve_forever()
+                except KeyboardInterrupt:
+                    counts = ", ".join(f"{count} {event}" for event, count in sorted(receiver.counts.items()))
+                    print(f"\n👋 Webhook receiver stopped ({counts or 'no deliveries'}).")
+                finally:
+                    receiver.close()
+
+        if args.serve:
+            server = ManagerServer(manager, args.serve, token_file=args.rpc_token_file)
+            address = server.address if isinstance(server.address, str) else "%s:%d" % server.address
+            print(f"\n🛰️ Serving GitHub Manager for {manager.username} on {address} (Ctrl+C to stop)")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                print(f"\n👋 Server stopped after {server.calls} calls.")
+            finally:
+                server.close()
+
+        if manager.cache is not None:
+            cache_stats = manager.cache.stats()
+            print(f"\n💾 Cache: {cache_stats['hits']} hits, {cache_stats['revalidated']} revalidated (304), "
+                  f"{cache_stats['misses']} misses - {cache_stats['quota_saved']} requests of quota saved")
+        if manager.memo is not None and manager.memo.hits + manager.memo.coalesced:
+            memo_stats = manager.memo.stats()
+            print(f"\n🧠 Memo: {memo_stats['hits']} repeated and {memo_stats['coalesced']} concurrent identical "
+                  f"GETs shared - {memo_stats['requests_saved']} requests saved")
+
     except KeyboardInterrupt:
         print("\n\n👋 Operation cancelled by user.")
     except Exception as e:
         print(f"\n❌ Error: {e}")
 
+    # Reported even after a failure or interruption, when they are most useful
+    if manager is not None:
+        if args.stats:
+            manager.metrics.print_summary()
+            if manager.token_pool is not None:
+                print_token_pool(manager.token_pool)
+        if args.stats_file:
+            print(f"📈 Request metrics written to {manager.metrics.write(args.stats_file)}")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,403 @@
+"""Regression tests for github_manager (run with: python -m pytest test_github_manager.py)."""
+
+import asyncio
+import sys
+import threading
+
+import pytest
+
+import github_manager as gm
+
+
+REPOS = [
+    {"name": "alpha", "full_name": "octo/alpha", "owner": {"login": "octo"}, "description": "First",
+     "private": False, "stargazers_count": 3, "topics": ["python"], "updated_at": "2026-01-02T00:00:00Z",
+     "pushed_at": "2026-01-02T00:00:00Z"},
+    {"name": "beta", "full_name": "octo/beta", "owner": {"login": "octo"}, "description": None,
+     "private": True, "stargazers_count": 0, "topics": [], "updated_at": "2026-01-01T00:00:00Z",
+     "pushed_at": "2026-01-01T00:00:00Z"},
+]
+
+
+def _mirror(tmp_path):
+    mirror = gm.LocalMirror(tmp_path / "mirror.sqlite")
+    mirror.upsert_repos(REPOS)
+    return mirror
+
+
+def test_offline_listing_needs_no_token(tmp_path, monkeypatch):
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.delenv("GITHUB_TOKENS", raising=False)
+    manager = gm.GitHubManager(mirror=_mirror(tmp_path), offline=True, username_cache=None)
+
+    assert manager.token is None
+    assert manager.username == "octo"
+    assert [repo["name"] for repo in manager.list_repositories()] == ["alpha", "beta"]
+    assert [repo["name"] for repo in manager.list_repositories(compact=True)] == ["alpha", "beta"]
+
+
+def test_offline_cli_listing_without_token(tmp_path, monkeypatch, capsys):
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.delenv("GITHUB_TOKENS", raising=False)
+    path = tmp_path / "mirror.sqlite"
+    _mirror(tmp_path).close()
+    monkeypatch.setattr(sys, "argv", ["github_manager.py", "--offline", "--mirror", str(path), "--list-repos"])
+
+    gm.main()
+
+    output = capsys.readouterr().out
+    assert "Error" not in output
+    assert "alpha: First" in output
+
+
+def test_token_fingerprint_without_token():
+    assert gm.token_fingerprint(None) == gm.token_fingerprint("") == "anonymous"
+    assert gm.token_fingerprint("secret") != "anonymous"
+
+
+def test_async_manager_constructs():
+    pytest.importorskip("httpx")
+    scheduler = gm.RateLimitScheduler()
+
+    async def build():
+        shared = gm.AsyncGitHubManager(token="token", username="octo", rate_limiter=scheduler)
+        default = gm.AsyncGitHubManager(token="token")
+        await shared.close()
+        await default.close()
+        return shared, default
+
+    shared, default = asyncio.run(build())
+    assert shared.rate_limiter is scheduler
+    assert shared.headers["Authorization"] == "token token"
+    assert isinstance(default.rate_limiter, gm.RateLimitScheduler)
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+def test_rate_limit_paces_only_below_low_water(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(gm.time, "time", clock.time)
+    bucket = gm.RateLimitBucket("core", burst=100)
+    reset = clock.now + 3600
+
+    bucket.update(5000, 5000, reset)
+    assert all(bucket.reserve() == 0 for _ in range(1000))
+
+    bucket.update(5000, 400, reset)
+    assert all(bucket.reserve() == 0 for _ in range(100))
+    delay = bucket.reserve()
+    assert delay == pytest.approx(3600 / 400)
+
+    clock.now += delay
+    assert bucket.reserve() == pytest.approx(3600 / 400)
+
+    clock.now = reset
+    assert bucket.reserve() == 0
+    assert bucket.remaining == 4999
+
+
+def test_repo_config_rule_precedence():
+    config = gm.RepoConfig({
+        "defaults": {"homepage": "https://example.com"},
+        "repositories": {"api-core": {"description": "Core API"}},
+        "rules": [
+            {"match": "api-legacy", "topics": ["legacy"]},
+            {"match": "api-*", "topics": ["api"]},
+            {"match": "*-docs", "topics": ["docs"]},
+            {"regex": r"(?i)web-\d+", "topics": ["web"]},
+            {"match": "api-[ab]?", "topics": ["unreachable"]},
+            {"match": "*", "topics": ["misc"]},
+            {"match": "tools", "topics": ["shadowed"]},
+        ],
+    })
+
+    assert config.resolve("api-legacy")["topics"] == ["legacy"]
+    assert config.resolve("api-a1")["topics"] == ["api"]
+    assert config.resolve("api-docs")["topics"] == ["api"]
+    assert config.resolve("site-docs")["topics"] == ["docs"]
+    assert config.resolve("WEB-42")["topics"] == ["web"]
+    assert config.resolve("tools")["topics"] == ["misc"]
+    assert config.resolve("docs")["topics"] == ["misc"]
+    assert config.resolve("api-core") == {"description": "Core API", "topics": ["api"],
+                                          "homepage": "https://example.com"}
+
+
+def test_repo_config_many_rules():
+    rules = [{"match": f"svc{i}-*", "topics": [f"svc{i}"]} for i in range(2000)]
+    rules += [{"match": f"*-lib{i}", "topics": [f"lib{i}"]} for i in range(2000)]
+    config = gm.RepoConfig({"rules": rules})
+
+    assert config.resolve("svc1999-api")["topics"] == ["svc1999"]
+    assert config.resolve("core-lib17")["topics"] == ["lib17"]
+    assert config.resolve("svc12-lib3")["topics"] == ["svc12"]
+    assert config.resolve("other")["topics"] is None
+
+
+@pytest.fixture
+def fake_github():
+    bench = pytest.importorskip("benchmark_github_manager")
+    server = bench.FakeGitHubServer({"size": 5, "fixtures": None, "latency_ms": 0, "jitter_ms": 0, "page_size": 2,
+                                     "rate_limit": 5000, "rate_window": 3600, "error_rate": 0, "secondary_rate": 0,
+                                     "retry_after": 1, "seed": 1})
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", bench
+    server.shutdown()
+    server.server_close()
+
+
+def test_sync_async_parity(fake_github):
+    pytest.importorskip("httpx")
+    url, bench = fake_github
+    names = [bench.repo_name(index) for index in range(3)]
+    manager = gm.GitHubManager(token="token", username=bench.OWNER, base_url=url, username_cache=None, memo=None)
+    try:
+        expected = (manager.list_repositories(),
+                    [manager.get_repository_stats(name) for name in names],
+                    [manager.analyze_repository_health(name) for name in names])
+    finally:
+        manager.close()
+
+    async def collect():
+        async with gm.AsyncGitHubManager(token="token", username=bench.OWNER, base_url=url) as client:
+            return (await client.list_repositories(),
+                    list(await asyncio.gather(*[client.get_repository_stats(name) for name in names])),
+                    list(await asyncio.gather(*[client.analyze_repository_health(name) for name in names])))
+
+    repos, stats, health = asyncio.run(collect())
+    assert len(expected[0]) == 6
+    assert repos == expected[0]
+    assert stats == expected[1]
+    assert health == expected[2]
+
+
+def test_job_resume_skips_done_and_retries_failed(tmp_path, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(gm.time, "sleep", sleeps.append)
+    manager = gm.GitHubManager(token="token", username="octo", username_cache=None)
+    calls = []
+    failing = {"beta": 99, "gamma": 1}
+
+    def apply(entry):
+        calls.append(entry["repo"])
+        if failing.get(entry["repo"], 0) > 0:
+            failing[entry["repo"]] -= 1
+            return {"repo": entry["repo"], "actions": {"settings": 502}, "ok": False, "error": None}
+        return {"repo": entry["repo"], "actions": {"settings": 200}, "ok": True, "error": None}
+
+    monkeypatch.setattr(manager, "_apply_repository_plan", apply)
+    plan = [{"repo": name, "changes": {"description": {"old": None, "new": name}}, "missing": False}
+            for name in ("alpha", "beta", "gamma")]
+    jobs = gm.JobQueue(tmp_path / "jobs.sqlite")
+
+    first = manager._run_job(jobs, "setup", {"repos": 3}, lambda: plan, max_attempts=2)
+    assert calls == ["alpha", "beta", "beta", "gamma", "gamma"]
+    assert [result["ok"] for result in first] == [True, False, True]
+    assert sleeps == [gm.JOB_RETRY_BACKOFF, gm.JOB_RETRY_BACKOFF]
+
+    calls.clear()
+    failing["beta"] = 0
+
+    def replan():
+        raise AssertionError("a fully queued job is resumed from the queue")
+
+    second = manager._run_job(jobs, "setup", {"repos": 3}, replan, resume=True, max_attempts=2)
+    assert calls == ["beta"]
+    assert [(result["repo"], result["ok"]) for result in second] == [("beta", True)]
+    assert jobs.open_job("setup", {"repos": 3}, resume=True)[1] is False
+    jobs.close()
+
+
+def _byte_chunks(data, size):
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 4096])
+def test_iter_json_array_across_chunks(size):
+    items = [{"title": 'bracket ] and [ quote \\" brace }', "labels": [{"name": "é"}], "score": 2.5},
+             "plain ]", 12, -3e2, True, None, [], {}]
+    data = ("  " + gm.json.dumps(items, ensure_ascii=False) + "\n").encode("utf-8")
+
+    assert list(gm.iter_json_array(_byte_chunks(data, size))) == items
+
+
+@pytest.mark.parametrize("data", [b"[]", b" [ \n ] ", b"[\r\n\t]"])
+def test_iter_json_array_empty(data):
+    assert list(gm.iter_json_array(_byte_chunks(data, 1))) == []
+
+
+@pytest.mark.parametrize("data", [b'{"message": "Not Found"}', b"[1, 2", b'[{"a": "unterminated', b"[1, }", b""])
+def test_iter_json_array_malformed(data):
+    with pytest.raises(ValueError):
+        list(gm.iter_json_array(_byte_chunks(data, 3)))
+
+
+def test_api_record_projection():
+    repo = gm.Repo.from_api({**REPOS[0], "license": {"spdx_id": "MIT", "name": "MIT License"}, "node_id": "x"})
+
+    assert repo["owner"] == "octo"
+    assert repo.get("license") == "MIT"
+    assert repo.get("node_id", "absent") == "absent"
+    assert "topics" in repo and "node_id" not in repo
+    assert repo.to_dict() == {field: repo[field] for field in gm.Repo.FIELDS}
+    assert repo.to_dict()["stargazers_count"] == 3
+    with pytest.raises(KeyError):
+        repo["node_id"]
+    with pytest.raises(AttributeError):
+        repo.name = "renamed"
+
+    issue = gm.Issue.from_api({"number": 1, "title": "Bug", "user": {"login": "octo"},
+                               "labels": [{"name": "bug"}], "assignees": [{"login": "hubot"}],
+                               "milestone": {"number": 4}})
+    assert (issue["user"], issue["labels"], issue["assignees"], issue["milestone"]) == ("octo", ["bug"], ["hubot"], 4)
+    assert issue.get("closed_at") is None
+
+
+def test_graphql_queries_are_reads():
+    assert not gm.GitHubManager._is_write("POST", "https://api.github.com/graphql")
+    assert not gm.GitHubManager._is_write("POST", "https://github.example.com/api/graphql")
+    assert gm.GitHubManager._is_write("POST", "https://api.github.com/repos/octo/alpha/issues")
+    assert not gm.GitHubManager._is_write("GET", "https://api.github.com/repos/octo/alpha")
+
+
+def test_graphql_query_keeps_memo(monkeypatch):
+    requests = pytest.importorskip("requests")
+    manager = gm.GitHubManager(token="token", username="octo", username_cache=None, memo=gm.RequestMemo())
+    sent = []
+
+    def exchange(method, url, **kwargs):
+        sent.append((method, url))
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"[]"
+        return response
+
+    monkeypatch.setattr(manager, "_exchange", exchange)
+    listing = f"{manager.base_url}/user/repos"
+    manager._dispatch("GET", listing)
+    manager._dispatch("POST", f"{manager.base_url}/graphql", json={"query": "{ viewer { login } }"})
+    manager._dispatch("GET", listing)
+    assert sent == [("GET", listing), ("POST", f"{manager.base_url}/graphql")]
+
+    manager._dispatch("PATCH", f"{manager.base_url}/repos/octo/alpha", json={"description": "New"})
+    manager._dispatch("GET", listing)
+    assert sent[-1] == ("GET", listing)
+
+
+@pytest.fixture
+def rpc_server(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = gm.GitHubManager(token="token", username="octo", username_cache=None)
+    server = gm.ManagerServer(manager, "127.0.0.1:0", token_file=tmp_path / "rpc_token")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.close()
+
+
+def _raw_rpc(server, headers):
+    import http.client
+
+    connection = http.client.HTTPConnection(*server.address, timeout=5)
+    try:
+        connection.request("POST", "/", b'{"jsonrpc": "2.0", "id": 1, "method": "methods"}', headers)
+        return connection.getresponse().status
+    finally:
+        connection.close()
+
+
+def test_rpc_server_requires_token_json_and_loopback(rpc_server, tmp_path):
+    assert oct((tmp_path / "rpc_token").stat().st_mode & 0o777) == "0o600"
+    client = gm.ManagerClient(rpc_server.address, token_file=tmp_path / "rpc_token")
+    assert "status" in client.methods()
+    client.close()
+
+    auth = {"Authorization": f"Bearer {rpc_server.token}", "Content-Type": "application/json"}
+    assert _raw_rpc(rpc_server, auth) == 200
+    assert _raw_rpc(rpc_server, {**auth, "Authorization": "Bearer wrong"}) == 401
+    assert _raw_rpc(rpc_server, {"Content-Type": "application/json"}) == 401
+    assert _raw_rpc(rpc_server, {**auth, "Content-Type": "text/plain"}) == 415
+    assert _raw_rpc(rpc_server, {**auth, "Host": "evil.example"}) == 403
+    assert _raw_rpc(rpc_server, {**auth, "Origin": "https://evil.example"}) == 403
+    assert _raw_rpc(rpc_server, {**auth, "Origin": "http://localhost:3000"}) == 200
+
+
+def test_rpc_server_confines_path_arguments(rpc_server, tmp_path):
+    client = gm.ManagerClient(rpc_server.address, token=rpc_server.token)
+    try:
+        for method, params in [("analyze_all_repositories", {"output": "/tmp/evil.json"}),
+                               ("backup_profile_incremental", {"directory": "../outside"}),
+                               ("rollout_ci", {"templates_dir": "/etc"})]:
+            with pytest.raises(gm.RemoteError) as raised:
+                client.call(method, **params)
+            assert raised.value.code == -32602
+    finally:
+        client.close()
+
+
+def test_rpc_token_file_must_be_private(tmp_path):
+    path = tmp_path / "rpc_token"
+    path.write_text("secret\n")
+    path.chmod(0o644)
+    with pytest.raises(ValueError):
+        gm.load_rpc_token(path)
+    path.chmod(0o600)
+    assert gm.load_rpc_token(path) == "secret"
+
+
+def _signed(receiver, payload):
+    import hashlib
+    import hmac
+
+    body = gm.json.dumps(payload).encode()
+    return body, "sha256=" + hmac.new(receiver.secret, body, hashlib.sha256).hexdigest()
+
+
+def test_webhook_signature_and_duplicate_deliveries(tmp_path):
+    manager = gm.GitHubManager(token="token", username="octo", mirror=_mirror(tmp_path), username_cache=None)
+    receiver = gm.WebhookReceiver(manager, secret="s3cret")
+    body, signature = _signed(receiver, {"zen": "Keep it logically awesome."})
+
+    assert receiver.deliver("ping", body, signature, "d-1")[0] == 202
+    assert receiver.deliver("ping", body, signature, "d-1") == (200, {"duplicate": "d-1"})
+    assert receiver.deliver("ping", body, "sha256=" + "0" * 64, "d-2")[0] == 401
+    assert receiver.deliver("ping", body, None, "d-3")[0] == 401
+    assert receiver.deliver("ping", body + b" ", signature, "d-4")[0] == 401
+    assert gm.WebhookReceiver(manager).deliver("ping", body, signature, "d-5")[0] == 401
+    assert receiver._queue.qsize() == 1
+
+
+def test_webhook_repository_event_invalidates_memo(tmp_path, monkeypatch):
+    requests = pytest.importorskip("requests")
+    manager = gm.GitHubManager(token="token", username="octo", mirror=_mirror(tmp_path), username_cache=None,
+                               memo=gm.RequestMemo())
+    sent = []
+
+    def exchange(method, url, **kwargs):
+        sent.append((method, url))
+        response = requests.Response()
+        found = url.endswith("/repos/octo/alpha")
+        response.status_code = 200 if found else 404
+        response._content = gm.json.dumps(REPOS[0] if found else {}).encode()
+        return response
+
+    monkeypatch.setattr(manager, "_exchange", exchange)
+    repo_url = f"{manager.base_url}/repos/octo/alpha"
+    manager._dispatch("GET", repo_url)
+    manager._dispatch("GET", repo_url)
+    assert sent.count(("GET", repo_url)) == 1
+
+    receiver = gm.WebhookReceiver(manager, secret="s3cret")
+    summary = receiver.apply("repository", {"action": "edited", "repository": {**REPOS[0], "description": "Edited"}})
+
+    assert "repository" in summary["updated"]
+    assert manager.mirror.get_repository("alpha")["description"] == "Edited"
+    manager._dispatch("GET", repo_url)
+    assert sent.count(("GET", repo_url)) == 2